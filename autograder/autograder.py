@@ -1,14 +1,22 @@
 import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
 
 from autograder.models.abstract.step import Step
-from autograder.models.dataclass.step_result import StepName
+from autograder.models.dataclass.step_result import StepName, StepResult
 from autograder.models.pipeline_execution import PipelineExecution, PipelineStatus
 from autograder.steps.step_registry import StepRegistry
 from autograder.models.dataclass.submission import Submission
+from autograder.models.result_tree import ResultTree
+from autograder.services.sandbox_transcript import SandboxTranscript
 from autograder.services.template_library_service import TemplateLibraryService
 
 logger = logging.getLogger(__name__)
 
+# Steps of one submission that may run at the same time (1 runs them strictly in order)
+DEFAULT_STEP_WORKERS = int(os.getenv("AUTOGRADER_STEP_WORKERS", "4"))
+
 
 class AutograderPipeline:
     """
@@ -18,15 +26,24 @@ class AutograderPipeline:
         It holds a PipelineExecution object that keeps all the execution footprint, including the original submission, intermediate results from each step, and the final grading result.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: int = 1, record_transcript: bool = False):
         """
         Initializes the AutograderPipeline with an empty steps dictionary.
          The steps will be added in the order they should be executed.
          Each step is identified by a unique StepName.
          The pipeline execution will pass a PipelineExecution object through each step, allowing them to share data and results.
          The pipeline handles execution flow, error handling, and finalization of the grading process.
+
+        Args:
+            max_workers: Steps that may run concurrently. With more than one, a step starts as soon
+                as the steps in its `depends_on` have succeeded; results are still recorded in the
+                order the steps were added and the pipeline stops at the first failure in that order.
+            record_transcript: Record every sandbox interaction in PipelineExecution.transcript so the
+                submission can later be regraded without a container (see run()).
         """
         self._steps = {}
+        self.max_workers = max_workers
+        self.record_transcript = record_transcript
 
     def add_step(self, step_name: StepName, step: Step) -> None:
         """
@@ -38,16 +55,32 @@ class AutograderPipeline:
         """
         self._steps[step_name] = step
 
-    def run(self, submission: Submission):
+    def run(
+        self,
+        submission: Submission,
+        replay_transcript: Optional[SandboxTranscript] = None,
+        previous_result: Optional[ResultTree] = None,
+    ):
         """
         Run the autograder pipeline on a given submission.
         Args:
             submission: The submission to be graded, containing all necessary data for grading.
+            replay_transcript: Transcript recorded by an earlier run of this submission. Sandbox calls
+                are answered from it instead of a container; if grading needs a call it does not
+                hold, the grade step fails rather than produce a different grade.
+            previous_result: Result tree of an earlier grading of this submission. Tests whose path
+                and fingerprint are unchanged keep their stored result; only new or changed tests run.
         Returns:
             PipelineExecution object containing the results of the grading process, including final score, feedback, and any errors encountered during execution.
 
         """
         pipeline_execution = PipelineExecution.start_execution(submission)
+        if replay_transcript is not None:
+            pipeline_execution.transcript = replay_transcript
+            pipeline_execution.replaying = True
+        elif self.record_transcript:
+            pipeline_execution.transcript = SandboxTranscript()
+        pipeline_execution.previous_result = previous_result
 
         logger.info(
             "Pipeline started: external_user_id=%s, assignment_id=%s, language=%s, steps=%s",
@@ -57,6 +90,26 @@ class AutograderPipeline:
             list(self._steps.keys()),
         )
 
+        if self.max_workers > 1 and len(self._steps) > 1:
+            self._run_concurrently(pipeline_execution)
+        else:
+            self._run_sequentially(pipeline_execution)
+
+        pipeline_execution.finish_execution() # Generates GradingResult object in pipeline execution
+
+        # Cleanup: Destroy sandbox if it was created
+        self._cleanup_sandbox(pipeline_execution)
+
+        logger.info(
+            "Pipeline finished: external_user_id=%s, status=%s",
+            submission.user_id,
+            pipeline_execution.status,
+        )
+
+        return pipeline_execution
+
+    def _run_sequentially(self, pipeline_execution: PipelineExecution) -> None:
+        submission = pipeline_execution.submission
         for step_name, step_instance in self._steps.items():
             logger.info("Executing step: %s (external_user_id=%s)", step_name, submission.user_id)
 
@@ -84,24 +137,133 @@ class AutograderPipeline:
                     exc_info=True,
                 )
                 break
-        pipeline_execution.finish_execution() # Generates GradingResult object in pipeline execution
 
-        # Cleanup: Destroy sandbox if it was created
-        self._cleanup_sandbox(pipeline_execution)
+    def _dependencies(self, step_name: StepName, order: List[StepName]) -> List[StepName]:
+        """Earlier steps of this pipeline that step_name must wait for."""
+        earlier = order[:order.index(step_name)]
+        declared = getattr(self._steps[step_name], "depends_on", None)
+        if not isinstance(declared, (tuple, list, set, frozenset)):
+            return earlier
+        return [name for name in earlier if name in declared]
 
-        logger.info(
-            "Pipeline finished: external_user_id=%s, status=%s",
-            submission.user_id,
-            pipeline_execution.status,
-        )
+    def _run_concurrently(self, pipeline_execution: PipelineExecution) -> None:  # pylint: disable=too-many-branches
+        """
+        Run steps on a thread pool as soon as their dependencies have succeeded.
 
-        return pipeline_execution
+        Each step runs against its own view of the execution holding the results it may read.
+        Results are committed to pipeline_execution in step order, so step_results is identical
+        to a sequential run, and committing stops at the first failed or interrupted step.
+        Steps already running at that point are allowed to finish (their results are dropped)
+        so a sandbox they acquired is still cleaned up.
+        """
+        submission = pipeline_execution.submission
+        order = list(self._steps)
+        dependencies = {name: self._dependencies(name, order) for name in order}
+        outcomes: Dict[StepName, Tuple[List[StepResult], object]] = {}  # name -> (results, error)
+        futures: Dict[Future, StepName] = {}
+        committed = 0
+        stopped = False
+
+        def succeeded(name: StepName) -> bool:
+            if name not in outcomes:
+                return False
+            results, error = outcomes[name]
+            return error is None and (not results or results[-1].is_successful)
+
+        def run_step(name: StepName, view: PipelineExecution):
+            offset = len(view.step_results)
+            view = self._steps[name].execute(view)
+            return view.step_results[offset:], view.sandbox
+
+        def collect(future: Future) -> None:
+            name = futures[future]
+            try:
+                results, sandbox = future.result()
+                outcomes[name] = (results, None)
+                if sandbox is not None:
+                    pipeline_execution.sandbox = sandbox
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                outcomes[name] = ([], e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-step") as executor:
+            while True:
+                # Start every step whose dependencies have succeeded
+                started = set(futures.values())
+                for name in order[committed:]:
+                    if name not in started and all(succeeded(dep) for dep in dependencies[name]):
+                        view = PipelineExecution(
+                            step_results=list(pipeline_execution.step_results) + [
+                                result for done in order[committed:] if succeeded(done)
+                                for result in outcomes[done][0]
+                            ],
+                            assignment_id=pipeline_execution.assignment_id,
+                            submission=submission,
+                            status=PipelineStatus.RUNNING,
+                            start_time=pipeline_execution.start_time,
+                        )
+                        view.sandbox = pipeline_execution.sandbox
+                        view.transcript = pipeline_execution.transcript
+                        view.replaying = pipeline_execution.replaying
+                        view.previous_result = pipeline_execution.previous_result
+                        logger.info("Executing step: %s (external_user_id=%s)", name, submission.user_id)
+                        futures[executor.submit(run_step, name, view)] = name
+
+                # Commit finished steps in order, stopping at the first failure
+                while committed < len(order) and order[committed] in outcomes:
+                    name = order[committed]
+                    results, error = outcomes[name]
+                    if error is not None:
+                        pipeline_execution.status = PipelineStatus.INTERRUPTED
+                        logger.error(
+                            "Unhandled exception in step %s (external_user_id=%s): %s",
+                            name,
+                            submission.user_id,
+                            str(error),
+                            exc_info=error,
+                        )
+                        stopped = True
+                        break
+                    for result in results:
+                        pipeline_execution.add_step_result(result)
+                    current_step_result = pipeline_execution.get_previous_step()
+                    if results and not current_step_result.is_successful:
+                        pipeline_execution.set_failure()
+                        logger.warning(
+                            "Step %s failed: %s (external_user_id=%s)",
+                            name,
+                            current_step_result.error,
+                            submission.user_id,
+                        )
+                        stopped = True
+                        break
+                    logger.info("Step %s completed successfully (external_user_id=%s)", name, submission.user_id)
+                    committed += 1
+
+                if stopped or committed == len(order):
+                    break
+
+                pending = [future for future, name in futures.items() if name not in outcomes]
+                if not pending:
+                    raise RuntimeError(f"Pipeline step {order[committed]} can never be scheduled")
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future)
+
+            # Drop queued steps; those already running finish when the executor shuts down
+            for future, name in futures.items():
+                if name not in outcomes:
+                    future.cancel()
+
+        for future, name in futures.items():
+            if name not in outcomes and future.done() and not future.cancelled():
+                collect(future)
 
     def _cleanup_sandbox(self, pipeline_execution: PipelineExecution) -> None:
         """Destroy sandbox after pipeline execution to avoid cross-submission reuse."""
         try:
             sandbox = pipeline_execution.sandbox
-            if sandbox:
+            # A replay sandbox holds no container; it stays attached so its misses can be inspected
+            if sandbox and not pipeline_execution.replaying:
                 from sandbox_manager.manager import get_sandbox_manager
                 manager = get_sandbox_manager()
                 language = pipeline_execution.submission.language
@@ -132,6 +294,8 @@ def build_pipeline(  # pylint: disable=too-many-arguments,too-many-locals
     export_results=False,
     exporter=None,
     locale="en",
+    step_workers=DEFAULT_STEP_WORKERS,
+    record_transcript=False,
 ) -> AutograderPipeline:
     """
     Build the AutograderPipeline object based on configuration.
@@ -144,10 +308,12 @@ def build_pipeline(  # pylint: disable=too-many-arguments,too-many-locals
         setup_config: Pre-flight setup configuration
         custom_template: Custom template object (if any)
         feedback_mode: Mode for feedback generation (default or ai)
+        step_workers: Steps that may run concurrently (1 runs them strictly in order)
+        record_transcript: Record the sandbox interactions of each run for later replay
     Returns:
         Configured AutograderPipeline object ready to run with submissions
     """
-    pipeline = AutograderPipeline()
+    pipeline = AutograderPipeline(max_workers=step_workers, record_transcript=record_transcript)
 
     # Pre-load templates to allow StepRegistry to make informed decisions about
     # which steps are actually required for this assignment.
@@ -1,5 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
 from autograder.translations import t
 
 from autograder.models.dataclass.step_result import StepResult, StepStatus, StepName
@@ -12,6 +13,10 @@ class Step(ABC):
     """
     Abstract base class for all pipeline steps.
     """
+
+    # Steps whose results this step reads. The pipeline may run a step as soon as
+    # these have succeeded. None means it depends on every step before it.
+    depends_on: Optional[Tuple[StepName, ...]] = None
     @property
     @abstractmethod
     def step_name(self) -> StepName:
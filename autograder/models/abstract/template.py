@@ -25,6 +25,14 @@ class Template(ABC):
         """Declare whether template tests require sandbox execution."""
         raise NotImplementedError
 
+    @property
+    def template_version(self) -> str:
+        """
+        Version of the template's test behavior. Bump it whenever a test may score or
+        report differently, so cached results of earlier versions are not reused.
+        """
+        return "1"
+
     @abstractmethod
     def get_test(self, name: str) -> TestFunction:
         """Return a test function instance by its registry name."""
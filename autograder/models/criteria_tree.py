@@ -27,6 +27,8 @@ class TestNode:
     parameters: Dict[str, Any] = field(default_factory=dict)
     file_target: Optional[List[str]] = None
     weight: float = 100.0
+    # Whether the test's template executes code in the sandbox; static tests may run concurrently
+    requires_sandbox: bool = True
 
     def __repr__(self):
         params_str = f", params={self.parameters}" if self.parameters else ""
@@ -55,3 +55,69 @@ class ComparisonResult:
             "improved": self.improved,
             "test_deltas": [delta.to_dict() for delta in self.test_deltas],
         }
+
+
+@dataclass
+class PathComparisonSummary:
+    """
+    How one test path moved across every head of a batch comparison.
+
+    Attributes:
+        path: Stable path string in "category/subject/.../test_name" format.
+        baseline_score: Score in the baseline run, or None if the baseline lacks the path.
+        improved, regressed, unchanged, introduced, removed: Number of heads per status.
+        mean_delta: Mean delta over the heads that have the path in both runs, or None.
+    """
+
+    path: str
+    baseline_score: Optional[float] = None
+    improved: int = 0
+    regressed: int = 0
+    unchanged: int = 0
+    introduced: int = 0
+    removed: int = 0
+    mean_delta: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert PathComparisonSummary to a serializable dictionary."""
+        return {
+            "path": self.path,
+            "baseline_score": self.baseline_score,
+            "improved": self.improved,
+            "regressed": self.regressed,
+            "unchanged": self.unchanged,
+            "introduced": self.introduced,
+            "removed": self.removed,
+            "mean_delta": self.mean_delta,
+        }
+
+
+@dataclass
+class BatchComparisonResult:
+    """
+    Outcome of comparing one baseline ResultTree with many heads.
+
+    Attributes:
+        comparisons: One ComparisonResult per head, in input order.
+        path_summaries: Per-path status counts across heads; baseline paths first, then
+            paths introduced by heads in the order first seen.
+        mean_score_delta: Mean final score change over all heads, or None without heads.
+        improved_heads: Number of heads whose final score went up.
+        regressed_heads: Number of heads whose final score went down.
+    """
+
+    comparisons: List[ComparisonResult] = field(default_factory=list)
+    path_summaries: List[PathComparisonSummary] = field(default_factory=list)
+    mean_score_delta: Optional[float] = None
+    improved_heads: int = 0
+    regressed_heads: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert BatchComparisonResult to a serializable dictionary."""
+        return {
+            "comparisons": [comparison.to_dict() for comparison in self.comparisons],
+            "path_summaries": [summary.to_dict() for summary in self.path_summaries],
+            "mean_score_delta": self.mean_score_delta,
+            "improved_heads": self.improved_heads,
+            "regressed_heads": self.regressed_heads,
+        }
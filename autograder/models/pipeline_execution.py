@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from autograder.models.dataclass.focus import Focus
     from autograder.models.dataclass.grade_step_result import GradeStepResult
     from autograder.models.result_tree import ResultTree
+    from autograder.services.sandbox_transcript import SandboxTranscript
     from sandbox_manager.sandbox_container import SandboxContainer
 
 
@@ -43,6 +44,11 @@ class PipelineExecution:
     status: PipelineStatus = PipelineStatus.EMPTY
     result: Optional[GradingResult] = None
     sandbox: Optional["SandboxContainer"] = field(default=None, init=False)
+    # Sandbox interactions: recorded while grading, or answered from it when replaying
+    transcript: Optional["SandboxTranscript"] = field(default=None, init=False)
+    replaying: bool = field(default=False, init=False)
+    # Earlier grading of this submission; unchanged tests keep its results instead of running again
+    previous_result: Optional["ResultTree"] = field(default=None, init=False)
     start_time: float = field(default_factory=time.time)  # Track execution time
 
     @property
@@ -141,8 +147,22 @@ class PipelineExecution:
     def get_sandbox(self) -> Optional["SandboxContainer"]:
         """
         Retrieves the SandboxContainer object if it was created during the pipeline.
+        When a transcript is being recorded, the sandbox is returned behind its recorder.
         """
-        return self.sandbox
+        return self.recording(self.sandbox)
+
+    @property
+    def replay_misses(self) -> List[str]:
+        """Sandbox calls a replayed run needed that its transcript did not hold."""
+        if not self.replaying:
+            return []
+        return list(getattr(self.sandbox, "misses", None) or [])
+
+    def recording(self, sandbox):
+        """Routes sandbox through the transcript recorder if this execution records one."""
+        if sandbox is None or self.transcript is None or self.replaying:
+            return sandbox
+        return self.transcript.record(sandbox)
 
     def get_grade_step_result(self) -> "GradeStepResult":
         """
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import ValidationError
 
@@ -87,18 +87,18 @@ class CriteriaTreeService:
     def __parse_tests(self, test_configs: List[TestConfig]) -> List[TestNode]:
         return [self.__parse_test(test_item) for test_item in test_configs]
 
-    def __find_test_function(self, name: str) -> Optional[TestFunction]:
+    def __find_test_function(self, name: str) -> Tuple[Optional[TestFunction], Optional[Template]]:
         for template in self.__templates:
             try:
-                return template.get_test(name)
+                return template.get_test(name), template
             except (AttributeError, KeyError):
                 continue
-        return None
+        return None, None
 
     def __parse_test(self, config: TestConfig) -> TestNode:
         # Use technical 'type' for function lookup, falling back to 'name' for legacy support
         function_name = config.type or config.name
-        test_function = self.__find_test_function(function_name)
+        test_function, template = self.__find_test_function(function_name)
         if not test_function:
             raise ValueError(f"Couldn't find test function '{function_name}'")
 
@@ -121,6 +121,7 @@ class CriteriaTreeService:
             test_params,
             file_target,
             config.weight if config.weight is not None else 100.0,
+            requires_sandbox=bool(getattr(template, "requires_sandbox", True)),
         )
 
         return test
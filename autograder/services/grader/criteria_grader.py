@@ -1,5 +1,8 @@
 import logging
-from typing import Dict, Optional, Sequence, List, overload
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, List, overload
 
 from autograder.models.abstract.criteria_tree_processer import CriteriaTreeProcesser
 from autograder.models.criteria_tree import (
@@ -15,12 +18,26 @@ from autograder.models.result_tree import (
     TestResultNode,
 )
 from autograder.services.command_resolver import CommandResolver
+from autograder.services.grader.execution_memo import SandboxExecutionMemo
+from autograder.services.grader.incremental_regrade import FINGERPRINT_KEY, fingerprint_test_node
 
 
 class SubmissionGrader(CriteriaTreeProcesser):
     """
     Stateful grader responsible for traversing a criteria tree for a single submission.
     Implements the CriteriaTreeProcesser interface.
+
+    Inside execution_plan(), tests are started ahead of the traversal: static tests on a
+    worker pool and sandbox tests on their own lane, in traversal order, at most
+    sandbox_concurrency at a time per sandbox. With extra_sandboxes (seeded copies of
+    the primary sandbox), sandbox tests are sharded across all of them. The traversal
+    then collects each result where serial grading would have produced it, so the result
+    tree (and the first error raised, if any) is identical to grading one test after
+    another.
+
+    Tests found in reused_results (stored results of unchanged tests, keyed by id() of the
+    TestNode) are not executed; their stored outcome is placed in the new tree with the
+    test's current weight.
     """
 
     def __init__(
@@ -32,6 +49,11 @@ class SubmissionGrader(CriteriaTreeProcesser):
         locale: str = "en",
         pre_computed_results: Optional[Dict[str, TestResult]] = None,
         structural_analysis=None,
+        test_workers: int = 1,
+        sandbox_concurrency: int = 1,
+        extra_sandboxes: Sequence = (),
+        dedup_sandbox_runs: bool = False,
+        reused_results: Optional[Dict[int, TestResultNode]] = None,
     ):
         self.logger = logging.getLogger("SubmissionGrader")
         self.submission_files = submission_files
@@ -41,6 +63,68 @@ class SubmissionGrader(CriteriaTreeProcesser):
         self.locale = locale
         self.pre_computed_results = pre_computed_results
         self.structural_analysis = structural_analysis
+        self.test_workers = max(1, test_workers)
+        self.sandbox_concurrency = max(1, sandbox_concurrency)
+        self.extra_sandboxes = list(extra_sandboxes)
+        # Identical sandbox executions run once per submission and are shared between tests
+        self.execution_memo = SandboxExecutionMemo() if dedup_sandbox_runs else None
+        self.reused_results = reused_results or {}
+        self._scheduled: Dict[int, Future] = {}
+
+    @contextmanager
+    def execution_plan(self, *holders: Optional[CategoryNode | SubjectNode]) -> Iterator[None]:
+        """
+        Start every test under holders ahead of the traversal.
+
+        With a single worker, a sandbox concurrency of 1 and no extra sandboxes nothing is
+        scheduled and tests run inline as the traversal reaches them.
+        """
+        tests = [test for test in self.plan_tests(*holders) if id(test) not in self.reused_results]
+        sandboxes = [self.sandbox, *self.extra_sandboxes]
+        if len(tests) < 2 or (self.test_workers == 1 and self.sandbox_concurrency == 1 and len(sandboxes) == 1):
+            yield
+            return
+
+        static_tests = [test for test in tests if not test.requires_sandbox]
+        sandbox_tests = [test for test in tests if test.requires_sandbox]
+        # One slot per concurrent run a sandbox accepts; a sandbox test borrows a slot while it runs
+        slots: "queue.SimpleQueue" = queue.SimpleQueue()
+        for _ in range(self.sandbox_concurrency):
+            for sandbox in sandboxes:
+                slots.put(sandbox)
+
+        lanes = []
+        if static_tests:
+            executor = ThreadPoolExecutor(self.test_workers, thread_name_prefix="grader-static")
+            lanes.append((executor, [(test, self.__run_test, test) for test in static_tests]))
+        if sandbox_tests:
+            executor = ThreadPoolExecutor(self.sandbox_concurrency * len(sandboxes), thread_name_prefix="grader-sandbox")
+            lanes.append((executor, [(test, self.__run_sandbox_test, test, slots) for test in sandbox_tests]))
+        self.logger.debug(
+            "Execution plan: %d static test(s) on %d worker(s), %d sandbox test(s) on %d sandbox(es) at concurrency %d",
+            len(static_tests), self.test_workers, len(sandbox_tests), len(sandboxes), self.sandbox_concurrency,
+        )
+
+        try:
+            for executor, jobs in lanes:
+                for test, fn, *args in jobs:
+                    self._scheduled[id(test)] = executor.submit(fn, *args)
+            yield
+        finally:
+            self._scheduled.clear()
+            for executor, _ in lanes:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def plan_tests(*holders: Optional[CategoryNode | SubjectNode]) -> List[TestNode]:
+        """Tests under holders in the order the traversal visits them."""
+        tests = []
+        for holder in holders:
+            if holder is None:
+                continue
+            tests.extend(SubmissionGrader.plan_tests(*(holder.subjects or [])))
+            tests.extend(holder.tests or [])
+        return tests
 
     def __balance_nodes(
         self,
@@ -125,7 +209,31 @@ class SubmissionGrader(CriteriaTreeProcesser):
         return self.__process_holder(subject)
 
     def process_test(self, test: TestNode) -> TestResultNode:
-        """Execute a test and create a test result node."""
+        """Execute a test (or collect its scheduled or reused result) and create a test result node."""
+        reused = self.reused_results.get(id(test))
+        if reused is not None:
+            return TestResultNode(
+                name=test.name,
+                test_node=test,
+                score=reused.score,
+                report=reused.report,
+                parameters=reused.parameters,
+                weight=test.weight,
+                metadata=dict(reused.metadata),
+            )
+        scheduled = self._scheduled.pop(id(test), None)
+        if scheduled is not None:
+            return scheduled.result()
+        return self.__run_test(test)
+
+    def __run_sandbox_test(self, test: TestNode, slots: "queue.SimpleQueue") -> TestResultNode:
+        sandbox = slots.get()
+        try:
+            return self.__run_test(test, sandbox)
+        finally:
+            slots.put(sandbox)
+
+    def __run_test(self, test: TestNode, sandbox=None) -> TestResultNode:
         file_target = self.get_file_target(test)
 
         # Shallow-copy parameters so we don't mutate the original TestNode.
@@ -150,7 +258,7 @@ class SubmissionGrader(CriteriaTreeProcesser):
 
         test_result = test.test_function.execute(
             files=file_target,
-            sandbox=self.sandbox,
+            sandbox=self.__sandbox_for(sandbox if sandbox is not None else self.sandbox),
             locale=self.locale,
             pre_computed_results=self.pre_computed_results,
             structural_analysis=self.structural_analysis,
@@ -164,8 +272,14 @@ class SubmissionGrader(CriteriaTreeProcesser):
             report=test_result.report,
             parameters=test_result.parameters,
             weight=test.weight,
+            metadata={FINGERPRINT_KEY: fingerprint_test_node(test, self.locale, self.submission_language)},
         )
 
+    def __sandbox_for(self, sandbox):
+        if sandbox is None or self.execution_memo is None:
+            return sandbox
+        return self.execution_memo.wrap(sandbox)
+
     def get_file_target(self, test_node: TestNode) -> Optional[List[SubmissionFile]]:
         """Filter out the submission files strictly relevant to the current test node."""
         if not self.submission_files:
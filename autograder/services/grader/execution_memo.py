@@ -0,0 +1,97 @@
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Optional
+
+from sandbox_manager.models.sandbox_models import CommandResponse, ResponseCategory
+
+
+class SandboxExecutionMemo:
+    """
+    Per-submission memo of sandbox executions.
+
+    Several tests often run exactly the same program with the same inputs (a `dont_fail`
+    next to an `expect_output`, or several expectations on one run). Executions are keyed
+    by sandbox, resolved command, stdin lines, workdir and timeout, so each unique one
+    runs once and every test that needs it shares the CommandResponse. Concurrent
+    requests for the same key wait for the first one instead of running it again.
+
+    The sandbox is part of the key: a test may read files the run left behind, which only
+    exist in the sandbox that ran it. System errors are not memoized, so a transient
+    infrastructure failure is retried by the next test that needs the execution.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger("SandboxExecutionMemo")
+        self._lock = threading.Lock()
+        self._executions: Dict[Hashable, Future] = {}
+        self._wrappers: Dict[int, "MemoizedSandbox"] = {}
+        self.runs = 0
+        self.hits = 0
+
+    def wrap(self, sandbox) -> "MemoizedSandbox":
+        """Return the memoizing view of sandbox (one per sandbox)."""
+        with self._lock:
+            wrapper = self._wrappers.get(id(sandbox))
+            if wrapper is None:
+                wrapper = self._wrappers[id(sandbox)] = MemoizedSandbox(sandbox, self)
+            return wrapper
+
+    def execute(self, key: Hashable, run: Callable[[], CommandResponse]) -> CommandResponse:
+        """Run the execution identified by key once and share its response."""
+        with self._lock:
+            pending = self._executions.get(key)
+            if pending is None:
+                pending = self._executions[key] = Future()
+                self.runs += 1
+                owner = True
+            else:
+                self.hits += 1
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            response = run()
+        except BaseException as e:
+            self.__forget(key)
+            pending.set_exception(e)
+            raise
+        if response.category == ResponseCategory.SYSTEM_ERROR:
+            self.__forget(key)
+        pending.set_result(response)
+        return response
+
+    def __forget(self, key: Hashable) -> None:
+        with self._lock:
+            self._executions.pop(key, None)
+
+
+class MemoizedSandbox:
+    """
+    Sandbox view handed to test functions: run_command and run_commands go through the
+    memo, every other attribute is the underlying sandbox's.
+    """
+
+    def __init__(self, sandbox, memo: SandboxExecutionMemo):
+        self._sandbox = sandbox
+        self._memo = memo
+
+    def __getattr__(self, name):
+        return getattr(self._sandbox, name)
+
+    def run_command(self, command: str, timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        key = ("command", id(self._sandbox), command, timeout, workdir)
+        return self._memo.execute(key, lambda: self._sandbox.run_command(command, timeout=timeout, workdir=workdir))
+
+    def run_commands(self, commands: List[str], program_command: Optional[str] = None,
+                     timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        # Keyed by the stdin the program receives, so ["5", "3"] and ["5\n3"] share a run
+        key = ("batch", id(self._sandbox), "\n".join(commands), program_command, timeout, workdir)
+        return self._memo.execute(key, lambda: self._sandbox.run_commands(
+            commands, program_command=program_command, timeout=timeout, workdir=workdir
+        ))
+
+    def __repr__(self):
+        return f"MemoizedSandbox({self._sandbox!r})"
@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Optional
+import os
+from typing import Dict, Optional, Sequence
 
 from autograder.models.criteria_tree import CriteriaTree
 from autograder.models.dataclass.submission import SubmissionFile
@@ -10,14 +11,47 @@ from autograder.models.result_tree import (
 )
 from autograder.services.command_resolver import CommandResolver
 from .criteria_grader import SubmissionGrader
+from .incremental_regrade import diff_criteria_tree
+
+# Static (non-sandbox) tests of one submission that may run at the same time
+DEFAULT_TEST_WORKERS = int(os.getenv("AUTOGRADER_TEST_WORKERS", "8"))
+# Sandbox tests of one submission that may run at the same time on its sandbox
+DEFAULT_SANDBOX_TEST_CONCURRENCY = int(os.getenv("AUTOGRADER_SANDBOX_TEST_CONCURRENCY", "1"))
+# Run identical sandbox executions (command, inputs, workdir, timeout) once per submission
+DEFAULT_DEDUP_SANDBOX_RUNS = os.getenv("AUTOGRADER_DEDUP_SANDBOX_RUNS", "true").lower() == "true"
+# Extra sandboxes a submission may fan its sandbox tests out to (0 disables fan-out)
+DEFAULT_SANDBOX_FANOUT = int(os.getenv("AUTOGRADER_SANDBOX_FANOUT", "0"))
+# Sandbox tests each sandbox should have before another one is worth seeding
+DEFAULT_FANOUT_MIN_TESTS = int(os.getenv("AUTOGRADER_FANOUT_MIN_TESTS", "20"))
 
 
 class GraderService:
     """Service responsible for orchestrating the grading process using a configured criteria tree."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        test_workers: int = DEFAULT_TEST_WORKERS,
+        sandbox_concurrency: int = DEFAULT_SANDBOX_TEST_CONCURRENCY,
+        dedup_sandbox_runs: bool = DEFAULT_DEDUP_SANDBOX_RUNS,
+    ):
         self.logger = logging.getLogger("GraderService")
         self._command_resolver = CommandResolver()
+        self.test_workers = test_workers
+        self.sandbox_concurrency = sandbox_concurrency
+        self.dedup_sandbox_runs = dedup_sandbox_runs
+
+    @staticmethod
+    def fanout_size(
+        criteria_tree: CriteriaTree,
+        max_fanout: int = DEFAULT_SANDBOX_FANOUT,
+        min_tests_per_sandbox: int = DEFAULT_FANOUT_MIN_TESTS,
+    ) -> int:
+        """Extra sandboxes worth seeding for the sandbox tests of criteria_tree."""
+        if max_fanout <= 0:
+            return 0
+        tests = SubmissionGrader.plan_tests(criteria_tree.base, criteria_tree.bonus, criteria_tree.penalty)
+        sandbox_tests = sum(1 for test in tests if test.requires_sandbox)
+        return max(0, min(max_fanout, sandbox_tests // max(1, min_tests_per_sandbox) - 1))
 
     def grade_from_tree(
         self,
@@ -28,8 +62,26 @@ class GraderService:
         locale: str = "en",
         pre_computed_results: Optional[Dict[str, TestResult]] = None,
         structural_analysis=None,
+        extra_sandboxes: Sequence = (),
+        previous_result: Optional[ResultTree] = None,
     ) -> ResultTree:
-        """Traverse the generic built criteria tree to resolve inputs, grades and report to ResultTree."""
+        """
+        Traverse the generic built criteria tree to resolve inputs, grades and report to ResultTree.
+
+        With previous_result (an earlier grading of the same submission), only tests that are new
+        or changed since then are executed; the others keep their stored outcome.
+        """
+        reused_results = None
+        if previous_result is not None:
+            diff = diff_criteria_tree(criteria_tree, previous_result, locale, submission_language)
+            reused_results = diff.reused
+            self.logger.info(
+                "Incremental regrade: reusing %d test result(s), executing %d, dropping %d",
+                len(diff.reused),
+                len(diff.changed),
+                len(diff.removed),
+            )
+
         grader = SubmissionGrader(
             submission_files=submission_files,
             command_resolver=self._command_resolver,
@@ -38,15 +90,28 @@ class GraderService:
             locale=locale,
             pre_computed_results=pre_computed_results,
             structural_analysis=structural_analysis,
+            test_workers=self.test_workers,
+            sandbox_concurrency=self.sandbox_concurrency,
+            extra_sandboxes=extra_sandboxes,
+            dedup_sandbox_runs=self.dedup_sandbox_runs,
+            reused_results=reused_results,
         )
 
-        base_result = grader.process_category(criteria_tree.base)
-        root = RootResultNode(name="root", base=base_result)
+        with grader.execution_plan(criteria_tree.base, criteria_tree.bonus, criteria_tree.penalty):
+            base_result = grader.process_category(criteria_tree.base)
+            root = RootResultNode(name="root", base=base_result)
+
+            if criteria_tree.bonus:
+                root.bonus = grader.process_category(criteria_tree.bonus)
 
-        if criteria_tree.bonus:
-            root.bonus = grader.process_category(criteria_tree.bonus)
+            if criteria_tree.penalty:
+                root.penalty = grader.process_category(criteria_tree.penalty)
 
-        if criteria_tree.penalty:
-            root.penalty = grader.process_category(criteria_tree.penalty)
+        if grader.execution_memo is not None and grader.execution_memo.hits:
+            self.logger.debug(
+                "Shared %d sandbox execution(s) across tests (%d unique)",
+                grader.execution_memo.hits,
+                grader.execution_memo.runs,
+            )
 
         return ResultTree(root)
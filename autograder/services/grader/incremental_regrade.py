@@ -0,0 +1,98 @@
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from autograder.models.criteria_tree import CategoryNode, CriteriaTree, SubjectNode, TestNode
+from autograder.models.result_tree import ResultTree, TestResultNode
+
+# TestResultNode.metadata key holding the fingerprint of the test that produced it
+FINGERPRINT_KEY = "fingerprint"
+
+
+def fingerprint_test_node(test: TestNode, locale: str = "en", submission_language=None) -> str:
+    """
+    Identity of what a test node executes: its test function, parameters and file target,
+    plus the locale of its report and the submission language it ran against. Weights are
+    not part of it, so reweighting a test keeps its result reusable.
+    """
+    function = type(test.test_function)
+    payload = json.dumps(
+        {
+            "function": f"{function.__module__}.{function.__qualname__}",
+            "name": test.name,
+            "parameters": test.parameters or {},
+            "file_target": test.file_target,
+            "locale": locale,
+            "language": getattr(submission_language, "value", submission_language),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def iter_criteria_tests(criteria_tree: CriteriaTree) -> Iterator[Tuple[str, TestNode]]:
+    """Yield (path, node) for every test, with the same paths as ResultTree.iter_test_results."""
+    def walk(holder: CategoryNode | SubjectNode, prefix: str):
+        for subject in holder.subjects or []:
+            yield from walk(subject, f"{prefix}/{subject.name}")
+        for test in holder.tests or []:
+            yield f"{prefix}/{test.name}", test
+
+    for category in (criteria_tree.base, criteria_tree.bonus, criteria_tree.penalty):
+        if category is not None:
+            yield from walk(category, category.name)
+
+
+@dataclass
+class CriteriaTreeDiff:
+    """
+    Tests of a new criteria tree matched against the results of a previous grading.
+
+    Attributes:
+        reused: Stored result for every unchanged test, keyed by id() of the new TestNode
+        changed: New or changed tests that must be executed, in traversal order
+        removed: Paths of stored results no test of the new tree matched
+    """
+
+    reused: Dict[int, TestResultNode] = field(default_factory=dict)
+    changed: List[TestNode] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def diff_criteria_tree(
+    criteria_tree: CriteriaTree,
+    previous: Optional[ResultTree],
+    locale: str = "en",
+    submission_language=None,
+) -> CriteriaTreeDiff:
+    """
+    Match the tests of criteria_tree to the previous result tree by path and fingerprint.
+
+    A test is reused when a stored result has the same path and was produced by a test with
+    the same fingerprint. Repeated identical tests (same path and fingerprint) are paired in
+    order. Results stored without a fingerprint are never reused.
+    """
+    stored: Dict[Tuple[str, str], List[TestResultNode]] = defaultdict(list)
+    paths: Dict[int, str] = {}
+    if previous is not None:
+        for path, node in previous.iter_test_results():
+            fingerprint = (node.metadata or {}).get(FINGERPRINT_KEY)
+            if fingerprint:
+                stored[(path, fingerprint)].append(node)
+            paths[id(node)] = path
+
+    diff = CriteriaTreeDiff()
+    for path, test in iter_criteria_tests(criteria_tree):
+        matches = stored.get((path, fingerprint_test_node(test, locale, submission_language)))
+        if matches:
+            diff.reused[id(test)] = matches.pop(0)
+        else:
+            diff.changed.append(test)
+
+    if previous is not None:
+        matched = {id(node) for node in diff.reused.values()}
+        diff.removed = [path for node_id, path in paths.items() if node_id not in matched]
+    return diff
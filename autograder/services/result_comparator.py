@@ -1,6 +1,11 @@
-from typing import Dict, List
-from autograder.models.result_tree import ResultTree, TestResultNode
-from autograder.models.dataclass.comparison_result import ComparisonResult, TestDelta
+from typing import Dict, List, Sequence
+from autograder.models.result_tree import ResultTree
+from autograder.models.dataclass.comparison_result import (
+    BatchComparisonResult,
+    ComparisonResult,
+    PathComparisonSummary,
+    TestDelta,
+)
 
 
 class ResultComparator:
@@ -25,47 +30,88 @@ class ResultComparator:
         Returns:
             ComparisonResult containing score_delta, improved flag, and test_deltas.
         """
-        baseline_map: Dict[str, TestResultNode] = dict(baseline.iter_test_results())
-        head_map: Dict[str, TestResultNode] = dict(head.iter_test_results())
+        return ResultComparator._compare_scores(
+            baseline.root.score, ResultComparator._path_scores(baseline), head
+        )
+
+    @staticmethod
+    def compare_many(
+        baseline: ResultTree,
+        heads: Sequence[ResultTree],
+    ) -> BatchComparisonResult:
+        """
+        Compare one baseline ResultTree with many heads (e.g. a reference solution against
+        every submission, or a student's history against their first attempt).
+
+        The baseline is indexed once and shared by every head. Each head gets the same
+        ComparisonResult compare() would return, and the per-path status counts and
+        summary are accumulated in the same pass.
+
+        Args:
+            baseline: The baseline ResultTree (reference run).
+            heads: The head ResultTrees to compare against it.
+
+        Returns:
+            BatchComparisonResult with one comparison per head and per-path summaries.
+        """
+        baseline_scores = ResultComparator._path_scores(baseline)
+        summaries: Dict[str, PathComparisonSummary] = {
+            path: PathComparisonSummary(path=path, baseline_score=score)
+            for path, score in baseline_scores.items()
+        }
+        delta_sums: Dict[str, float] = {}
+
+        result = BatchComparisonResult()
+        for head in heads:
+            comparison = ResultComparator._compare_scores(baseline.root.score, baseline_scores, head)
+            result.comparisons.append(comparison)
+            if comparison.score_delta > 0:
+                result.improved_heads += 1
+            elif comparison.score_delta < 0:
+                result.regressed_heads += 1
+
+            for test_delta in comparison.test_deltas:
+                summary = summaries.get(test_delta.path)
+                if summary is None:
+                    summary = summaries[test_delta.path] = PathComparisonSummary(path=test_delta.path)
+                setattr(summary, test_delta.status, getattr(summary, test_delta.status) + 1)
+                if test_delta.delta is not None:
+                    delta_sums[test_delta.path] = delta_sums.get(test_delta.path, 0.0) + test_delta.delta
+
+        for path, total in delta_sums.items():
+            summary = summaries[path]
+            summary.mean_delta = round(total / (summary.improved + summary.regressed + summary.unchanged), 2)
+
+        result.path_summaries = list(summaries.values())
+        if result.comparisons:
+            result.mean_score_delta = round(
+                sum(comparison.score_delta for comparison in result.comparisons) / len(result.comparisons), 2
+            )
+        return result
+
+    @staticmethod
+    def _path_scores(tree: ResultTree) -> Dict[str, float]:
+        """Score per test path, in traversal order (a repeated path keeps its last score)."""
+        return {path: node.score for path, node in tree.iter_test_results()}
+
+    @staticmethod
+    def _compare_scores(
+        baseline_final: float,
+        baseline_scores: Dict[str, float],
+        head: ResultTree,
+    ) -> ComparisonResult:
+        """Compare head against an already indexed baseline."""
+        head_scores = ResultComparator._path_scores(head)
 
         # Calculate overall final score delta
-        score_delta = round(head.root.score - baseline.root.score, 2)
+        score_delta = round(head.root.score - baseline_final, 2)
         improved = score_delta > 0
 
         # Preserve traversal order of head, then append removed paths from baseline
-        all_paths: List[str] = list(head_map.keys())
-        for path in baseline_map.keys():
-            if path not in head_map:
-                all_paths.append(path)
-
         test_deltas: List[TestDelta] = []
-        for path in all_paths:
-            in_head = path in head_map
-            in_baseline = path in baseline_map
-
-            if in_head and in_baseline:
-                base_score = baseline_map[path].score
-                head_score = head_map[path].score
-                delta = round(head_score - base_score, 2)
-
-                if delta > 0:
-                    status = "improved"
-                elif delta < 0:
-                    status = "regressed"
-                else:
-                    status = "unchanged"
-
-                test_deltas.append(
-                    TestDelta(
-                        path=path,
-                        status=status,
-                        baseline_score=base_score,
-                        head_score=head_score,
-                        delta=delta,
-                    )
-                )
-            elif in_head:
-                head_score = head_map[path].score
+        for path, head_score in head_scores.items():
+            base_score = baseline_scores.get(path)
+            if base_score is None:
                 test_deltas.append(
                     TestDelta(
                         path=path,
@@ -75,8 +121,28 @@ class ResultComparator:
                         delta=None,
                     )
                 )
+                continue
+
+            delta = round(head_score - base_score, 2)
+            if delta > 0:
+                status = "improved"
+            elif delta < 0:
+                status = "regressed"
             else:
-                base_score = baseline_map[path].score
+                status = "unchanged"
+
+            test_deltas.append(
+                TestDelta(
+                    path=path,
+                    status=status,
+                    baseline_score=base_score,
+                    head_score=head_score,
+                    delta=delta,
+                )
+            )
+
+        for path, base_score in baseline_scores.items():
+            if path not in head_scores:
                 test_deltas.append(
                     TestDelta(
                         path=path,
@@ -1,10 +1,15 @@
 import logging
-from typing import Optional, Any
+import os
+from typing import List, Optional, Any
 from autograder.models.dataclass.submission import Submission
 from sandbox_manager.sandbox_container import SandboxContainer
 from sandbox_manager.models.sandbox_models import Language, ResponseCategory, CommandResponse
 from autograder.translations import t
 
+# Idle sandboxes fan-out leaves in the pool for other submissions
+FANOUT_IDLE_RESERVE = int(os.getenv("AUTOGRADER_FANOUT_IDLE_RESERVE", "1"))
+
+
 class SandboxService:
     """
     Service responsible for sandbox management and setup command execution.
@@ -60,6 +65,72 @@ class SandboxService:
         except Exception as e:  # pylint: disable=broad-exception-caught
             self.logger.warning("Failed to release sandbox: %s", str(e))
 
+    def fan_out(self, primary: SandboxContainer, wanted: int) -> List[SandboxContainer]:
+        """
+        Acquire up to `wanted` extra sandboxes seeded with the primary sandbox's prepared workdir.
+
+        Fan-out is capped by pool pressure: it only borrows sandboxes that are idle right
+        now, leaves FANOUT_IDLE_RESERVE of them for other submissions, and backs off
+        entirely while any acquire is waiting. Failures only reduce the fan-out.
+
+        Returns:
+            The seeded sandboxes (possibly none). Destroy them with destroy_sandboxes().
+        """
+        language = primary.language
+        try:
+            from sandbox_manager.manager import get_sandbox_manager
+            sandbox_manager = get_sandbox_manager()
+            stats = sandbox_manager.get_pool_stats().get(language.value, {})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.warning("Fan-out skipped, pool stats unavailable: %s", str(e))
+            return []
+
+        if stats.get("waiting", 0) > 0:
+            return []
+        count = min(wanted, stats.get("idle", 0) - FANOUT_IDLE_RESERVE)
+        if count <= 0:
+            return []
+
+        try:
+            archive = primary.snapshot_workdir()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.warning("Fan-out skipped, workdir snapshot failed: %s", str(e))
+            return []
+
+        shards = []
+        for _ in range(count):
+            try:
+                sandbox = sandbox_manager.get_sandbox(language)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.info("Fan-out stopped at %d extra sandbox(es): %s", len(shards), str(e))
+                break
+            try:
+                sandbox.restore_workdir(archive)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.warning("Failed to seed fan-out sandbox: %s", str(e))
+                self.destroy_sandboxes(language, [sandbox])
+                break
+            shards.append(sandbox)
+
+        self.logger.debug("Fanned out to %d extra sandbox(es) for language %s", len(shards), language)
+        return shards
+
+    def destroy_sandboxes(self, language: Language, sandboxes: List[SandboxContainer]) -> None:
+        """Destroys sandboxes acquired by fan_out()."""
+        if not sandboxes:
+            return
+        try:
+            from sandbox_manager.manager import get_sandbox_manager
+            sandbox_manager = get_sandbox_manager()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.warning("Failed to destroy fan-out sandboxes: %s", str(e))
+            return
+        for sandbox in sandboxes:
+            try:
+                sandbox_manager.destroy_sandbox(language, sandbox)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.warning("Failed to destroy fan-out sandbox: %s", str(e))
+
     def run_setup_command(self, sandbox: SandboxContainer, command_spec: Any, idx: int = 0, locale: Optional[str] = None) -> CommandResponse:
         """
         Executes a single setup command (e.g., compilation) in the provided sandbox.
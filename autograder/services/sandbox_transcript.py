@@ -0,0 +1,305 @@
+import base64
+import json
+import threading
+from typing import Dict, Hashable, List, Optional
+
+import requests
+
+from sandbox_manager.models.sandbox_models import (
+    CommandResponse,
+    ExtractedFile,
+    HttpResponse,
+    Language,
+    ResponseCategory,
+)
+
+TRANSCRIPT_VERSION = 1
+
+# Exceptions a sandbox call may raise that test functions handle; they are recorded and raised again on replay
+_REPLAYABLE_ERRORS = {
+    "FileNotFoundError": FileNotFoundError,
+    "ValueError": ValueError,
+    "RuntimeError": RuntimeError,
+    "TimeoutError": TimeoutError,
+    "RequestException": requests.RequestException,
+}
+
+
+class SandboxTranscript:
+    """
+    Ordered record of every sandbox interaction of one submission.
+
+    Each entry holds the call (command, stdin, workdir, timeout, extracted path or HTTP request)
+    and its outcome (CommandResponse, ExtractedFile, HTTP response or the raised error). The
+    transcript serializes to plain JSON, so it can be stored next to the result and replayed
+    later through ReplaySandbox: a regrade that only changes weights, comparisons or feedback
+    then runs without a container.
+    """
+
+    def __init__(self, entries: Optional[List[dict]] = None):
+        self._lock = threading.Lock()
+        self._entries: List[dict] = list(entries or [])
+        self._recorders: Dict[int, "RecordingSandbox"] = {}
+
+    @property
+    def entries(self) -> List[dict]:
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def record(self, sandbox) -> "RecordingSandbox":
+        """Return the recording view of sandbox (one per sandbox)."""
+        with self._lock:
+            recorder = self._recorders.get(id(sandbox))
+            if recorder is None:
+                recorder = self._recorders[id(sandbox)] = RecordingSandbox(sandbox, self)
+            return recorder
+
+    def append(self, entry: dict) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def to_dict(self) -> dict:
+        return {"version": TRANSCRIPT_VERSION, "entries": self.entries}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SandboxTranscript":
+        version = data.get("version")
+        if version != TRANSCRIPT_VERSION:
+            raise ValueError(f"Unsupported sandbox transcript version: {version}")
+        return cls(data.get("entries", []))
+
+
+def entry_key(entry: dict) -> Hashable:
+    """Identity of the call an entry records; responses are looked up by it on replay."""
+    op = entry["op"]
+    if op == "command":
+        return op, entry["command"], entry["timeout"], entry["workdir"]
+    if op == "batch":
+        # Keyed by the stdin the program receives, so ["5", "3"] and ["5\n3"] are the same run
+        return op, "\n".join(entry["stdin"]), entry["program_command"], entry["timeout"], entry["workdir"]
+    if op == "extract":
+        return op, entry["path"], entry["max_bytes"]
+    if op == "request":
+        return op, entry["method"], entry["endpoint"], entry["params"]
+    raise ValueError(f"Unknown transcript operation: {op}")
+
+
+def _command_response_to_dict(response: CommandResponse) -> dict:
+    return {
+        "stdout": response.stdout,
+        "stderr": response.stderr,
+        "exit_code": response.exit_code,
+        "execution_time": response.execution_time,
+        "category": response.category.value,
+    }
+
+
+def _command_response_from_dict(data: dict) -> CommandResponse:
+    return CommandResponse(
+        stdout=data["stdout"],
+        stderr=data["stderr"],
+        exit_code=data["exit_code"],
+        execution_time=data["execution_time"],
+        category=ResponseCategory(data["category"]),
+    )
+
+
+def _extracted_file_to_dict(extracted: ExtractedFile) -> dict:
+    return {
+        "path": extracted.path,
+        "content": base64.b64encode(extracted.content_bytes).decode("ascii"),
+        "size": extracted.size,
+        "encoding": extracted.encoding,
+    }
+
+
+def _extracted_file_from_dict(data: dict) -> ExtractedFile:
+    content_bytes = base64.b64decode(data["content"])
+    return ExtractedFile(
+        path=data["path"],
+        content_bytes=content_bytes,
+        size=data["size"],
+        content_text=content_bytes.decode(data["encoding"]),
+        encoding=data["encoding"],
+    )
+
+
+def _http_response_to_dict(response: HttpResponse) -> dict:
+    return {
+        "status_code": response.status_code,
+        "headers": response.headers,
+        "content": base64.b64encode(response.content).decode("ascii"),
+    }
+
+
+def _http_response_from_dict(data: dict) -> HttpResponse:
+    # Same construction as RemoteSandboxContainer.make_request
+    response = requests.Response()
+    response.status_code = data["status_code"]
+    response._content = base64.b64decode(data["content"])  # pylint: disable=protected-access
+    response.headers.update(data["headers"])
+    return HttpResponse(response)
+
+
+def _error_to_dict(error: Exception) -> dict:
+    for name, error_type in _REPLAYABLE_ERRORS.items():
+        if isinstance(error, error_type):
+            return {"type": name, "message": str(error)}
+    return {"type": "RuntimeError", "message": str(error)}
+
+
+def _request_params(kwargs: dict) -> str:
+    return json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class RecordingSandbox:
+    """
+    Sandbox view that appends every run, extraction and HTTP request to a transcript;
+    every other attribute is the underlying sandbox's.
+    """
+
+    def __init__(self, sandbox, transcript: SandboxTranscript):
+        self._sandbox = sandbox
+        self._transcript = transcript
+
+    def __getattr__(self, name):
+        return getattr(self._sandbox, name)
+
+    def run_command(self, command: str, timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        response = self._sandbox.run_command(command, timeout=timeout, workdir=workdir)
+        self._transcript.append({
+            "op": "command", "command": command, "timeout": timeout, "workdir": workdir,
+            "response": _command_response_to_dict(response),
+        })
+        return response
+
+    def run_commands(self, commands: List[str], program_command: Optional[str] = None,
+                     timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        response = self._sandbox.run_commands(
+            commands, program_command=program_command, timeout=timeout, workdir=workdir
+        )
+        self._transcript.append({
+            "op": "batch", "stdin": list(commands), "program_command": program_command,
+            "timeout": timeout, "workdir": workdir,
+            "response": _command_response_to_dict(response),
+        })
+        return response
+
+    def extract_file(self, path: str, max_bytes: int = 1_048_576) -> ExtractedFile:
+        entry = {"op": "extract", "path": path, "max_bytes": max_bytes}
+        try:
+            extracted = self._sandbox.extract_file(path, max_bytes=max_bytes)
+        except Exception as e:
+            self._transcript.append({**entry, "error": _error_to_dict(e)})
+            raise
+        self._transcript.append({**entry, "file": _extracted_file_to_dict(extracted)})
+        return extracted
+
+    def make_request(self, method: str, endpoint: str, **kwargs) -> HttpResponse:
+        entry = {"op": "request", "method": method.upper(), "endpoint": endpoint, "params": _request_params(kwargs)}
+        try:
+            response = self._sandbox.make_request(method, endpoint, **kwargs)
+        except Exception as e:
+            self._transcript.append({**entry, "error": _error_to_dict(e)})
+            raise
+        self._transcript.append({**entry, "response": _http_response_to_dict(response)})
+        return response
+
+    def __repr__(self):
+        return f"RecordingSandbox({self._sandbox!r})"
+
+
+class ReplaySandbox:
+    """
+    SandboxContainer stand-in that answers from a recorded transcript instead of a container.
+
+    Calls are matched by their arguments; a call recorded several times is answered in the
+    recorded order and then keeps the last answer. A call the transcript does not hold cannot
+    be answered faithfully: command runs get a SYSTEM_ERROR response, other calls raise, and
+    the call is listed in `misses` so the caller can discard the regrade and run it against a
+    real sandbox instead.
+    """
+
+    def __init__(self, transcript: SandboxTranscript, language: Optional[Language] = None):
+        self.language = language
+        self._lock = threading.Lock()
+        self._answers: Dict[Hashable, List[dict]] = {}
+        self._served: Dict[Hashable, int] = {}
+        for entry in transcript.entries:
+            self._answers.setdefault(entry_key(entry), []).append(entry)
+        self.misses: List[str] = []
+
+    def _answer(self, key: Hashable, description: str) -> Optional[dict]:
+        with self._lock:
+            entries = self._answers.get(key)
+            if entries is None:
+                self.misses.append(description)
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return entries[min(served, len(entries) - 1)]
+
+    @staticmethod
+    def _missing_response(description: str) -> CommandResponse:
+        return CommandResponse(
+            stdout="",
+            stderr=f"Not in sandbox transcript: {description}",
+            exit_code=-1,
+            execution_time=0.0,
+            category=ResponseCategory.SYSTEM_ERROR,
+        )
+
+    @staticmethod
+    def _raise_recorded(entry: dict) -> None:
+        error = entry["error"]
+        raise _REPLAYABLE_ERRORS.get(error["type"], RuntimeError)(error["message"])
+
+    def run_command(self, command: str, timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        description = f"command {command!r}"
+        entry = self._answer(entry_key({"op": "command", "command": command, "timeout": timeout, "workdir": workdir}),
+                             description)
+        if entry is None:
+            return self._missing_response(description)
+        return _command_response_from_dict(entry["response"])
+
+    def run_commands(self, commands: List[str], program_command: Optional[str] = None,
+                     timeout: int = 30, workdir: str = "/app") -> CommandResponse:
+        description = f"program {program_command!r} with stdin {commands!r}"
+        entry = self._answer(entry_key({
+            "op": "batch", "stdin": list(commands), "program_command": program_command,
+            "timeout": timeout, "workdir": workdir,
+        }), description)
+        if entry is None:
+            return self._missing_response(description)
+        return _command_response_from_dict(entry["response"])
+
+    def extract_file(self, path: str, max_bytes: int = 1_048_576) -> ExtractedFile:
+        description = f"file {path}"
+        entry = self._answer(entry_key({"op": "extract", "path": path, "max_bytes": max_bytes}), description)
+        if entry is None:
+            raise RuntimeError(f"Not in sandbox transcript: {description}")
+        if "error" in entry:
+            self._raise_recorded(entry)
+        return _extracted_file_from_dict(entry["file"])
+
+    def make_request(self, method: str, endpoint: str, **kwargs) -> HttpResponse:
+        description = f"{method.upper()} {endpoint}"
+        entry = self._answer(entry_key({
+            "op": "request", "method": method.upper(), "endpoint": endpoint, "params": _request_params(kwargs),
+        }), description)
+        if entry is None:
+            raise requests.RequestException(f"Not in sandbox transcript: {description}")
+        if "error" in entry:
+            self._raise_recorded(entry)
+        return _http_response_from_dict(entry["response"])
+
+    def inject_assets(self, resolved_assets) -> None:
+        """Assets were already in place when the transcript was recorded."""
+
+    def __repr__(self):
+        language = self.language.value if self.language else "none"
+        return f"<ReplaySandbox lang={language} calls={len(self._answers)}>"
@@ -0,0 +1,189 @@
+"""
+Score Model
+
+Flat, linear form of how a criteria tree turns test scores into a final score, used to
+recompute many stored results under alternative weights without regrading or rebuilding
+result trees.
+
+Within a category every test contributes score * coefficient, where the coefficient is the
+product of the test's share among its siblings, its subject's share among its siblings and
+so on up to the category, including the subjects_weight split of mixed holders. That is the
+same weighting the grader applies when it balances sibling weights. The categories are then
+combined with the RootResultNode rules (base + bonus points - penalty points, capped at
+0-100), which are linear as well, so a whole final score is one dot product and a clamp.
+"""
+
+from dataclasses import dataclass, field
+from operator import mul
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from autograder.models.criteria_tree import CategoryNode, CriteriaTree, SubjectNode
+
+
+@dataclass
+class ScoreModel:
+    """
+    Compiled scoring of one criteria tree shape.
+
+    Attributes:
+        paths: Test path of each column, in ResultTree.iter_test_results order. Tests that
+            share a path (several expect_output cases in one subject) get one column each.
+        coefficients: Points each column's score (0-100) adds to the final score, per point
+        offset: Constant term (minus the full penalty weight when there is a penalty category)
+    """
+
+    paths: List[str] = field(default_factory=list)
+    coefficients: List[float] = field(default_factory=list)
+    offset: float = 0.0
+
+    def __post_init__(self):
+        self._columns: Dict[Tuple[str, int], int] = {}
+        seen: Dict[str, int] = {}
+        for index, path in enumerate(self.paths):
+            occurrence = seen.get(path, 0)
+            seen[path] = occurrence + 1
+            self._columns[(path, occurrence)] = index
+
+    def score(self, row: Sequence[float]) -> float:
+        """Final score of one row of test scores."""
+        return max(0.0, min(100.0, self.offset + sum(map(mul, self.coefficients, row))))
+
+    def score_matrix(self, matrix: Sequence[Sequence[float]]) -> List[float]:
+        """Final score of every row."""
+        return [self.score(row) for row in matrix]
+
+    def row_from_result_tree(self, result_tree: Mapping) -> Tuple[List[float], int]:
+        """
+        Align a stored result tree (ResultTree.to_dict(), or the {"children": ...} form kept in
+        submission_results) to the columns of this model.
+
+        Returns:
+            The row, and how many columns the stored tree had no score for (left at 0).
+        """
+        row = [0.0] * len(self.paths)
+        filled = 0
+        seen: Dict[str, int] = {}
+        for path, score in iter_stored_scores(result_tree):
+            occurrence = seen.get(path, 0)
+            seen[path] = occurrence + 1
+            index = self._columns.get((path, occurrence))
+            if index is not None:
+                row[index] = score
+                filled += 1
+        return row, len(self.paths) - filled
+
+    def row_from_score_vector(self, score_vector: Mapping[str, float]) -> Tuple[List[float], int]:
+        """Align a score_vector to the columns; tests sharing a path all take its single score."""
+        row = [float(score_vector.get(path, 0.0)) for path in self.paths]
+        return row, sum(1 for path in self.paths if path not in score_vector)
+
+
+def iter_stored_scores(result_tree: Mapping) -> Iterator[Tuple[str, float]]:
+    """Yield (path, score) of every test of a stored result tree, in iter_test_results order."""
+    root = result_tree
+    for key in ("root", "tree", "children"):
+        if isinstance(result_tree.get(key), Mapping):
+            root = result_tree[key]
+            break
+
+    def walk(holder: Mapping, prefix: str) -> Iterator[Tuple[str, float]]:
+        for subject in holder.get("subjects") or []:
+            yield from walk(subject, f"{prefix}/{subject.get('name', '')}")
+        for test in holder.get("tests") or []:
+            yield f"{prefix}/{test.get('name', '')}", float(test.get("score", 0.0))
+
+    for name in ("base", "bonus", "penalty"):
+        category = root.get(name)
+        if isinstance(category, Mapping):
+            yield from walk(category, category.get("name") or name)
+
+
+def compile_score_model(
+    criteria_tree: CriteriaTree,
+    weights: Optional[Mapping[str, float]] = None,
+    subjects_weight: Optional[Mapping[str, float]] = None,
+) -> ScoreModel:
+    """
+    Compile criteria_tree into a ScoreModel, optionally under alternative weights.
+
+    Args:
+        criteria_tree: Tree whose shape (categories, subjects, tests and weights) is compiled
+        weights: Overrides by path. For "bonus" and "penalty" the value is the category weight
+            in points. For a subject or test it is its share (0-100) among its siblings; the
+            siblings that are not overridden keep their proportions and share the rest.
+        subjects_weight: Overrides of subjects_weight by holder path, for holders with both
+            subjects and tests
+
+    Raises:
+        ValueError: If an override names no node of the tree, or overridden shares of
+            siblings exceed 100.
+    """
+    weights = dict(weights or {})
+    subjects_weight = dict(subjects_weight or {})
+    used = set()
+    paths: List[str] = []
+    coefficients: List[float] = []
+
+    def shares(children: List[Tuple[str, float]]) -> List[float]:
+        fixed = {path: weights[path] for path, _ in children if path in weights}
+        used.update(fixed)
+        if len(fixed) == len(children):
+            total = sum(fixed.values())
+            return [fixed[path] / total if total else 1.0 / len(children) for path, _ in children]
+        remaining = 100.0 - sum(fixed.values())
+        if remaining < 0:
+            raise ValueError(f"Weights of siblings {sorted(fixed)} add up to more than 100")
+        free_total = sum(weight for path, weight in children if path not in fixed)
+        free_count = len(children) - len(fixed)
+        result = []
+        for path, weight in children:
+            if path in fixed:
+                result.append(fixed[path] / 100.0)
+            elif free_total:
+                result.append(remaining / 100.0 * weight / free_total)
+            else:
+                result.append(remaining / 100.0 / free_count)
+        return result
+
+    def walk(holder: CategoryNode | SubjectNode, path: str, factor: float) -> None:
+        subjects = holder.subjects or []
+        tests = holder.tests or []
+        subjects_factor = tests_factor = 1.0
+        if subjects and tests:
+            if path in subjects_weight:
+                used.add(path)
+            split = subjects_weight.get(path, holder.subjects_weight)
+            if not split:
+                raise ValueError(f"missing 'subjects_weight' for {path}")
+            subjects_factor = split / 100.0
+            tests_factor = 1.0 - subjects_factor
+
+        subject_paths = [(f"{path}/{subject.name}", subject.weight) for subject in subjects]
+        for subject, (subject_path, _), share in zip(subjects, subject_paths, shares(subject_paths)):
+            walk(subject, subject_path, factor * subjects_factor * share)
+
+        test_paths = [(f"{path}/{test.name}", test.weight) for test in tests]
+        for (test_path, _), share in zip(test_paths, shares(test_paths)):
+            paths.append(test_path)
+            coefficients.append(factor * tests_factor * share)
+
+    offset = 0.0
+    # Base counts in full; bonus adds weight% of its score; penalty takes weight% of what it misses
+    categories = [(criteria_tree.base, 1.0)]
+    for category in (criteria_tree.bonus, criteria_tree.penalty):
+        if category is not None:
+            if category.name in weights:
+                used.add(category.name)
+            weight = weights.get(category.name, category.weight)
+            categories.append((category, weight / 100.0))
+            if category is criteria_tree.penalty:
+                offset -= weight
+
+    for category, factor in categories:
+        walk(category, category.name, factor)
+
+    unknown = sorted((set(weights) | set(subjects_weight)) - used)
+    if unknown:
+        raise ValueError(f"Unknown criteria paths: {', '.join(unknown)}")
+
+    return ScoreModel(paths=paths, coefficients=coefficients, offset=offset)
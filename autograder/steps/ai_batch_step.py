@@ -32,6 +32,8 @@ class AiBatchStep(Step):
     immediately (empty dict result) and costs nothing.
     """
 
+    depends_on = (StepName.BUILD_TREE,)
+
     @property
     def step_name(self) -> StepName:
         return StepName.AI_BATCH
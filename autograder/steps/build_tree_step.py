@@ -1,9 +1,12 @@
 import logging
+import threading
+from typing import List, Optional, Tuple
 
 from autograder.models.pipeline_execution import PipelineExecution
 from autograder.services.criteria_tree_service import CriteriaTreeService
 from autograder.models.abstract.step import Step
 from autograder.models.config.criteria import CriteriaConfig
+from autograder.models.criteria_tree import CriteriaTree
 from autograder.models.dataclass.step_result import StepResult, StepStatus, StepName
 
 logger = logging.getLogger(__name__)
@@ -16,6 +19,8 @@ class BuildTreeStep(Step):
     The tree is built once and reused for efficiency.
     """
 
+    depends_on = (StepName.LOAD_TEMPLATE,)
+
     def __init__(self, criteria_json: dict):
         """
         Initialize the build tree step.
@@ -25,6 +30,10 @@ class BuildTreeStep(Step):
         """
         self._criteria_json = criteria_json
         self._criteria_tree_service = CriteriaTreeService()
+        # (templates, tree) of the last build; the tree is read-only during grading,
+        # so a cached pipeline shares it across submissions
+        self._built: Optional[Tuple[List, CriteriaTree]] = None
+        self._lock = threading.Lock()
 
     @property
     def step_name(self) -> StepName:
@@ -40,19 +49,29 @@ class BuildTreeStep(Step):
         Returns:
             StepResult containing the built CriteriaTree
         """
-        logger.info("Building criteria tree (external_user_id=%s)", pipeline_exec.submission.user_id)
-        # Validate criteria configuration
-        criteria_config = CriteriaConfig.from_dict(self._criteria_json)
         templates = pipeline_exec.get_loaded_templates()
-        # Build the criteria tree with embedded test functions from multiple templates
-        criteria_tree = self._criteria_tree_service.build_tree(
-            criteria_config,
-            templates
-        )
-        logger.info(
-            "Criteria tree built successfully (external_user_id=%s)",
-            pipeline_exec.submission.user_id,
-        )
+        with self._lock:
+            built = self._built
+        if built is not None and len(built[0]) == len(templates) and all(
+            cached is template for cached, template in zip(built[0], templates)
+        ):
+            logger.info("Reusing compiled criteria tree (external_user_id=%s)", pipeline_exec.submission.user_id)
+            criteria_tree = built[1]
+        else:
+            logger.info("Building criteria tree (external_user_id=%s)", pipeline_exec.submission.user_id)
+            # Validate criteria configuration
+            criteria_config = CriteriaConfig.from_dict(self._criteria_json)
+            # Build the criteria tree with embedded test functions from multiple templates
+            criteria_tree = self._criteria_tree_service.build_tree(
+                criteria_config,
+                templates
+            )
+            with self._lock:
+                self._built = (list(templates), criteria_tree)
+            logger.info(
+                "Criteria tree built successfully (external_user_id=%s)",
+                pipeline_exec.submission.user_id,
+            )
 
         return pipeline_exec.add_step_result(StepResult(
             step=StepName.BUILD_TREE,
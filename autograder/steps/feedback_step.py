@@ -15,6 +15,8 @@ class FeedbackStep(Step):
     It takes the grading result from the GRADE step and produces feedback based on the provided feedback configuration.
     The feedback is a user-faced text that's highly configurable and can include explanations, suggestions and relevant learning resources.
     """
+
+    depends_on = (StepName.GRADE, StepName.FOCUS)
     def __init__(self,
                  reporter_service: ReporterService,
                  feedback_config: dict):
@@ -13,6 +13,8 @@ class FocusStep(Step):
     Step that gets the main subjects to be analyzed by the AI
     """
 
+    depends_on = (StepName.GRADE,)
+
     def __init__(self, trim_service: FocusService) -> None:
         self.__focus_service = trim_service
 
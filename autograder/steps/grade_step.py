@@ -5,6 +5,7 @@ from autograder.models.pipeline_execution import PipelineExecution
 from autograder.models.dataclass.step_result import StepResult, StepStatus, StepName
 from autograder.models.abstract.step import Step
 from autograder.services.grader.grader_service import GraderService
+from autograder.services.sandbox_service import SandboxService
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +18,22 @@ class GradeStep(Step):
     generating a result tree with scores for each test, subject, category and overall final score.
     """
 
+    depends_on = (
+        StepName.LOAD_TEMPLATE,
+        StepName.BUILD_TREE,
+        StepName.SANDBOX,
+        StepName.PRE_FLIGHT,
+        StepName.AI_BATCH,
+        StepName.STRUCTURAL_ANALYSIS,
+    )
+
     def __init__(
         self    ):
         """
         Initialize the grade step.
         """
         self._grader_service = GraderService()
+        self._sandbox_service = SandboxService()
 
     @property
     def step_name(self) -> StepName:
@@ -59,15 +70,48 @@ class GradeStep(Step):
 
         structural_analysis = pipeline_exec.get_structural_analysis_result()
 
-        result_tree = self._grader_service.grade_from_tree(
-            criteria_tree=criteria_tree,
-            submission_files=pipeline_exec.submission.submission_files,
-            sandbox=sandbox,
-            submission_language=pipeline_exec.submission.language,
-            locale=pipeline_exec.locale,
-            pre_computed_results=pre_computed_results,
-            structural_analysis=structural_analysis,
-        )
+        # Large sandbox suites fan out to copies of the prepared sandbox (after pre-flight setup)
+        extra_sandboxes = []
+        fanout = self._grader_service.fanout_size(criteria_tree) if sandbox and not pipeline_exec.replaying else 0
+        if fanout:
+            extra_sandboxes = self._sandbox_service.fan_out(sandbox, fanout)
+            if extra_sandboxes:
+                logger.info(
+                    "Sharding sandbox tests across %d sandboxes (external_user_id=%s)",
+                    len(extra_sandboxes) + 1,
+                    pipeline_exec.submission.user_id,
+                )
+
+        try:
+            result_tree = self._grader_service.grade_from_tree(
+                criteria_tree=criteria_tree,
+                submission_files=pipeline_exec.submission.submission_files,
+                sandbox=sandbox,
+                submission_language=pipeline_exec.submission.language,
+                locale=pipeline_exec.locale,
+                pre_computed_results=pre_computed_results,
+                structural_analysis=structural_analysis,
+                extra_sandboxes=[pipeline_exec.recording(extra) for extra in extra_sandboxes],
+                previous_result=pipeline_exec.previous_result,
+            )
+        finally:
+            if extra_sandboxes:
+                self._sandbox_service.destroy_sandboxes(sandbox.language, extra_sandboxes)
+
+        misses = pipeline_exec.replay_misses
+        if misses:
+            logger.warning(
+                "Replay needs %d sandbox call(s) missing from the transcript (external_user_id=%s): %s",
+                len(misses),
+                pipeline_exec.submission.user_id,
+                misses[0],
+            )
+            return pipeline_exec.add_step_result(StepResult.fail(
+                step=StepName.GRADE,
+                error=f"Sandbox transcript does not cover this regrade ({len(misses)} missing call(s), "
+                      f"first: {misses[0]})",
+                error_data={"transcript_misses": misses},
+            ))
 
         # Create grading result
         final_score = result_tree.calculate_final_score()
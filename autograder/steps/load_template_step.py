@@ -14,6 +14,8 @@ class TemplateLoaderStep(Step):
     Step that loads one or more grading templates, which contain test functions 
     and helper code used for grading.
     """
+
+    depends_on = ()
     def __init__(self, template_name: Union[str, List[str], None], custom_template=None, templates: Optional[List[Any]] = None):
         """
         Initialize the template loader step.
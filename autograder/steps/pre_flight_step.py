@@ -26,9 +26,10 @@ class PreFlightStep(Step):
     If any check fails, the step returns a FAIL status with error details.
     """
 
+    depends_on = (StepName.SANDBOX,)
+
     def __init__(self, setup_config):
         self._setup_config = SetupConfig.from_dict(setup_config)
-        self._pre_flight_service = None
         self._asset_resolver = AssetSourceResolver() if self._setup_config.assets else None
 
     @property
@@ -40,7 +41,8 @@ class PreFlightStep(Step):
         Execute pre-flight checks (required files, assets, setup commands).
         """
         submission_language = pipeline_exec.submission.language
-        self._pre_flight_service = PreFlightService(self._setup_config, submission_language, locale=pipeline_exec.locale)
+        # Per-run service: the step instance may be shared by concurrent runs of a cached pipeline
+        pre_flight_service = PreFlightService(self._setup_config, submission_language, locale=pipeline_exec.locale)
 
         logger.info(
             "Pre-flight checks started: external_user_id=%s, language=%s",
@@ -49,22 +51,22 @@ class PreFlightStep(Step):
         )
 
         # 1. Check required files
-        if self._pre_flight_service.required_files:
+        if pre_flight_service.required_files:
             logger.info("Checking required files for submission (external_user_id=%s)", pipeline_exec.submission.user_id)
-            files_ok = self._pre_flight_service.check_required_files(pipeline_exec.submission.submission_files)
+            files_ok = pre_flight_service.check_required_files(pipeline_exec.submission.submission_files)
 
             if not files_ok:
-                error_msg = self._format_errors()
+                error_msg = self._format_errors(pre_flight_service)
                 logger.warning("Required files check failed (external_user_id=%s): %s", pipeline_exec.submission.user_id, error_msg)
                 return pipeline_exec.add_step_result(StepResult.fail(
                     step=self.step_name,
                     error=error_msg,
-                    error_data=self._pre_flight_service.fatal_errors
+                    error_data=pre_flight_service.fatal_errors
                 ))
 
-        # 2. Inject assets (requires sandbox)
-        sandbox = pipeline_exec.sandbox
-        if self._setup_config.assets:
+        # 2. Inject assets (requires sandbox); a replayed transcript already saw them in place
+        sandbox = pipeline_exec.get_sandbox()
+        if self._setup_config.assets and not pipeline_exec.replaying:
             if not sandbox:
                 error_msg = t("preflight.error.setup_command_missing_sandbox", locale=pipeline_exec.locale)
                 return pipeline_exec.add_step_result(StepResult.fail(
@@ -86,8 +88,7 @@ class PreFlightStep(Step):
 
         # 3. Check setup commands (requires sandbox from a previous step)
 
-        if self._pre_flight_service.setup_commands:
-            sandbox = pipeline_exec.sandbox
+        if pre_flight_service.setup_commands:
             if not sandbox:
                 # If SandboxStep was skipped but we have commands, we must report an error.
                 error_msg = t("preflight.error.missing_sandbox", locale=pipeline_exec.locale)
@@ -98,24 +99,25 @@ class PreFlightStep(Step):
                 ))
 
             logger.info("Running setup commands in sandbox (external_user_id=%s)", pipeline_exec.submission.user_id)
-            setup_ok = self._pre_flight_service.check_setup_commands(sandbox)
+            setup_ok = pre_flight_service.check_setup_commands(sandbox)
             
             if not setup_ok:
-                error_msg = self._format_errors()
+                error_msg = self._format_errors(pre_flight_service)
                 logger.warning("Setup commands failed (external_user_id=%s): %s", pipeline_exec.submission.user_id, error_msg)
                 return pipeline_exec.add_step_result(StepResult.fail(
                     step=self.step_name,
                     error=error_msg,
-                    error_data=self._pre_flight_service.fatal_errors
+                    error_data=pre_flight_service.fatal_errors
                 ))
 
         logger.info("Pre-flight checks passed (external_user_id=%s)", pipeline_exec.submission.user_id)
         return pipeline_exec.add_step_result(StepResult.success(self.step_name, None))
 
-    def _format_errors(self) -> str:
+    @staticmethod
+    def _format_errors(pre_flight_service: PreFlightService) -> str:
         """Format all errors from PreFlightService into a single message."""
-        if self._pre_flight_service and self._pre_flight_service.has_errors():
-            return "\n".join(self._pre_flight_service.get_error_messages())
-        
-        locale = self._pre_flight_service.locale if self._pre_flight_service else None
+        if pre_flight_service.has_errors():
+            return "\n".join(pre_flight_service.get_error_messages())
+
+        locale = pre_flight_service.locale
         return t("preflight.error.unknown", locale=locale)
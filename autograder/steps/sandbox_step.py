@@ -4,6 +4,7 @@ from autograder.models.abstract.step import Step
 from autograder.models.pipeline_execution import PipelineExecution
 from autograder.models.dataclass.step_result import StepResult, StepName
 from autograder.services.sandbox_service import SandboxService
+from autograder.services.sandbox_transcript import ReplaySandbox
 from autograder.translations import t
 
 logger = logging.getLogger(__name__)
@@ -19,6 +20,8 @@ class SandboxStep(Step):
     Note: Setup commands are now executed in the PreFlightStep to keep validations centralized.
     """
 
+    depends_on = (StepName.LOAD_TEMPLATE,)
+
     def __init__(self):
         self._sandbox_service = SandboxService()
 
@@ -49,6 +52,12 @@ class SandboxStep(Step):
             )
             return pipeline_exec.add_step_result(StepResult.success(self.step_name, None))
 
+        if pipeline_exec.replaying:
+            # Regrade from a recorded transcript: no container is acquired
+            logger.info("Replaying sandbox transcript (external_user_id=%s)", pipeline_exec.submission.user_id)
+            pipeline_exec.sandbox = ReplaySandbox(pipeline_exec.transcript, pipeline_exec.submission.language)
+            return pipeline_exec.add_step_result(StepResult.success(self.step_name, pipeline_exec.sandbox))
+
         logger.info("Creating sandbox for submission (external_user_id=%s)", pipeline_exec.submission.user_id)
         sandbox = self._sandbox_service.create_sandbox(pipeline_exec.submission)
         
@@ -20,6 +20,8 @@ class StructuralAnalysisStep(Step):
     This enables structural pattern matching in subsequent grading steps.
     """
 
+    depends_on = ()
+
     @property
     def step_name(self) -> StepName:
         return StepName.STRUCTURAL_ANALYSIS
@@ -1,26 +1,34 @@
 import base64
 import os
+import threading
 from contextlib import asynccontextmanager
-from typing import Dict
 
-from fastapi import FastAPI, HTTPException, status
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Query, status
+from fastapi.responses import JSONResponse, Response
 import logging
 
 from autograder.models.dataclass.asset import ResolvedAsset
 from autograder.models.dataclass.submission import SubmissionFile
 from sandbox_manager.manager import (
     initialize_sandbox_manager,
-    get_sandbox_manager
+    get_sandbox_manager,
+    reload_sandbox_config
 )
 from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.leases import LeaseTable, DEFAULT_LEASE_TTL
+from sandbox_manager.metrics import CONTENT_TYPE, render_metrics
 
 logger = logging.getLogger(__name__)
 from sandbox_manager.sandbox_container import SandboxContainer
 from sandbox_manager.models.sandbox_models import Language
 from sandbox_manager.models.api_models import (
     AcquireSandboxResponse,
+    HeartbeatResponse,
     PrepareWorkdirRequest,
     InjectAssetsRequest,
+    WorkdirSnapshotModel,
     RunCommandRequest,
     RunBatchRequest,
     MakeRequestRequest,
@@ -29,9 +37,41 @@ from sandbox_manager.models.api_models import (
     HttpResponseModel
 )
 
-# Global store for active sandboxes retrieved via the API
-# mapping: sandbox_id -> SandboxContainer
-active_sandboxes: Dict[str, SandboxContainer] = {}
+# Leases for sandboxes handed out via the API, keyed by sandbox_id.
+# Clients renew them with heartbeats (or implicitly on every call); leases that
+# lapse are reclaimed by the reaper thread so crashed clients don't pin capacity.
+lease_table = LeaseTable(ttl=float(os.getenv("SANDBOX_LEASE_TTL", str(DEFAULT_LEASE_TTL))))
+_reaper_stop = threading.Event()
+
+
+def reap_expired_leases() -> int:
+    """Destroy sandboxes whose lease has expired. Returns how many were reclaimed."""
+    expired = lease_table.pop_expired()
+    if not expired:
+        return 0
+
+    manager = get_sandbox_manager()
+    for lease in expired:
+        logger.warning("Lease expired for sandbox %s (%s), reclaiming...",
+                       lease.sandbox_id[:12], lease.sandbox.language.value)
+        try:
+            manager.destroy_sandbox(lease.sandbox.language, lease.sandbox)
+        except ValueError:
+            # Already removed by the pool (e.g. running_timeout fired first)
+            logger.debug("Sandbox %s was already gone from its pool", lease.sandbox_id[:12])
+        except Exception as e:
+            logger.error("Failed to reclaim sandbox %s: %s", lease.sandbox_id[:12], e, exc_info=True)
+    return len(expired)
+
+
+def _lease_reaper():
+    interval = min(1.0, lease_table.ttl / 4)
+    while not _reaper_stop.wait(interval):
+        try:
+            reap_expired_leases()
+        except Exception as e:
+            logger.error("Error in lease reaper: %s", e, exc_info=True)
+
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
@@ -39,10 +79,16 @@ async def lifespan(_app: FastAPI):
     config_file = os.getenv("SANDBOX_CONFIG_FILE", "sandbox_config.yml")
     pool_configs = SandboxPoolConfig.load_from_yaml(config_file)
     initialize_sandbox_manager(pool_configs)
-    
+
+    _reaper_stop.clear()
+    reaper_thread = threading.Thread(target=_lease_reaper, daemon=True)
+    reaper_thread.start()
+
     yield
-    
+
     # Shutdown
+    _reaper_stop.set()
+    lease_table.clear()
     try:
         manager = get_sandbox_manager()
         manager.shutdown()
@@ -57,8 +103,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-def _get_sandbox_or_404(sandbox_id: str) -> SandboxContainer:
-    sandbox = active_sandboxes.get(sandbox_id)
+def _get_sandbox_or_404(sandbox_id: str, hold_for: float = 0.0) -> SandboxContainer:
+    """Look up a leased sandbox, renewing its lease for the duration of the call."""
+    sandbox = lease_table.touch(sandbox_id, hold_for=hold_for)
     if not sandbox:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sandbox not found")
     return sandbox
@@ -70,8 +117,8 @@ def acquire_sandbox(language: Language):
     try:
         sandbox = manager.get_sandbox(language)
         sandbox_id = sandbox.container_ref.id
-        active_sandboxes[sandbox_id] = sandbox
-        return AcquireSandboxResponse(sandbox_id=sandbox_id)
+        lease_table.grant(sandbox_id, sandbox)
+        return AcquireSandboxResponse(sandbox_id=sandbox_id, lease_ttl=lease_table.ttl)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -79,9 +126,17 @@ def acquire_sandbox(language: Language):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@app.post("/sandboxes/{sandbox_id}/heartbeat", response_model=HeartbeatResponse)
+def heartbeat(sandbox_id: str):
+    lease = lease_table.heartbeat(sandbox_id)
+    if not lease:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sandbox not found")
+    return HeartbeatResponse(sandbox_id=sandbox_id, lease_ttl=lease.ttl)
+
+
 @app.post("/sandboxes/{sandbox_id}/prepare")
 def prepare_workdir(sandbox_id: str, request: PrepareWorkdirRequest):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=30)
     try:
         submission_files = {
             name: SubmissionFile(filename=sf.filename, content=sf.content)
@@ -96,7 +151,7 @@ def prepare_workdir(sandbox_id: str, request: PrepareWorkdirRequest):
 
 @app.post("/sandboxes/{sandbox_id}/inject")
 def inject_assets(sandbox_id: str, request: InjectAssetsRequest):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=30)
     try:
         resolved_assets = [
             ResolvedAsset(
@@ -113,9 +168,31 @@ def inject_assets(sandbox_id: str, request: InjectAssetsRequest):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@app.post("/sandboxes/{sandbox_id}/snapshot", response_model=WorkdirSnapshotModel)
+def snapshot_workdir(sandbox_id: str):
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=60)
+    try:
+        archive = sandbox.snapshot_workdir()
+        return WorkdirSnapshotModel(archive=base64.b64encode(archive).decode('ascii'))
+    except Exception as e:
+        logger.error(f"Internal server error: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@app.post("/sandboxes/{sandbox_id}/restore")
+def restore_workdir(sandbox_id: str, request: WorkdirSnapshotModel):
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=60)
+    try:
+        sandbox.restore_workdir(base64.b64decode(request.archive))
+        return {"status": "success"}
+    except Exception as e:
+        logger.error(f"Internal server error: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
 @app.post("/sandboxes/{sandbox_id}/run", response_model=CommandResponseModel)
 def run_command(sandbox_id: str, request: RunCommandRequest):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=request.timeout)
     try:
         response = sandbox.run_command(
             command=request.command,
@@ -136,7 +213,7 @@ def run_command(sandbox_id: str, request: RunCommandRequest):
 
 @app.post("/sandboxes/{sandbox_id}/run-batch", response_model=CommandResponseModel)
 def run_batch(sandbox_id: str, request: RunBatchRequest):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=request.timeout)
     try:
         response = sandbox.run_commands(
             commands=request.commands,
@@ -158,7 +235,7 @@ def run_batch(sandbox_id: str, request: RunBatchRequest):
 
 @app.get("/sandboxes/{sandbox_id}/files", response_model=ExtractedFileResponse)
 def extract_file(sandbox_id: str, path: str, max_bytes: int = 1_048_576):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=30)
     try:
         extracted = sandbox.extract_file(path=path, max_bytes=max_bytes)
         return ExtractedFileResponse(
@@ -177,7 +254,7 @@ def extract_file(sandbox_id: str, path: str, max_bytes: int = 1_048_576):
 
 @app.post("/sandboxes/{sandbox_id}/request", response_model=HttpResponseModel)
 def make_request(sandbox_id: str, request: MakeRequestRequest):
-    sandbox = _get_sandbox_or_404(sandbox_id)
+    sandbox = _get_sandbox_or_404(sandbox_id, hold_for=request.kwargs.get("timeout") or 30)
     try:
         http_response = sandbox.make_request(
             method=request.method,
@@ -198,7 +275,7 @@ def make_request(sandbox_id: str, request: MakeRequestRequest):
 
 @app.delete("/sandboxes/{sandbox_id}")
 def release_sandbox(sandbox_id: str):
-    sandbox = active_sandboxes.pop(sandbox_id, None)
+    sandbox = lease_table.pop(sandbox_id)
     if not sandbox:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sandbox not found")
     
@@ -213,7 +290,7 @@ def release_sandbox(sandbox_id: str):
 
 @app.delete("/sandboxes/{sandbox_id}/destroy")
 def destroy_sandbox(sandbox_id: str):
-    sandbox = active_sandboxes.pop(sandbox_id, None)
+    sandbox = lease_table.pop(sandbox_id)
     if not sandbox:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sandbox not found")
     
@@ -226,7 +303,53 @@ def destroy_sandbox(sandbox_id: str):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@app.get("/ready")
+def get_readiness():
+    """Per-language warm-up progress; 503 until every pool has its minimum idle sandboxes."""
+    manager = get_sandbox_manager()
+    readiness = manager.get_readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if readiness["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=readiness
+    )
+
+
 @app.get("/stats")
 def get_stats():
     manager = get_sandbox_manager()
-    return manager.get_pool_stats()
+    stats = manager.get_pool_stats()
+    stats["leases"] = lease_table.get_stats()
+    return stats
+
+
+@app.get("/stats/history")
+def get_capacity_report(
+    language: Optional[Language] = None,
+    window: Optional[float] = Query(None, gt=0, description="Seconds of history to include"),
+    resolution: int = Query(60, ge=1, le=3600, description="Seconds per returned data point"),
+):
+    """Downsampled per-second pool samples with peak concurrency, p95 wait and recommended sizing."""
+    manager = get_sandbox_manager()
+    try:
+        return manager.get_capacity_report(language, window=window, resolution=resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text exposition of acquire, create, exec and I/O metrics."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
+@app.post("/admin/reload")
+def reload_config():
+    """Re-read SANDBOX_CONFIG_FILE and resize the running pools without dropping active sandboxes."""
+    try:
+        changes = reload_sandbox_config()
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Configuration reload failed: {e}", exc_info=True)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    return {"reloaded": True, "changes": changes}
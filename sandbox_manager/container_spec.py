@@ -0,0 +1,167 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import docker
+from docker.client import DockerClient
+from docker.types.containers import Ulimit
+from docker.utils import parse_repository_tag
+
+logger = logging.getLogger(__name__)
+
+GVISOR_RUNTIME = "runsc"
+
+# Runtimes whose containers get /app as a tmpfs. Elsewhere /app is the image's VOLUME,
+# which keeps the image's ownership of the (empty) workspace.
+APP_TMPFS_RUNTIMES = frozenset({GVISOR_RUNTIME})
+APP_TMPFS = ('/app', 'rw,size=64m,exec')  # Writable in-memory workspace for student code
+
+
+@dataclass(frozen=True)
+class RuntimeCapabilities:
+    """
+    What the Docker host can do, probed once instead of discovered by failing container creations.
+    """
+    runtimes: Tuple[str, ...] = ()
+    default_runtime: str = "runc"
+    kernel_version: Optional[str] = None
+    cgroup_version: Optional[str] = None
+    swap_limit: bool = True
+    pids_limit: bool = True
+
+    @property
+    def gvisor(self) -> bool:
+        return GVISOR_RUNTIME in self.runtimes
+
+    @classmethod
+    def probe(cls, client: DockerClient) -> "RuntimeCapabilities":
+        """
+        Query the daemon for installed runtimes and kernel/cgroup features.
+        Falls back to conservative defaults (no gVisor) if the daemon cannot be queried.
+        """
+        try:
+            info = client.info()
+        except Exception as e:
+            logger.warning("Could not probe Docker runtime capabilities, assuming defaults: %s", e)
+            return cls()
+
+        capabilities = cls(
+            runtimes=tuple(sorted((info.get("Runtimes") or {}).keys())),
+            default_runtime=info.get("DefaultRuntime") or "runc",
+            kernel_version=info.get("KernelVersion"),
+            cgroup_version=info.get("CgroupVersion"),
+            swap_limit=bool(info.get("SwapLimit", True)),
+            pids_limit=bool(info.get("PidsLimit", True)),
+        )
+        logger.info("Docker capabilities probed - runtimes: %s, gVisor: %s, kernel: %s, cgroup: v%s",
+                    ", ".join(capabilities.runtimes) or "unknown", capabilities.gvisor,
+                    capabilities.kernel_version, capabilities.cgroup_version)
+        return capabilities
+
+
+@dataclass(frozen=True)
+class ContainerSpec:
+    """
+    Immutable set of docker run arguments for every container of a pool.
+
+    Built once from the probed RuntimeCapabilities, so creating a sandbox is a single
+    deterministic Docker call with the same isolation settings on every host.
+    """
+    image: str
+    runtime: Optional[str] = None
+    command: str = "sleep infinity"  # Keep container alive for exec commands
+    mem_limit: str = "128m"
+    memswap_limit: Optional[str] = "128m"
+    nano_cpus: int = 500000000  # 0.5 CPU
+    pids_limit: int = 64
+    tmpfs: Tuple[Tuple[str, str], ...] = (('/tmp', 'rw,size=32m,noexec'),)
+    network_mode: str = "none"
+    cap_drop: Tuple[str, ...] = ("ALL",)
+    fsize_limit: int = 10000000
+
+    @classmethod
+    def build(cls, image: str, capabilities: RuntimeCapabilities) -> "ContainerSpec":
+        """
+        Derive the spec for an image from the host capabilities.
+
+        Args:
+            image: Image reference to run, ideally the resolved image id
+            capabilities: Probed host capabilities
+        """
+        if not capabilities.pids_limit:
+            logger.warning("Docker host does not support pids limits; fork bombs are not contained")
+        runtime = GVISOR_RUNTIME if capabilities.gvisor else None
+        tmpfs = cls.tmpfs + (APP_TMPFS,) if runtime in APP_TMPFS_RUNTIMES else cls.tmpfs
+        return cls(
+            image=image,
+            runtime=runtime,
+            tmpfs=tmpfs,
+            # Without swap accounting Docker discards memswap_limit with a warning on every run
+            memswap_limit="128m" if capabilities.swap_limit else None,
+        )
+
+    def run_kwargs(self, name: str, labels: Dict[str, str]) -> dict:
+        """Keyword arguments for DockerClient.containers.run()."""
+        kwargs = {
+            "image": self.image,
+            "name": name,
+            "detach": True,
+            "command": self.command,
+            "mem_limit": self.mem_limit,
+            "nano_cpus": self.nano_cpus,
+            "pids_limit": self.pids_limit,
+            "tmpfs": dict(self.tmpfs),
+            "network_mode": self.network_mode,
+            "cap_drop": list(self.cap_drop),
+            "ulimits": [Ulimit(name='fsize', soft=self.fsize_limit, hard=self.fsize_limit)],
+            "labels": labels,
+        }
+        if self.runtime:
+            kwargs["runtime"] = self.runtime
+        if self.memswap_limit:
+            kwargs["memswap_limit"] = self.memswap_limit
+        return kwargs
+
+
+def ensure_image(client: DockerClient, image: str) -> str:
+    """
+    Verify an image is present locally, pulling it if missing.
+
+    Returns:
+        The image id (content digest) the pool should pin to.
+
+    Raises:
+        docker.errors.ImageNotFound / APIError if the image is neither local nor pullable.
+    """
+    try:
+        return client.images.get(image).id
+    except docker.errors.ImageNotFound:
+        logger.info("Image %s not found locally, pulling...", image)
+        # Splits off the tag or digest only; a registry port ("host:5000/img") stays in the repository
+        repository, tag = parse_repository_tag(image)
+        return client.images.pull(repository, tag=tag or "latest").id
+
+
+def ensure_images(client: DockerClient, images: Iterable[str], max_workers: int = 4) -> Dict[str, Optional[str]]:
+    """
+    Resolve (and pre-pull) several images in parallel.
+
+    Returns:
+        Mapping of image reference to image id, or None for images that are unavailable.
+        Unavailable images are logged, not raised, so one missing language image does not
+        prevent the other pools from starting.
+    """
+    unique_images = sorted(set(images))
+    if not unique_images:
+        return {}
+
+    def resolve(image: str) -> Optional[str]:
+        try:
+            return ensure_image(client, image)
+        except Exception as e:
+            logger.error("Sandbox image %s is not available: %s", image, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_images))) as executor:
+        return dict(zip(unique_images, executor.map(resolve, unique_images)))
@@ -1,16 +1,21 @@
 from datetime import datetime
 import logging
 import threading
+import time
 import uuid
 from collections import deque
-from typing import Set
+from concurrent.futures import Executor
+from typing import Optional, Set
 
 from docker.client import DockerClient
-from docker.types.containers import Ulimit
 
+from sandbox_manager import metrics
+from sandbox_manager.container_spec import ContainerSpec, RuntimeCapabilities, ensure_image
 from sandbox_manager.models.pool_config import SandboxPoolConfig
-from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.models.sandbox_models import Language, SandboxState
+from sandbox_manager.pool_history import PoolHistory
 from sandbox_manager.sandbox_container import SandboxContainer
+from sandbox_manager.timer_wheel import TimerWheel
 
 # Container label constants for tracking and cleanup
 LABEL_APP = "autograder.sandbox.app"
@@ -18,8 +23,18 @@ LABEL_VERSION = "autograder.sandbox.version"
 LABEL_LANGUAGE = "autograder.sandbox.language"
 LABEL_POOL_ID = "autograder.sandbox.pool_id"
 LABEL_CREATED_AT = "autograder.sandbox.created_at"
+LABEL_IMAGE = "autograder.sandbox.image"
 SANDBOX_VERSION = "1.0"
 
+# Max seconds acquire() waits for a container that replenish() is already creating
+CREATE_WAIT_TIMEOUT = 30
+
+# Docker events that mean a container is gone and must be evicted from the idle pool
+EVICTING_EVENTS = ("die", "destroy")
+
+# SandboxPoolConfig fields that can change on a running pool
+RELOADABLE_FIELDS = ("pool_size", "scale_limit", "idle_timeout", "running_timeout")
+
 # Create module-level logger
 logger = logging.getLogger(__name__)
 
@@ -28,26 +43,57 @@ class LanguagePool:
     def __init__(self,
                  language: Language,
                  config: SandboxPoolConfig,
-                 client: DockerClient = None
+                 client: DockerClient = None,
+                 capabilities: Optional[RuntimeCapabilities] = None
                  ):
         self.language = language
         self.config = config
         self.client = client
+        self.capabilities = capabilities
+        self.spec: Optional[ContainerSpec] = None  # Built once by prepare()
+        self.timers: Optional[TimerWheel] = None  # TTL deadlines, attached by the manager
         self.pool_id = str(uuid.uuid4())  # Unique identifier for this pool instance
         self._sandbox_seq = 0  # Per-pool creation sequence counter
 
         self.idle_sandboxes : deque[SandboxContainer] = deque()
         self.active_sandboxes : Set[SandboxContainer] = set()
+        self._creating = 0  # Containers reserved by replenish() but not yet created
+        self._waiting = 0  # acquire() calls not yet served
+        self._waiting_lock = threading.Lock()
+        self.history = PoolHistory()  # Per-second samples for capacity planning
+        self._closed = False
+
+        # Set once the pool first holds its minimum of idle sandboxes
+        self.ready = threading.Event()
 
         # Only blocks for this pool, allowing concurrent access to different pools
         self.lock = threading.Lock()
+        self._idle_available = threading.Condition(self.lock)
 
         logger.info("[%s] POOL INITIALIZED - pool_size: %s, scale_limit: %s, pool_id: %s",
                     language, config.pool_size, config.scale_limit, self.pool_id[:8])
 
     def acquire(self) -> SandboxContainer:
+        started = time.perf_counter()
+        with self._waiting_lock:
+            self._waiting += 1
+        try:
+            return self._acquire(started)
+        finally:
+            with self._waiting_lock:
+                self._waiting -= 1
+
+    def _acquire(self, started: float) -> SandboxContainer:
         with self.lock:
-            current_total = len(self.active_sandboxes) + len(self.idle_sandboxes)
+            current_total = len(self.active_sandboxes) + len(self.idle_sandboxes) + self._creating
+
+            # At the limit only because replenish() is still creating containers (e.g. during
+            # start-up warm-up): wait for one of those instead of failing the request.
+            while not self.idle_sandboxes and self._creating and current_total >= self.config.scale_limit:
+                if not self._idle_available.wait(timeout=CREATE_WAIT_TIMEOUT):
+                    break
+                current_total = len(self.active_sandboxes) + len(self.idle_sandboxes) + self._creating
+
             current_idle = len(self.idle_sandboxes)
             current_active = len(self.active_sandboxes)
 
@@ -59,8 +105,10 @@ class LanguagePool:
                 sandbox = self.idle_sandboxes.popleft()
                 sandbox.pickup() # Update state and timestamp
                 self.active_sandboxes.add(sandbox)
+                self._schedule_running_deadline(sandbox)
                 logger.info("[%s] ACQUIRED from idle pool - sandbox_id: %s",
                             self.language, sandbox.container_ref.id[:12])
+                self._observe_acquire(started, "idle")
                 return sandbox
 
             # No idle sandboxes - check if we can scale up
@@ -71,21 +119,30 @@ class LanguagePool:
                     new_sandbox = self._create_sandbox()
                     new_sandbox.pickup()
                     self.active_sandboxes.add(new_sandbox)
+                    self._schedule_running_deadline(new_sandbox)
                     logger.info("[%s] SCALE-UP SUCCESS - created sandbox_id: %s",
                                 self.language, new_sandbox.container_ref.id[:12])
+                    self._observe_acquire(started, "created")
                     return new_sandbox
                 except Exception as e:
                     logger.exception("[%s] SCALE-UP FAILED - Error: %s", self.language, e)
+                    self._observe_acquire(started, "failed")
                     raise ValueError(f"Failed to create sandbox for language {self.language}: {e}")
 
             # At scale limit and all busy - fail
             logger.warning("[%s] BOTTLENECK DETECTED - All %s sandboxes are BUSY (scale_limit: %s)",
                            self.language, current_total, self.config.scale_limit)
+            self._observe_acquire(started, "rejected")
             raise ValueError(
                 f"No idle sandboxes available for language {self.language}. "
                 f"All {current_total} sandboxes are busy (scale_limit: {self.config.scale_limit})"
             )
 
+    def _observe_acquire(self, started: float, outcome: str):
+        wait = time.perf_counter() - started
+        metrics.ACQUIRE_WAIT.observe(wait, language=self.language.value, outcome=outcome)
+        self.history.record_acquire(wait, served=outcome in ("idle", "created"))
+
     def release(self, sandbox: SandboxContainer) -> None:
         with self.lock:
             if sandbox in self.active_sandboxes:
@@ -123,34 +180,160 @@ class LanguagePool:
 
         return _sandbox_context()
 
-    def replenish(self):
+    def replenish(self, executor: Optional[Executor] = None) -> int:
         """
         Responsible for maintaining minimum pool_size of idle sandboxes.
         Only creates sandboxes if:
         1. Idle count is below pool_size (minimum)
         2. Total sandboxes (active + idle) is below scale_limit (maximum)
+
+        Slots are reserved under the lock and containers are created outside it, so
+        acquire() is never blocked behind a warm-up and concurrent replenish calls
+        cannot overshoot the targets.
+
+        Args:
+            executor: Optional executor to create the missing containers concurrently
+                      (used for start-up warm-up). Creates them one by one otherwise.
+
+        Returns:
+            Number of sandboxes created.
         """
         with self.lock:
-            current_total_sandboxes = len(self.active_sandboxes) + len(self.idle_sandboxes)
+            if self._closed:
+                return 0
             current_idle = len(self.idle_sandboxes)
-            needed = self.config.pool_size - current_idle
+            current_total_sandboxes = len(self.active_sandboxes) + current_idle + self._creating
+            needed = min(self.config.pool_size - current_idle - self._creating,
+                         self.config.scale_limit - current_total_sandboxes)
 
-            if needed > 0:
-                logger.debug("[%s] REPLENISH CHECK - idle: %s/%s (need %s more), total: %s/%s",
-                             self.language, current_idle, self.config.pool_size, needed,
-                             current_total_sandboxes, self.config.scale_limit)
+            if needed <= 0:
+                self._mark_ready_if_warm()
+                return 0
 
-            # Maintain minimum pool_size of idle sandboxes
-            while len(self.idle_sandboxes) < self.config.pool_size and current_total_sandboxes < self.config.scale_limit:
-                try:
-                    new_sandbox = self._create_sandbox()
-                    self.idle_sandboxes.append(new_sandbox)
-                    current_total_sandboxes += 1
-                    logger.info("[%s] REPLENISH SUCCESS - sandbox_id: %s",
-                                self.language, new_sandbox.container_ref.id[:12])
-                except Exception as e:
-                    logger.exception("[%s] REPLENISH FAILED - Error: %s", self.language, e)
-                    break
+            logger.debug("[%s] REPLENISH CHECK - idle: %s/%s (need %s more), total: %s/%s",
+                         self.language, current_idle, self.config.pool_size, needed,
+                         current_total_sandboxes, self.config.scale_limit)
+            self._creating += needed
+
+        try:
+            if executor is not None and needed > 1:
+                created = sum(executor.map(lambda _: self._create_idle_sandbox(), range(needed)))
+            else:
+                created = 0
+                for _ in range(needed):
+                    if not self._create_idle_sandbox():
+                        break  # Don't hammer a failing daemon sequentially
+                    created += 1
+        finally:
+            with self.lock:
+                self._creating -= needed
+                self._mark_ready_if_warm()
+                # Wake waiters so they can fail fast or scale up if some creations failed
+                self._idle_available.notify_all()
+        return created
+
+    def _create_idle_sandbox(self) -> bool:
+        """Create one container into the idle pool. Returns False if creation failed."""
+        try:
+            new_sandbox = self._create_sandbox()
+        except Exception as e:
+            logger.exception("[%s] REPLENISH FAILED - Error: %s", self.language, e)
+            return False
+
+        with self.lock:
+            if not self._closed:
+                self.idle_sandboxes.append(new_sandbox)
+                self._idle_available.notify()
+                self._schedule_idle_deadline(new_sandbox)
+                logger.info("[%s] REPLENISH SUCCESS - sandbox_id: %s",
+                            self.language, new_sandbox.container_ref.id[:12])
+                return True
+
+        # Pool shut down while the container was being created
+        self._destroy_sandbox(new_sandbox)
+        return False
+
+    def _mark_ready_if_warm(self):
+        """Flag readiness once the minimum idle pool has been reached. Caller holds the lock."""
+        if not self.ready.is_set() and len(self.idle_sandboxes) >= min(self.config.pool_size, self.config.scale_limit):
+            self.ready.set()
+            logger.info("[%s] POOL READY - %s idle sandbox(es) warm", self.language, len(self.idle_sandboxes))
+
+    def _schedule_running_deadline(self, sandbox: SandboxContainer, delay: Optional[float] = None):
+        if self.timers is not None:
+            self.timers.schedule_in(self.config.running_timeout if delay is None else delay,
+                                    lambda: self._on_running_deadline(sandbox))
+
+    def _schedule_idle_deadline(self, sandbox: SandboxContainer, delay: Optional[float] = None):
+        if self.timers is not None:
+            self.timers.schedule_in(self.config.idle_timeout if delay is None else delay,
+                                    lambda: self._on_idle_deadline(sandbox))
+
+    def _on_running_deadline(self, sandbox: SandboxContainer):
+        """Timer callback: enforce running_timeout for one active sandbox."""
+        with self.lock:
+            if sandbox not in self.active_sandboxes:
+                return  # Released or destroyed in the meantime
+            elapsed = (datetime.now() - sandbox.last_updated).total_seconds()
+            if elapsed <= self.config.running_timeout:
+                # Picked up again since the timer was armed; wait for the new deadline
+                self._schedule_running_deadline(sandbox, self.config.running_timeout - elapsed)
+                return
+
+        logger.warning("[%s] Sandbox %s exceeded running timeout, destroying...",
+                       self.language, sandbox.container_ref.id)
+        try:
+            self.release(sandbox)
+        except ValueError:
+            pass  # Released concurrently
+
+    def _on_idle_deadline(self, sandbox: SandboxContainer):
+        """Timer callback: scale down one idle sandbox past idle_timeout if above pool_size."""
+        with self.lock:
+            if sandbox not in self.idle_sandboxes:
+                return
+            if len(self.idle_sandboxes) > self.config.pool_size:
+                self.idle_sandboxes.remove(sandbox)
+            else:
+                # Part of the minimum pool; check again after another idle period
+                self._schedule_idle_deadline(sandbox)
+                return
+        self._destroy_sandbox(sandbox)
+
+    def handle_container_event(self, container_id: str, action: str) -> bool:
+        """
+        React to a Docker lifecycle event (die, oom, destroy) for one of this pool's containers.
+
+        Idle sandboxes that died are evicted and replaced right away, instead of being
+        discovered when a submission acquires them. Active sandboxes are left to their
+        holder, whose next command fails and who destroys the sandbox.
+
+        Returns:
+            True if an idle sandbox was evicted.
+        """
+        if action == "oom":
+            metrics.OOM_KILLS.inc(language=self.language.value)
+
+        with self.lock:
+            dead = next((sb for sb in self.idle_sandboxes if sb.container_ref.id == container_id), None)
+            if dead is not None and action in EVICTING_EVENTS:
+                self.idle_sandboxes.remove(dead)
+            else:
+                busy = next((sb for sb in self.active_sandboxes if sb.container_ref.id == container_id), None)
+                if busy is not None:
+                    logger.warning("[%s] ACTIVE SANDBOX EVENT '%s' - sandbox_id: %s",
+                                   self.language, action, container_id[:12])
+                elif dead is not None:
+                    logger.warning("[%s] IDLE SANDBOX EVENT '%s' - sandbox_id: %s",
+                                   self.language, action, container_id[:12])
+                return False
+
+        logger.warning("[%s] IDLE SANDBOX DIED ('%s') - evicting sandbox_id: %s",
+                       self.language, action, container_id[:12])
+        dead.state = SandboxState.STOPPED
+        self._destroy_sandbox(dead)
+        self.replenish()
+        return True
 
     def check_ttls(self):
         """
@@ -182,37 +365,36 @@ class LanguagePool:
                             self.idle_sandboxes.remove(sandbox)
                             self._destroy_sandbox(sandbox)
 
-    def monitor(self):
-        """
-        Called periodically by the manager to check TTLs and trigger replenishment if needed.
-        """
-        self.check_ttls()
-        self.replenish()
+    def log_load(self):
+        """Log current load with a level matching utilization."""
+        stats = self.get_stats()
+        utilization = stats['utilization']
+
+        # Log with appropriate warning level based on utilization
+        if utilization >= 90:
+            logger.warning("[%s] HIGH LOAD - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
+                          self.language, stats['idle'], stats['active'],
+                          stats['total'], stats['scale_limit'], utilization)
+        elif utilization >= 70:
+            logger.info("[%s] MODERATE LOAD - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
+                        self.language, stats['idle'], stats['active'],
+                        stats['total'], stats['scale_limit'], utilization)
+        elif stats['active'] > 0:
+            logger.debug("[%s] STATS - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
+                         self.language, stats['idle'], stats['active'],
+                         stats['total'], stats['scale_limit'], utilization)
+
+    def sample_history(self):
+        """Append the current state to the history ring buffer (called once per second)."""
+        with self.lock:
+            idle, active, warming = len(self.idle_sandboxes), len(self.active_sandboxes), self._creating
+        self.history.sample(idle, active, warming, self._waiting)
 
-        # Periodic stats logging every ~10 calls (assuming 1 second intervals = ~10 seconds)
-        # Only logs when there's active operations
-        if not hasattr(self, '_monitor_counter'):
-            self._monitor_counter = 0
-
-        self._monitor_counter += 1
-        if self._monitor_counter >= 10:
-            self._monitor_counter = 0
-            stats = self.get_stats()
-            utilization = stats['utilization']
-
-            # Log with appropriate warning level based on utilization
-            if utilization >= 90:
-                logger.warning("[%s] HIGH LOAD - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
-                              self.language, stats['idle'], stats['active'],
-                              stats['total'], stats['scale_limit'], utilization)
-            elif utilization >= 70:
-                logger.info("[%s] MODERATE LOAD - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
-                            self.language, stats['idle'], stats['active'],
-                            stats['total'], stats['scale_limit'], utilization)
-            elif stats['active'] > 0:
-                logger.debug("[%s] STATS - idle: %s, active: %s, total: %s/%s, utilization: %.1f%%",
-                             self.language, stats['idle'], stats['active'],
-                             stats['total'], stats['scale_limit'], utilization)
+    def capacity_report(self, window: Optional[float] = None, resolution: int = 60) -> dict:
+        """Downsampled load history with peak concurrency, p95 wait and recommended sizing."""
+        report = self.history.report(self.config.pool_size, self.config.scale_limit, window, resolution)
+        report["language"] = self.language.value
+        return report
 
     def get_stats(self) -> dict:
         """
@@ -221,21 +403,51 @@ class LanguagePool:
         with self.lock:
             return {
                 "language": self.language.value,
+                "ready": self.ready.is_set(),
                 "idle": len(self.idle_sandboxes),
                 "active": len(self.active_sandboxes),
+                "warming": self._creating,
+                "waiting": self._waiting,
                 "total": len(self.idle_sandboxes) + len(self.active_sandboxes),
                 "pool_size": self.config.pool_size,
                 "scale_limit": self.config.scale_limit,
                 "utilization": len(self.active_sandboxes) / (len(self.idle_sandboxes) + len(self.active_sandboxes)) * 100 if (len(self.idle_sandboxes) + len(self.active_sandboxes)) > 0 else 0
             }
 
+    def prepare(self, image_id: Optional[str] = None) -> ContainerSpec:
+        """
+        Probe the host and build the immutable container spec for this pool.
+
+        Called once at pool start-up so that container creation never has to discover
+        runtime support by failing. The spec pins the image id resolved here, so a tag
+        re-pointed while the pool runs does not change what new sandboxes execute.
+
+        Args:
+            image_id: Pre-resolved image id (the manager pre-pulls images in parallel).
+                      Resolved here when not provided.
+        """
+        if self.capabilities is None:
+            self.capabilities = RuntimeCapabilities.probe(self.client)
+
+        if image_id is None:
+            try:
+                image_id = ensure_image(self.client, self.language.image)
+            except Exception as e:
+                logger.error("[%s] Image %s is not available: %s", self.language, self.language.image, e)
+
+        self.spec = ContainerSpec.build(image_id or self.language.image, self.capabilities)
+        logger.info("[%s] CONTAINER SPEC READY - image: %s (%s), runtime: %s",
+                    self.language, self.language.image, self.spec.image[:19],
+                    self.spec.runtime or self.capabilities.default_runtime)
+        return self.spec
+
     def _create_sandbox(self) -> SandboxContainer:
         """
-        Creates a new sandbox container with security constraints.
-        Uses gVisor runtime if available, falls back to default runtime otherwise.
+        Creates a new sandbox container from the pool's precomputed ContainerSpec.
 
         Containers are kept alive with 'sleep infinity' to allow exec commands.
         """
+        spec = self.spec or self.prepare()
         container_name = self._build_container_name()
         logger.info("[%s] CREATE SANDBOX - Starting container creation (%s)...",
                     self.language, container_name)
@@ -246,71 +458,25 @@ class LanguagePool:
             LABEL_VERSION: SANDBOX_VERSION,
             LABEL_LANGUAGE: self.language.value,
             LABEL_POOL_ID: self.pool_id,
+            LABEL_IMAGE: self.language.image,
             LABEL_CREATED_AT: datetime.now().isoformat()
         }
 
-        # Try to use gVisor runtime for enhanced security, fall back to default if not available
+        started = time.perf_counter()
         try:
-            logger.debug("[%s] Attempting to create with gVisor runtime (runsc)...", self.language)
-            container = self.client.containers.run(
-                image=self.language.image,
-                name=container_name,
-                detach=True,
-                command="sleep infinity",  # Keep container alive for exec commands
-                runtime="runsc",  # gVisor runtime for enhanced isolation
-                mem_limit="128m",
-                memswap_limit="128m",
-                nano_cpus=500000000,  # 0.5 CPU
-                pids_limit=64,
-                tmpfs={
-                    '/tmp': 'rw,size=32m,noexec',
-                    '/app': 'rw,size=64m,exec'  # Writable workspace for student code
-                },
-                network_mode="none",
-                cap_drop=["ALL"],
-                ulimits=[
-                    Ulimit(name='fsize', soft=10000000, hard=10000000),
-                ],
-                labels=labels
-            )
-            logger.info("[%s] Container created with gVisor - %s (%s)",
-                        self.language, container_name, container.id[:12])
+            container = self.client.containers.run(**spec.run_kwargs(container_name, labels))
         except Exception as e:
-            # If gVisor is not available, use default runtime with same constraints
-            if "unknown or invalid runtime name" in str(e).lower() or "runsc" in str(e).lower():
-                logger.info("[%s] gVisor runtime not available, falling back to default runtime", self.language)
-                container = self.client.containers.run(
-                    image=self.language.image,
-                    name=container_name,
-                    detach=True,
-                    command="sleep infinity",  # Keep container alive for exec commands
-                    # No runtime specified = default runc
-                    mem_limit="128m",
-                    memswap_limit="128m",
-                    nano_cpus=500000000,  # 0.5 CPU
-                    pids_limit=64,
-                    tmpfs={
-                        '/tmp': 'rw,size=32m,noexec',
-                        # Note: /app intentionally NOT in tmpfs — see above.
-                    },
-                    network_mode="none",
-                    cap_drop=["ALL"],
-                    ulimits=[
-                        Ulimit(name='fsize', soft=10000000, hard=10000000),
-                    ],
-                    labels=labels
-                )
-                logger.info("[%s] Container created with default runtime - %s (%s)",
-                            self.language, container_name, container.id[:12])
-            else:
-                # Re-raise if it's a different error
-                logger.exception("[%s] Container creation failed: %s", self.language, e)
-                raise
-
+            metrics.CREATE_DURATION.observe(time.perf_counter() - started,
+                                            language=self.language.value, outcome="failed")
+            logger.exception("[%s] Container creation failed: %s", self.language, e)
+            raise
+        duration = time.perf_counter() - started
+        metrics.CREATE_DURATION.observe(duration, language=self.language.value, outcome="success")
+        self.history.record_created(duration)
 
         sandbox = SandboxContainer(language=self.language, container_ref=container)
-        logger.info("[%s] SANDBOX CREATED SUCCESSFULLY - %s (%s)",
-                    self.language, container_name, container.id[:12])
+        logger.info("[%s] SANDBOX CREATED SUCCESSFULLY - %s (%s, runtime: %s)",
+                    self.language, container_name, container.id[:12], spec.runtime or "default")
         return sandbox
 
     def _build_container_name(self) -> str:
@@ -345,8 +511,10 @@ class LanguagePool:
         sandbox_id = sandbox.container_ref.id[:12]
         logger.info("[%s] DESTROY SANDBOX - container_id: %s", self.language, sandbox_id)
         try:
-            sandbox.container_ref.stop(timeout=1)
-            sandbox.container_ref.remove()
+            with metrics.DESTROY_DURATION.time(language=self.language.value):
+                sandbox.container_ref.stop(timeout=1)
+                sandbox.container_ref.remove()
+            self.history.record_destroyed()
             logger.info("[%s] SANDBOX DESTROYED - container_id: %s", self.language, sandbox_id)
         except (docker.errors.NotFound, docker.errors.APIError):
             # Container already gone or communication error - ignore silently to avoid noisy logs
@@ -354,6 +522,48 @@ class LanguagePool:
         except Exception as e:
             logger.exception("[%s] Error destroying sandbox %s: %s", self.language, sandbox_id, e)
 
+    def reconfigure(self, config: SandboxPoolConfig, executor: Optional[Executor] = None) -> dict:
+        """
+        Apply a new configuration to the running pool without touching active sandboxes.
+
+        Growing pool_size warms the extra sandboxes immediately; shrinking it destroys
+        the surplus idle ones. A lower scale_limit only applies to future acquisitions,
+        so in-flight grades keep their sandboxes. New timeouts apply to deadlines armed
+        from now on (the monitor's sweep enforces them for the others).
+
+        Args:
+            config: The new configuration for this pool's language
+            executor: Optional executor to create added warm sandboxes concurrently
+
+        Returns:
+            Mapping of changed field name to {"old": ..., "new": ...}.
+        """
+        if config.language != self.language:
+            raise ValueError(f"Cannot apply {config.language} configuration to the {self.language} pool")
+
+        with self.lock:
+            old = self.config
+            changes = {
+                field: {"old": getattr(old, field), "new": getattr(config, field)}
+                for field in RELOADABLE_FIELDS
+                if getattr(old, field) != getattr(config, field)
+            }
+            self.config = config
+
+            surplus = []
+            while len(self.idle_sandboxes) > config.pool_size:
+                surplus.append(self.idle_sandboxes.pop())  # Newest first; oldest are handed out first
+            # A higher scale_limit may unblock acquire() calls waiting on the warm-up
+            self._idle_available.notify_all()
+
+        if changes:
+            logger.info("[%s] POOL RECONFIGURED - %s", self.language,
+                        ", ".join(f"{field}: {c['old']} -> {c['new']}" for field, c in changes.items()))
+        for sandbox in surplus:
+            self._destroy_sandbox(sandbox)
+        self.replenish(executor=executor)
+        return changes
+
     def shutdown(self):
         """
         Destroy all containers in this pool (both active and idle).
@@ -362,6 +572,9 @@ class LanguagePool:
         logger.info("[%s] Shutting down pool, destroying all containers...", self.language)
 
         with self.lock:
+            # Containers still being created are destroyed by their creators
+            self._closed = True
+
             # Copy sets/deques to avoid modification during iteration
             active_snapshot = list(self.active_sandboxes)
             idle_snapshot = list(self.idle_sandboxes)
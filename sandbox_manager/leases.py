@@ -0,0 +1,133 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sandbox_manager.sandbox_container import SandboxContainer
+
+DEFAULT_LEASE_TTL = 30.0
+
+
+@dataclass
+class SandboxLease:
+    """A time-bounded claim a remote client holds on an acquired sandbox."""
+    sandbox_id: str
+    sandbox: SandboxContainer
+    ttl: float
+    acquired_at: float
+    expires_at: float
+    renewals: int = 0
+
+    def renew(self, now: float, hold_for: float = 0.0) -> None:
+        """Push the expiry forward; never shortens a deadline granted by a longer hold."""
+        self.expires_at = max(self.expires_at, now + hold_for + self.ttl)
+        self.renewals += 1
+
+    def is_expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "sandbox_id": self.sandbox_id,
+            "language": self.sandbox.language.value,
+            "age_seconds": round(now - self.acquired_at, 3),
+            "expires_in_seconds": round(self.expires_at - now, 3),
+            "renewals": self.renewals,
+        }
+
+
+class LeaseTable:
+    """
+    Thread-safe registry of sandboxes handed out through the sandbox API.
+
+    Every sandbox acquired over HTTP is held under a lease with a TTL. Clients keep
+    the lease alive with explicit heartbeats, and every API call on the sandbox renews
+    it implicitly. Leases that are not renewed in time are returned by pop_expired()
+    so the caller can reclaim the container.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_LEASE_TTL):
+        if ttl <= 0:
+            raise ValueError("Lease TTL must be positive")
+        self.ttl = ttl
+        self._leases: Dict[str, SandboxLease] = {}
+        self._expired_total = 0
+        self.lock = threading.Lock()
+
+    def grant(self, sandbox_id: str, sandbox: SandboxContainer) -> SandboxLease:
+        """Register a freshly acquired sandbox under a new lease."""
+        now = time.monotonic()
+        lease = SandboxLease(sandbox_id=sandbox_id, sandbox=sandbox, ttl=self.ttl,
+                             acquired_at=now, expires_at=now + self.ttl)
+        with self.lock:
+            self._leases[sandbox_id] = lease
+        return lease
+
+    def touch(self, sandbox_id: str, hold_for: float = 0.0) -> Optional[SandboxContainer]:
+        """
+        Renew a lease and return its sandbox, or None if no live lease exists.
+
+        Args:
+            sandbox_id: Lease identifier (the container id)
+            hold_for: Extra seconds to keep the lease alive, used to cover calls
+                      that block for a known duration (e.g. a command timeout)
+        """
+        now = time.monotonic()
+        with self.lock:
+            lease = self._leases.get(sandbox_id)
+            if lease is None or lease.is_expired(now):
+                return None
+            lease.renew(now, hold_for)
+            return lease.sandbox
+
+    def heartbeat(self, sandbox_id: str) -> Optional[SandboxLease]:
+        """Renew a lease without touching the sandbox itself."""
+        now = time.monotonic()
+        with self.lock:
+            lease = self._leases.get(sandbox_id)
+            if lease is None or lease.is_expired(now):
+                return None
+            lease.renew(now)
+            return lease
+
+    def pop(self, sandbox_id: str) -> Optional[SandboxContainer]:
+        """Remove a lease (on release/destroy) and return its sandbox."""
+        with self.lock:
+            lease = self._leases.pop(sandbox_id, None)
+        return lease.sandbox if lease else None
+
+    def pop_expired(self) -> List[SandboxLease]:
+        """Remove and return every lease whose deadline has passed."""
+        now = time.monotonic()
+        with self.lock:
+            expired = [lease for lease in self._leases.values() if lease.is_expired(now)]
+            for lease in expired:
+                del self._leases[lease.sandbox_id]
+            self._expired_total += len(expired)
+        return expired
+
+    def clear(self) -> List[SandboxLease]:
+        """Drop every lease, returning what was held."""
+        with self.lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+        return leases
+
+    def get_stats(self) -> dict:
+        """Snapshot of the lease table for the /stats endpoint."""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                "ttl": self.ttl,
+                "count": len(self._leases),
+                "expired_total": self._expired_total,
+                "leases": [lease.to_dict(now) for lease in self._leases.values()],
+            }
+
+    def __contains__(self, sandbox_id: str) -> bool:
+        with self.lock:
+            return sandbox_id in self._leases
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._leases)
@@ -1,19 +1,28 @@
 import atexit
+import os
 import signal
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Union
 import docker
+from sandbox_manager import metrics
+from sandbox_manager.container_spec import RuntimeCapabilities, ensure_images
 from sandbox_manager.language_pool import LanguagePool, LABEL_APP
 from sandbox_manager.models.pool_config import SandboxPoolConfig
 from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.pool_monitor import PoolEventMonitor
 from sandbox_manager.sandbox_container import SandboxContainer
 from sandbox_manager.remote_client import RemoteSandboxManager
+from sandbox_manager.timer_wheel import TimerWheel
 
 _MANAGER_INSTANCE: Optional[Union['SandboxManager', RemoteSandboxManager]] = None
 _CLIENT: Optional[docker.DockerClient] = None
 _SHUTDOWN_REGISTERED = False
 
+# Bounded parallelism for start-up work (orphan removal and initial pool filling)
+STARTUP_WORKERS = int(os.getenv("SANDBOX_STARTUP_WORKERS", "8"))
+
 def _get_client() -> docker.DockerClient:
     global _CLIENT
     if _CLIENT is None:
@@ -54,10 +63,21 @@ def initialize_sandbox_manager(
     # Clean up orphaned containers before initializing new pools
     print("[SandboxManager] Cleaning up orphaned containers from previous runs...")
     client = _get_client()
-    _cleanup_orphaned_containers(client)
-
-    language_pools = {config.language: LanguagePool(config.language, config, client) for config in pool_configs}
-    _MANAGER_INSTANCE = SandboxManager(language_pools)
+    _cleanup_orphaned_containers(client, max_workers=STARTUP_WORKERS)
+
+    # Probe the host once and pre-pull every image in parallel, so each pool gets a
+    # ready-made container spec instead of discovering support on its first create.
+    capabilities = RuntimeCapabilities.probe(client)
+    image_ids = ensure_images(client, [config.language.image for config in pool_configs])
+
+    language_pools = {
+        config.language: LanguagePool(config.language, config, client, capabilities=capabilities)
+        for config in pool_configs
+    }
+    for pool in language_pools.values():
+        # Unavailable images fall back to the tag; creation then fails per pool as before
+        pool.prepare(image_ids.get(pool.language.image) or pool.language.image)
+    _MANAGER_INSTANCE = SandboxManager(language_pools, warmup_workers=STARTUP_WORKERS)
 
     # Register cleanup handlers
     _register_shutdown_handlers(_MANAGER_INSTANCE)
@@ -71,10 +91,32 @@ def get_sandbox_manager() -> Union['SandboxManager', RemoteSandboxManager]:
     return _MANAGER_INSTANCE
 
 
-def _cleanup_orphaned_containers(client: docker.DockerClient):
+def reload_sandbox_config(config_path: Optional[str] = None) -> dict:
+    """
+    Re-read the sandbox configuration file and apply it to the running pools.
+
+    Args:
+        config_path: Path to the YAML file (defaults to SANDBOX_CONFIG_FILE)
+
+    Returns:
+        Per-language changes, as returned by SandboxManager.reload().
+
+    Raises:
+        ValueError: If the manager runs in remote mode (reload the sandbox service instead)
+        FileNotFoundError: If the configuration file does not exist
+    """
+    manager = get_sandbox_manager()
+    if not isinstance(manager, SandboxManager):
+        raise ValueError("Configuration reload is only supported in local mode")
+    config_path = config_path or os.getenv("SANDBOX_CONFIG_FILE", "sandbox_config.yml")
+    return manager.reload(SandboxPoolConfig.load_from_yaml(config_path))
+
+
+def _cleanup_orphaned_containers(client: docker.DockerClient, max_workers: int = STARTUP_WORKERS):
     """
     Find and destroy all orphaned sandbox containers from previous runs.
     Identifies containers by the autograder.sandbox.app label.
+    Removals run concurrently, bounded by max_workers.
     """
     try:
         # Find all containers with our app label
@@ -82,20 +124,28 @@ def _cleanup_orphaned_containers(client: docker.DockerClient):
             all=True,
             filters={"label": f"{LABEL_APP}=autograder-sandbox"}
         )
-
-        if orphaned_containers:
-            print(f"[SandboxManager] Found {len(orphaned_containers)} orphaned container(s)")
-            for container in orphaned_containers:
-                try:
-                    print(f"[SandboxManager] Removing orphaned container {container.name} ({container.id[:12]})...")
-                    container.remove(force=True)
-                except Exception as e:
-                    print(f"[SandboxManager] Failed to remove orphaned container {container.name} ({container.id[:12]}): {e}")
-            print("[SandboxManager] Orphan cleanup complete")
-        else:
-            print("[SandboxManager] No orphaned containers found")
     except Exception as e:
         print(f"[SandboxManager] Error during orphan cleanup: {e}")
+        return
+
+    if not orphaned_containers:
+        print("[SandboxManager] No orphaned containers found")
+        return
+
+    print(f"[SandboxManager] Found {len(orphaned_containers)} orphaned container(s)")
+
+    def remove(container) -> bool:
+        try:
+            print(f"[SandboxManager] Removing orphaned container {container.name} ({container.id[:12]})...")
+            container.remove(force=True)
+            return True
+        except Exception as e:
+            print(f"[SandboxManager] Failed to remove orphaned container {container.name} ({container.id[:12]}): {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(orphaned_containers)))) as executor:
+        removed = sum(executor.map(remove, orphaned_containers))
+    print(f"[SandboxManager] Orphan cleanup complete ({removed}/{len(orphaned_containers)} removed)")
 
 
 def _register_shutdown_handlers(manager: 'SandboxManager'):
@@ -114,10 +164,26 @@ def _register_shutdown_handlers(manager: 'SandboxManager'):
             print("\n[SandboxManager] Received shutdown signal, cleaning up...")
             current_manager.shutdown()
 
+    def reload_handler(signum=None, frame=None):
+        _ = signum
+        _ = frame
+
+        # Pulling images and creating containers must not run inside the signal handler
+        def reload():
+            try:
+                reload_sandbox_config()
+            except Exception as e:
+                print(f"[SandboxManager] Configuration reload failed: {e}")
+
+        print("[SandboxManager] Received SIGHUP, reloading sandbox configuration...")
+        threading.Thread(target=reload, daemon=True).start()
+
     if not _SHUTDOWN_REGISTERED:
         # Register for common termination signals
         signal.signal(signal.SIGTERM, shutdown_handler)
         signal.signal(signal.SIGINT, shutdown_handler)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, reload_handler)
 
         # Register atexit handler as last resort
         atexit.register(shutdown_handler)
@@ -125,13 +191,29 @@ def _register_shutdown_handlers(manager: 'SandboxManager'):
 
 class SandboxManager:
     """Manages local language pools for sandbox containers."""
-    def __init__(self, language_pools: Dict[Language, LanguagePool]):
+    def __init__(self, language_pools: Dict[Language, LanguagePool], warmup_workers: int = STARTUP_WORKERS):
         self.language_pools = language_pools
         self._shutdown_in_progress = False
-        for pool in self.language_pools.values():
-            pool.replenish() # Initial creation of sandboxes in each pool
-        self.monitor_thread = threading.Thread(target=self.__pool_monitor, daemon=True)
-        self.monitor_thread.start()
+
+        # Initial creation of sandboxes runs in the background, all pools at once, so
+        # start-up returns immediately and each language becomes ready on its own.
+        # Requests for a language that is still warming are served on demand.
+        self.warmup_thread = threading.Thread(target=self.__warm_up, args=(warmup_workers,), daemon=True)
+        self.warmup_thread.start()
+
+        # Pool maintenance is driven by Docker events and TTL deadlines rather than
+        # a per-second scan of every pool.
+        self.timers = TimerWheel()
+        for pool in language_pools.values():
+            pool.timers = self.timers
+        client = next((pool.client for pool in language_pools.values()), None)
+        self.monitor = PoolEventMonitor(language_pools, self.timers, client=client)
+        self.monitor.start(after=self.warmup_thread)
+
+        metrics.REGISTRY.register(metrics.GaugeCallback(
+            "sandbox_pool_sandboxes", "Sandboxes per language pool by state.",
+            ["language", "state"], self.__collect_pool_gauges
+        ))
 
     def get_sandbox(self, lang: Language) -> SandboxContainer:
         """Acquires a sandbox from the specified language pool."""
@@ -188,6 +270,8 @@ class SandboxManager:
 
         self._shutdown_in_progress = True
         print("[SandboxManager] Initiating shutdown...")
+        self.monitor.stop()
+        metrics.REGISTRY.unregister("sandbox_pool_sandboxes")
 
         # Destroy all containers in all pools
         for language, pool in self.language_pools.items():
@@ -198,6 +282,100 @@ class SandboxManager:
 
         print("[SandboxManager] Shutdown complete")
 
+    def reload(self, pool_configs: List[SandboxPoolConfig], refresh_images: bool = True) -> dict:
+        """
+        Apply new pool configurations to the running pools without restarting.
+
+        Active sandboxes are never destroyed. Warm pools grow or shrink to the new
+        pool_size, and limits apply to subsequent acquisitions. When refresh_images is
+        set, images are re-resolved and pools whose image changed get a new container
+        spec, which only applies to containers created from now on.
+
+        Languages without a running pool are skipped; adding a language needs a restart.
+
+        Returns:
+            Mapping of language to changed fields ({"field": {"old": ..., "new": ...}}).
+        """
+        configs = {config.language: config for config in pool_configs}
+        pools = {language: pool for language, pool in self.language_pools.items() if language in configs}
+        for language in configs.keys() - pools.keys():
+            print(f"[SandboxManager] No running pool for {language}, skipping (restart to add languages)")
+
+        image_changes = {}
+        client = next((pool.client for pool in pools.values()), None)
+        if refresh_images and client is not None:
+            capabilities = RuntimeCapabilities.probe(client)
+            image_ids = ensure_images(client, [language.image for language in pools])
+            for language, pool in pools.items():
+                image_id = image_ids.get(language.image)
+                pool.capabilities = capabilities
+                old_image = pool.spec.image if pool.spec else None
+                if image_id and image_id != old_image:
+                    pool.prepare(image_id)
+                    image_changes[language] = {"image": {"old": old_image, "new": image_id}}
+
+        changes = {}
+        with ThreadPoolExecutor(max_workers=STARTUP_WORKERS, thread_name_prefix="sandbox-reload") as executor:
+            for language, pool in pools.items():
+                pool_changes = {**image_changes.get(language, {}), **pool.reconfigure(configs[language], executor)}
+                changes[language.value] = pool_changes
+
+        print(f"[SandboxManager] Configuration reloaded "
+              f"({sum(1 for c in changes.values() if c)} pool(s) changed)")
+        return changes
+
+    def is_ready(self, lang: Optional[Language] = None) -> bool:
+        """
+        Whether a language pool (or every pool, if lang is None) has reached its minimum warm size.
+        """
+        if lang is not None:
+            pool = self.language_pools.get(lang)
+            return pool is not None and pool.ready.is_set()
+        return all(pool.ready.is_set() for pool in self.language_pools.values())
+
+    def wait_until_ready(self, timeout: Optional[float] = None, lang: Optional[Language] = None) -> bool:
+        """Block until is_ready(lang) or the timeout elapses. Returns the readiness."""
+        pools = [self.language_pools[lang]] if lang is not None else list(self.language_pools.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for pool in pools:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not pool.ready.wait(remaining):
+                return False
+        return True
+
+    def get_readiness(self) -> dict:
+        """
+        Per-language readiness, for progressive start-up reporting.
+        """
+        languages = {}
+        for language, pool in self.language_pools.items():
+            stats = pool.get_stats()
+            languages[language.value] = {
+                "ready": stats["ready"],
+                "idle": stats["idle"],
+                "warming": stats["warming"],
+                "pool_size": stats["pool_size"],
+            }
+        return {
+            "ready": all(entry["ready"] for entry in languages.values()),
+            "languages": languages,
+        }
+
+    def get_capacity_report(self, lang: Optional[Language] = None, window: Optional[float] = None,
+                            resolution: int = 60) -> dict:
+        """
+        Load history and sizing recommendations per language, from each pool's ring buffer.
+
+        Args:
+            lang: Only report this language (all pools if None)
+            window: Seconds of history to include (everything retained if None)
+            resolution: Seconds aggregated into each point of the returned series
+        """
+        if lang is not None and lang not in self.language_pools:
+            raise ValueError(f"Unsupported language: {lang}")
+        pools = [self.language_pools[lang]] if lang is not None else self.language_pools.values()
+        return {pool.language.value: pool.capacity_report(window, resolution) for pool in pools}
+
     def get_pool_stats(self) -> dict:
         """
         Get statistics for all language pools.
@@ -217,11 +395,30 @@ class SandboxManager:
         self.shutdown()
         return False  # Don't suppress exceptions
 
-    def __pool_monitor(self):
-        while not self._shutdown_in_progress:
-            for pool in self.language_pools.values():
-                try:
-                    pool.monitor()
-                except Exception as e:
-                    print(f"Error monitoring pool for language {pool.language}: {e}")
-            time.sleep(1)
+    def __warm_up(self, max_workers: int):
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="sandbox-warmup") as executor:
+            # One coordinator per pool; the shared executor bounds total concurrent creations
+            coordinators = [
+                threading.Thread(target=self.__warm_up_pool, args=(pool, executor), daemon=True)
+                for pool in self.language_pools.values()
+            ]
+            for coordinator in coordinators:
+                coordinator.start()
+            for coordinator in coordinators:
+                coordinator.join()
+        print(f"[SandboxManager] Pool warm-up finished in {time.monotonic() - started:.1f}s")
+
+    def __warm_up_pool(self, pool: LanguagePool, executor: ThreadPoolExecutor):
+        try:
+            pool.replenish(executor=executor)
+        except Exception as e:
+            print(f"[SandboxManager] Error warming up pool for language {pool.language}: {e}")
+
+    def __collect_pool_gauges(self) -> dict:
+        values = {}
+        for language, pool in self.language_pools.items():
+            stats = pool.get_stats()
+            for state in ("idle", "active", "warming"):
+                values[(language.value, state)] = stats[state]
+        return values
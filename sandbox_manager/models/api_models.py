@@ -7,6 +7,11 @@ class AcquireSandboxRequest(BaseModel):
 
 class AcquireSandboxResponse(BaseModel):
     sandbox_id: str
+    lease_ttl: float  # Seconds the lease stays alive without a heartbeat or call
+
+class HeartbeatResponse(BaseModel):
+    sandbox_id: str
+    lease_ttl: float
 
 class SubmissionFileModel(BaseModel):
     filename: str
@@ -23,6 +28,9 @@ class ResolvedAssetModel(BaseModel):
 class InjectAssetsRequest(BaseModel):
     resolved_assets: List[ResolvedAssetModel]
 
+class WorkdirSnapshotModel(BaseModel):
+    archive: str  # Base64 encoded gzipped tar
+
 class RunCommandRequest(BaseModel):
     command: str
     timeout: int = 30
@@ -0,0 +1,175 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Sequence, Tuple
+
+# Per-second samples kept per pool (one hour by default)
+DEFAULT_HISTORY_SECONDS = int(os.getenv("SANDBOX_HISTORY_SECONDS", "3600"))
+
+# Individual acquire waits / create durations kept for percentile estimates
+DEFAULT_DURATION_SAMPLES = 4096
+
+# Headroom applied to observed peak concurrency when recommending scale_limit
+SCALE_LIMIT_HEADROOM = 1.25
+
+
+@dataclass(frozen=True)
+class PoolSample:
+    """Pool state at one sampling instant, plus the activity since the previous sample."""
+    timestamp: float
+    idle: int
+    active: int
+    warming: int
+    waiting: int
+    acquired: int
+    rejected: int
+    created: int
+    destroyed: int
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class PoolHistory:
+    """
+    Fixed-size ring buffer of per-second pool samples.
+
+    The pool reports events (acquires, creates, destroys) as they happen; the monitor
+    calls sample() once per second to close the current interval. Memory is bounded by
+    the capacity regardless of traffic.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SECONDS, duration_samples: int = DEFAULT_DURATION_SAMPLES):
+        self.capacity = capacity
+        self._samples: Deque[PoolSample] = deque(maxlen=capacity)
+        self._waits: Deque[Tuple[float, float]] = deque(maxlen=duration_samples)  # (timestamp, seconds)
+        self._creates: Deque[float] = deque(maxlen=duration_samples)
+        self._acquired = 0
+        self._rejected = 0
+        self._created = 0
+        self._destroyed = 0
+        self._lock = threading.Lock()
+
+    def record_acquire(self, wait: float, served: bool = True, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._waits.append((now, wait))
+            if served:
+                self._acquired += 1
+            else:
+                self._rejected += 1
+
+    def record_created(self, duration: Optional[float] = None):
+        with self._lock:
+            self._created += 1
+            if duration is not None:
+                self._creates.append(duration)
+
+    def record_destroyed(self):
+        with self._lock:
+            self._destroyed += 1
+
+    def sample(self, idle: int, active: int, warming: int = 0, waiting: int = 0,
+               now: Optional[float] = None) -> PoolSample:
+        """Close the current interval and append it to the ring buffer."""
+        now = time.time() if now is None else now
+        with self._lock:
+            sample = PoolSample(
+                timestamp=now, idle=idle, active=active, warming=warming, waiting=waiting,
+                acquired=self._acquired, rejected=self._rejected,
+                created=self._created, destroyed=self._destroyed,
+            )
+            self._acquired = self._rejected = self._created = self._destroyed = 0
+            self._samples.append(sample)
+        return sample
+
+    def samples(self, window: Optional[float] = None, now: Optional[float] = None) -> List[PoolSample]:
+        """Samples from the last window seconds (all retained samples if window is None)."""
+        with self._lock:
+            samples = list(self._samples)
+        if window is None:
+            return samples
+        cutoff = (time.time() if now is None else now) - window
+        return [sample for sample in samples if sample.timestamp >= cutoff]
+
+    def report(self, pool_size: int, scale_limit: int, window: Optional[float] = None,
+               resolution: int = 60, now: Optional[float] = None) -> dict:
+        """
+        Downsampled time series and capacity planning figures.
+
+        Each point aggregates `resolution` seconds: average idle, peak active/warming/waiting
+        and summed activity counts.
+
+        The recommended pool_size is the number of warm sandboxes needed to absorb the
+        p95 per-second acquire rate for as long as a container takes to start (p95), so
+        bursts are served without on-demand creation. The recommended scale_limit is the
+        observed peak concurrency with 25% headroom.
+        """
+        now = time.time() if now is None else now
+        samples = self.samples(window, now)
+        with self._lock:
+            cutoff = None if window is None else now - window
+            waits = [wait for ts, wait in self._waits if cutoff is None or ts >= cutoff]
+            creates = list(self._creates)
+
+        peak_concurrency = max((sample.active for sample in samples), default=0)
+        p95_acquire_rate = percentile([sample.acquired for sample in samples], 95) or 0
+        p95_create = percentile(creates, 95)
+        startup_seconds = max(1.0, p95_create or 1.0)
+
+        recommended_pool_size = max(1, math.ceil(p95_acquire_rate * startup_seconds)) if samples else pool_size
+        recommended_scale_limit = max(
+            recommended_pool_size, math.ceil(peak_concurrency * SCALE_LIMIT_HEADROOM), 1
+        ) if samples else scale_limit
+
+        return {
+            "window_seconds": window,
+            "resolution_seconds": resolution,
+            "sample_count": len(samples),
+            "series": self._downsample(samples, max(1, resolution)),
+            "summary": {
+                "peak_concurrency": peak_concurrency,
+                "peak_waiting": max((sample.waiting for sample in samples), default=0),
+                "acquired": sum(sample.acquired for sample in samples),
+                "rejected": sum(sample.rejected for sample in samples),
+                "p95_wait_seconds": percentile(waits, 95),
+                "p95_create_seconds": p95_create,
+                "p95_acquires_per_second": p95_acquire_rate,
+            },
+            "recommendation": {
+                "current_pool_size": pool_size,
+                "current_scale_limit": scale_limit,
+                "pool_size": recommended_pool_size,
+                "scale_limit": recommended_scale_limit,
+            },
+        }
+
+    @staticmethod
+    def _downsample(samples: List[PoolSample], resolution: int) -> List[dict]:
+        buckets = {}
+        for sample in samples:
+            buckets.setdefault(int(sample.timestamp // resolution) * resolution, []).append(sample)
+
+        series = []
+        for start, bucket in sorted(buckets.items()):
+            series.append({
+                "timestamp": start,
+                "idle": round(sum(sample.idle for sample in bucket) / len(bucket), 2),
+                "active": max(sample.active for sample in bucket),
+                "warming": max(sample.warming for sample in bucket),
+                "waiting": max(sample.waiting for sample in bucket),
+                "acquired": sum(sample.acquired for sample in bucket),
+                "rejected": sum(sample.rejected for sample in bucket),
+                "created": sum(sample.created for sample in bucket),
+                "destroyed": sum(sample.destroyed for sample in bucket),
+            })
+        return series
@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+from typing import Callable, Dict, Optional
+
+from sandbox_manager.language_pool import LanguagePool, LABEL_APP, LABEL_POOL_ID
+from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+# Container lifecycle events the monitor subscribes to
+WATCHED_EVENTS = ("die", "oom", "destroy")
+
+# Fallback sweep (TTL scan, replenish, load logging) in case an event or timer was missed
+SWEEP_INTERVAL = 30.0
+
+# Interval of the pool history samples used for capacity planning
+SAMPLE_INTERVAL = 1.0
+
+# Max seconds between reconnect attempts to the Docker event stream
+MAX_RECONNECT_BACKOFF = 30.0
+
+
+class PoolEventMonitor:
+    """
+    Event-driven maintenance for the language pools.
+
+    Instead of polling every pool each second, the monitor reacts to:
+      - Docker container events (die/oom/destroy) for sandbox containers, which evict
+        dead idle sandboxes and replenish ahead of demand;
+      - TTL deadlines armed on a TimerWheel when sandboxes are created or picked up;
+      - A slow safety sweep that runs the full check_ttls()/replenish() pass.
+
+    It also records one history sample per pool every second for capacity planning.
+
+    All pool work runs on a single loop thread; the event stream is read on its own thread.
+    """
+
+    def __init__(self, language_pools: Dict[Language, LanguagePool], timers: TimerWheel,
+                 client=None, sweep_interval: float = SWEEP_INTERVAL):
+        self.language_pools = language_pools
+        self.timers = timers
+        self.client = client
+        self.sweep_interval = sweep_interval
+        self._tasks: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._stream = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._events_thread: Optional[threading.Thread] = None
+
+    def start(self, after: Optional[threading.Thread] = None):
+        """
+        Start the loop and event threads.
+
+        Args:
+            after: Thread to wait for before the first sweep (the pool warm-up)
+        """
+        self._loop_thread = threading.Thread(target=self._run_loop, args=(after,), daemon=True)
+        self._loop_thread.start()
+        if self.client is not None:
+            self._events_thread = threading.Thread(target=self._watch_events, daemon=True)
+            self._events_thread.start()
+
+    def stop(self):
+        """Stop both threads and close the event stream."""
+        self._stop.set()
+        self._tasks.put(lambda: None)  # Wake the loop
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def submit(self, task: Callable[[], None]):
+        """Run a task on the monitor loop thread."""
+        self._tasks.put(task)
+
+    def dispatch(self, event: dict) -> bool:
+        """
+        Route a decoded Docker event to the pool that owns the container.
+
+        Returns:
+            True if the event belonged to one of the pools and was queued.
+        """
+        action = event.get("Action") or event.get("status")
+        actor = event.get("Actor") or {}
+        container_id = actor.get("ID") or event.get("id")
+        pool_id = (actor.get("Attributes") or {}).get(LABEL_POOL_ID)
+        if action not in WATCHED_EVENTS or not container_id or not pool_id:
+            return False
+
+        pool = next((p for p in self.language_pools.values() if p.pool_id == pool_id), None)
+        if pool is None:
+            return False
+        self.submit(lambda: pool.handle_container_event(container_id, action))
+        return True
+
+    def sweep(self):
+        """Full maintenance pass over every pool."""
+        for pool in self.language_pools.values():
+            try:
+                pool.check_ttls()
+                pool.replenish()
+                pool.log_load()
+            except Exception as e:
+                logger.error("Error monitoring pool for language %s: %s", pool.language, e)
+
+    def _schedule_sampling(self):
+        def run():
+            if self._stop.is_set():
+                return
+            for pool in self.language_pools.values():
+                pool.sample_history()
+            self._schedule_sampling()
+        self.timers.schedule_in(SAMPLE_INTERVAL, run)
+
+    def _schedule_sweep(self):
+        def run():
+            if self._stop.is_set():
+                return
+            self.sweep()
+            self._schedule_sweep()
+        self.timers.schedule_in(self.sweep_interval, run)
+
+    def _run_loop(self, after: Optional[threading.Thread]):
+        # Let the parallel warm-up fill the pools first; a sequential replenish from
+        # here would otherwise reserve the same slots one container at a time.
+        if after is not None:
+            after.join()
+        # The recurring sweep keeps the wheel non-empty, so the loop wakes once per tick
+        # and picks up deadlines armed from other threads.
+        self._schedule_sweep()
+        self._schedule_sampling()
+
+        while not self._stop.is_set():
+            try:
+                task = self._tasks.get(timeout=self.timers.seconds_until_next_tick())
+            except queue.Empty:
+                task = None
+            if self._stop.is_set():
+                break
+            if task is not None:
+                self._run(task)
+            for callback in self.timers.advance():
+                self._run(callback)
+
+    @staticmethod
+    def _run(task: Callable[[], None]):
+        try:
+            task()
+        except Exception as e:
+            logger.error("Pool monitor task failed: %s", e)
+
+    def _watch_events(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                self._stream = self.client.events(
+                    decode=True,
+                    filters={
+                        "type": "container",
+                        "event": list(WATCHED_EVENTS),
+                        "label": f"{LABEL_APP}=autograder-sandbox",
+                    },
+                )
+                backoff = 1.0
+                for event in self._stream:
+                    if self._stop.is_set():
+                        break
+                    self.dispatch(event)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.warning("Docker event stream failed, reconnecting in %.0fs: %s", backoff, e)
+            finally:
+                self._stream = None
+
+            if self._stop.is_set():
+                break
+            # Missed events while disconnected are covered by the next sweep
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, MAX_RECONNECT_BACKOFF)
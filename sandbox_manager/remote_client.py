@@ -1,5 +1,7 @@
 import base64
-from typing import Dict, List, TYPE_CHECKING
+import logging
+import threading
+from typing import Dict, List, Optional, TYPE_CHECKING
 import requests
 from contextlib import contextmanager
 
@@ -14,22 +16,56 @@ from sandbox_manager.models.sandbox_models import (
     HttpResponse
 )
 
+logger = logging.getLogger(__name__)
+
 
 class RemoteSandboxContainer:
     """
     Client wrapper for a remote SandboxContainer communicating via HTTP.
     Matches the interface of SandboxContainer.
     """
-    def __init__(self, sandbox_id: str, language: Language, api_url: str):
+    def __init__(self, sandbox_id: str, language: Language, api_url: str, lease_ttl: Optional[float] = None):
         self.sandbox_id = sandbox_id
         self.language = language
         self.api_url = api_url.rstrip('/')
+        self.lease_ttl = lease_ttl
         self._session = requests.Session()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread = None
+        if lease_ttl:
+            self._start_heartbeat(lease_ttl / 3)
 
     def close(self):
-        """Closes the HTTP session to prevent connection leaks."""
+        """Stops the heartbeat and closes the HTTP session to prevent connection leaks."""
+        self._heartbeat_stop.set()
         self._session.close()
 
+    def heartbeat(self, session: Optional[requests.Session] = None) -> bool:
+        """Renews the sandbox lease. Returns False if the server no longer holds it."""
+        url = f"{self.api_url}/sandboxes/{self.sandbox_id}/heartbeat"
+        response = (session or self._session).post(url, timeout=10)
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def _start_heartbeat(self, interval: float):
+        """Keeps the lease alive while the pipeline is busy elsewhere (e.g. AI calls)."""
+        def beat():
+            # Dedicated session: requests.Session is not safe to share across threads
+            with requests.Session() as session:
+                while not self._heartbeat_stop.wait(interval):
+                    try:
+                        if not self.heartbeat(session):
+                            logger.warning("Lease for sandbox %s was lost, stopping heartbeat",
+                                           self.sandbox_id[:12])
+                            return
+                    except requests.RequestException as e:
+                        logger.warning("Heartbeat for sandbox %s failed: %s", self.sandbox_id[:12], e)
+
+        self._heartbeat_thread = threading.Thread(target=beat, daemon=True)
+        self._heartbeat_thread.start()
+
     def prepare_workdir(self, submission_files: Dict[str, 'SubmissionFile']) -> None:
         """Uploads submission files to the remote sandbox."""
         url = f"{self.api_url}/sandboxes/{self.sandbox_id}/prepare"
@@ -55,6 +91,20 @@ class RemoteSandboxContainer:
         response = self._session.post(url, json={"resolved_assets": assets_data}, timeout=30)
         response.raise_for_status()
 
+    def snapshot_workdir(self) -> bytes:
+        """Archives the remote sandbox's prepared workdir."""
+        url = f"{self.api_url}/sandboxes/{self.sandbox_id}/snapshot"
+        response = self._session.post(url, timeout=60)
+        response.raise_for_status()
+        return base64.b64decode(response.json()["archive"])
+
+    def restore_workdir(self, archive: bytes) -> None:
+        """Unpacks a workdir archive into the remote sandbox."""
+        url = f"{self.api_url}/sandboxes/{self.sandbox_id}/restore"
+        payload = {"archive": base64.b64encode(archive).decode('ascii')}
+        response = self._session.post(url, json=payload, timeout=60)
+        response.raise_for_status()
+
     def run_command(self, command: str, timeout: int = 30, workdir: str = "/app") -> CommandResponse:
         """Executes a single command in the remote sandbox."""
         url = f"{self.api_url}/sandboxes/{self.sandbox_id}/run"
@@ -156,24 +206,29 @@ class RemoteSandboxManager:
         return RemoteSandboxContainer(
             sandbox_id=data["sandbox_id"],
             language=lang,
-            api_url=self.api_url
+            api_url=self.api_url,
+            lease_ttl=data.get("lease_ttl")
         )
 
     def release_sandbox(self, lang: Language, sandbox: RemoteSandboxContainer):
         """Releases the remote sandbox."""
         _ = lang  # unused but part of the interface
         url = f"{self.api_url}/sandboxes/{sandbox.sandbox_id}"
-        response = self._session.delete(url, timeout=15)
-        response.raise_for_status()
-        sandbox.close()
+        try:
+            response = self._session.delete(url, timeout=15)
+            response.raise_for_status()
+        finally:
+            sandbox.close()
 
     def destroy_sandbox(self, lang: Language, sandbox: RemoteSandboxContainer):
         """Destroys the remote sandbox immediately."""
         _ = lang  # unused but part of the interface
         url = f"{self.api_url}/sandboxes/{sandbox.sandbox_id}/destroy"
-        response = self._session.delete(url, timeout=15)
-        response.raise_for_status()
-        sandbox.close()
+        try:
+            response = self._session.delete(url, timeout=15)
+            response.raise_for_status()
+        finally:
+            sandbox.close()
 
     @contextmanager
     def acquire_sandbox(self, lang: Language):
@@ -188,6 +243,21 @@ class RemoteSandboxManager:
         """Shuts down the client session."""
         self._session.close()
 
+    def get_readiness(self) -> dict:
+        """Gets per-language warm-up readiness from the remote API."""
+        url = f"{self.api_url}/ready"
+        response = self._session.get(url, timeout=10)
+        if response.status_code not in (200, 503):
+            response.raise_for_status()
+        return response.json()
+
+    def is_ready(self, lang: Optional[Language] = None) -> bool:
+        """Whether the remote pool for lang (or every pool) is warm."""
+        readiness = self.get_readiness()
+        if lang is None:
+            return readiness["ready"]
+        return readiness["languages"].get(lang.value, {}).get("ready", False)
+
     def get_pool_stats(self) -> dict:
         """Gets pool statistics from the remote API."""
         url = f"{self.api_url}/stats"
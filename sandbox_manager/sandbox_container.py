@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, TYPE_CHECKING
 from docker.models.containers import Container
 import requests
+from sandbox_manager import metrics
 from sandbox_manager.models.sandbox_models import Language, SandboxState, CommandResponse, HttpResponse, \
     ResponseCategory, ExtractedFile
 from sandbox_manager.utils.classify_output import classify_output
@@ -16,6 +17,13 @@ if TYPE_CHECKING:
     from autograder.models.dataclass.submission import SubmissionFile
 
 
+# Directories (relative to /) captured by snapshot_workdir(): the prepared workdir and injected assets
+SNAPSHOT_PATHS = ("app", "tmp")
+# Base64 characters written per exec_run while restoring a snapshot (stays well under ARG_MAX)
+RESTORE_CHUNK_SIZE = 64 * 1024
+RESTORE_STAGING_PATH = "/tmp/.workdir-snapshot.b64"
+
+
 class SandboxContainer:
     """
     Manages a Docker container used as a sandbox for code execution.
@@ -80,7 +88,8 @@ class SandboxContainer:
         if not submission_files:
             return
 
-
+        started = time.perf_counter()
+        bytes_in = 0
         try:
             for submission_file in submission_files.values():
                 file_path = self._normalize_relative_path(submission_file.filename)
@@ -109,10 +118,13 @@ class SandboxContainer:
                 )
                 if result.exit_code != 0:
                     raise RuntimeError(f"Failed to create file {full_file_path}: {result.output}")
+                bytes_in += len(file_content.encode('utf-8'))
 
             self._workdir_prepared = True
+            self._record_exec("prepare", ResponseCategory.SUCCESS.value, time.perf_counter() - started, bytes_in)
 
         except Exception as e:
+            self._record_exec("prepare", ResponseCategory.SYSTEM_ERROR.value, time.perf_counter() - started, bytes_in)
             raise RuntimeError(f"Error preparing workdir: {str(e)}") from e
 
     def inject_assets(self, resolved_assets: List['ResolvedAsset']) -> None:
@@ -128,6 +140,16 @@ class SandboxContainer:
         if not resolved_assets:
             return
 
+        started = time.perf_counter()
+        try:
+            self._inject_assets(resolved_assets)
+        except Exception:
+            self._record_exec("inject", ResponseCategory.SYSTEM_ERROR.value, time.perf_counter() - started)
+            raise
+        self._record_exec("inject", ResponseCategory.SUCCESS.value, time.perf_counter() - started,
+                          bytes_in=sum(len(asset.content) for asset in resolved_assets))
+
+    def _inject_assets(self, resolved_assets: List['ResolvedAsset']) -> None:
         for asset in resolved_assets:
             # Ensure target path starts with /tmp/
             target_path = asset.target
@@ -174,6 +196,69 @@ class SandboxContainer:
                 user="root"
             )
 
+    def snapshot_workdir(self) -> bytes:
+        """
+        Archive the prepared workdir (and injected assets) as a gzipped tar.
+
+        Like extract_file, this goes through exec_run rather than get_archive so files
+        created by setup commands are visible under gVisor.
+
+        Returns:
+            The archive, to be passed to restore_workdir() of a sibling sandbox.
+        """
+        started = time.perf_counter()
+        paths = " ".join(SNAPSHOT_PATHS)
+        result = self.container_ref.exec_run(
+            cmd=["/bin/sh", "-c", f"tar -C / -czf - {paths} | base64"],
+            user="root",
+            demux=True,
+        )
+        stdout, stderr = result.output if result.output else (b'', b'')
+        if result.exit_code != 0:
+            self._record_exec("snapshot", ResponseCategory.SYSTEM_ERROR.value, time.perf_counter() - started)
+            detail = stderr.decode('utf-8', errors='replace') if stderr else "No output"
+            raise RuntimeError(f"Failed to snapshot workdir: {detail}")
+
+        archive = base64.b64decode(stdout or b'')
+        self._record_exec("snapshot", ResponseCategory.SUCCESS.value, time.perf_counter() - started,
+                          bytes_out=len(archive))
+        return archive
+
+    def restore_workdir(self, archive: bytes) -> None:
+        """
+        Unpack an archive produced by snapshot_workdir() over this sandbox's filesystem.
+
+        The archive is staged in chunks so large workdirs (compiled binaries, class files)
+        do not hit the exec argument size limit. Ownership and permissions are preserved.
+        """
+        started = time.perf_counter()
+        encoded = base64.b64encode(archive).decode('ascii')
+        try:
+            for offset in range(0, max(len(encoded), 1), RESTORE_CHUNK_SIZE):
+                redirect = ">" if offset == 0 else ">>"
+                chunk = encoded[offset:offset + RESTORE_CHUNK_SIZE]
+                result = self.container_ref.exec_run(
+                    cmd=["/bin/sh", "-c", f"printf %s '{chunk}' {redirect} {RESTORE_STAGING_PATH}"],
+                    user="root"
+                )
+                if result.exit_code != 0:
+                    raise RuntimeError(f"Failed to stage snapshot: {result.output}")
+
+            result = self.container_ref.exec_run(
+                cmd=["/bin/sh", "-c",
+                     f"base64 -d {RESTORE_STAGING_PATH} | tar -C / -xzpf - && rm -f {RESTORE_STAGING_PATH}"],
+                user="root"
+            )
+            if result.exit_code != 0:
+                raise RuntimeError(f"Failed to unpack snapshot: {result.output}")
+        except Exception:
+            self._record_exec("restore", ResponseCategory.SYSTEM_ERROR.value, time.perf_counter() - started)
+            raise
+
+        self._workdir_prepared = True
+        self._record_exec("restore", ResponseCategory.SUCCESS.value, time.perf_counter() - started,
+                          bytes_in=len(archive))
+
     def _run_with_timeout(self, execute_fn, timeout: int):
         """Helper to run a function in a thread with a timeout."""
         start_time = time.time()
@@ -218,34 +303,8 @@ class SandboxContainer:
             )
 
         result, exception, timed_out, exec_time = self._run_with_timeout(execute, timeout)
-
-        if timed_out:
-            return CommandResponse(
-                stdout='', stderr=f'Execution timed out after {timeout} seconds',
-                exit_code=124, execution_time=exec_time, category=ResponseCategory.TIMEOUT
-            )
-
-        if exception:
-            return CommandResponse(
-                stdout='', stderr=f'Command execution failed: {str(exception)}',
-                exit_code=-1, execution_time=exec_time, category=ResponseCategory.SYSTEM_ERROR
-            )
-
-        if result is None:
-            return CommandResponse(
-                stdout='', stderr='Command execution failed: no result',
-                exit_code=-1, execution_time=exec_time, category=ResponseCategory.SYSTEM_ERROR
-            )
-
-        stdout_bytes, stderr_bytes = result.output if result.output else (b'', b'')
-        stdout = stdout_bytes.decode('utf-8', errors='replace') if stdout_bytes else ''
-        stderr = stderr_bytes.decode('utf-8', errors='replace') if stderr_bytes else ''
-
-        return CommandResponse(
-            stdout=stdout, stderr=stderr, exit_code=result.exit_code,
-            execution_time=exec_time,
-            category=classify_output(stdout, stderr, result.exit_code, self.language)
-        )
+        return self._to_command_response("command", "Command execution failed", len(command.encode('utf-8')),
+                                         result, exception, timed_out, exec_time, timeout)
 
 
     def run_commands(self, commands: List[str], program_command: str = None, timeout: int = 30, workdir: str = "/app") -> CommandResponse:
@@ -280,34 +339,50 @@ class SandboxContainer:
             )
 
         result, exception, timed_out, exec_time = self._run_with_timeout(execute, timeout)
+        bytes_in = sum(len(c.encode('utf-8')) + 1 for c in commands) + len((program_command or '').encode('utf-8'))
+        return self._to_command_response("batch", "Batch command execution failed", bytes_in,
+                                         result, exception, timed_out, exec_time, timeout)
 
+    def _to_command_response(self, operation: str, failure_message: str, bytes_in: int,
+                             result, exception, timed_out: bool, exec_time: float, timeout: int) -> CommandResponse:
+        """Build the CommandResponse for an exec_run outcome and record its metrics."""
         if timed_out:
-            return CommandResponse(
+            response = CommandResponse(
                 stdout='', stderr=f'Execution timed out after {timeout} seconds',
                 exit_code=124, execution_time=exec_time, category=ResponseCategory.TIMEOUT
             )
-
-        if exception:
-            return CommandResponse(
-                stdout='', stderr=f'Batch command execution failed: {str(exception)}',
+            bytes_out = 0
+        elif exception or result is None:
+            detail = str(exception) if exception else 'no result'
+            response = CommandResponse(
+                stdout='', stderr=f'{failure_message}: {detail}',
                 exit_code=-1, execution_time=exec_time, category=ResponseCategory.SYSTEM_ERROR
             )
-
-        if result is None:
-            return CommandResponse(
-                stdout='', stderr='Batch command execution failed: no result',
-                exit_code=-1, execution_time=exec_time, category=ResponseCategory.SYSTEM_ERROR
+            bytes_out = 0
+        else:
+            stdout_bytes, stderr_bytes = result.output if result.output else (b'', b'')
+            stdout = stdout_bytes.decode('utf-8', errors='replace') if stdout_bytes else ''
+            stderr = stderr_bytes.decode('utf-8', errors='replace') if stderr_bytes else ''
+            response = CommandResponse(
+                stdout=stdout, stderr=stderr, exit_code=result.exit_code,
+                execution_time=exec_time,
+                category=classify_output(stdout, stderr, result.exit_code, self.language)
             )
+            bytes_out = len(stdout_bytes or b'') + len(stderr_bytes or b'')
 
-        stdout_bytes, stderr_bytes = result.output if result.output else (b'', b'')
-        stdout = stdout_bytes.decode('utf-8', errors='replace') if stdout_bytes else ''
-        stderr = stderr_bytes.decode('utf-8', errors='replace') if stderr_bytes else ''
+        self._record_exec(operation, response.category.value, exec_time, bytes_in, bytes_out)
+        return response
 
-        return CommandResponse(
-            stdout=stdout, stderr=stderr, exit_code=result.exit_code,
-            execution_time=exec_time,
-            category=classify_output(stdout, stderr, result.exit_code, self.language)
-        )
+    def _record_exec(self, operation: str, category: str, duration: float,
+                     bytes_in: int = 0, bytes_out: int = 0) -> None:
+        language = self.language.value
+        metrics.EXEC_DURATION.observe(duration, language=language, operation=operation, category=category)
+        if bytes_in:
+            metrics.BYTES_IN.inc(bytes_in, language=language, operation=operation)
+        if bytes_out:
+            metrics.BYTES_OUT.inc(bytes_out, language=language, operation=operation)
+        if category == ResponseCategory.TIMEOUT.value:
+            metrics.TIMEOUTS.inc(language=language, operation=operation)
 
 
     def extract_file(self, path: str, max_bytes: int = 1_048_576) -> ExtractedFile:
@@ -332,6 +407,13 @@ class SandboxContainer:
         """
         if not path.startswith("/"):
             raise ValueError(f"Path must be absolute inside container: {path}")
+        started = time.perf_counter()
+        extracted = self._extract_file(path, max_bytes)
+        self._record_exec("extract", ResponseCategory.SUCCESS.value, time.perf_counter() - started,
+                          bytes_out=extracted.size)
+        return extracted
+
+    def _extract_file(self, path: str, max_bytes: int) -> ExtractedFile:
         safe_path = shlex.quote(path)
 
         # Check file exists and get its size
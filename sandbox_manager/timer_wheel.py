@@ -0,0 +1,90 @@
+import itertools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel for sandbox TTL deadlines.
+
+    Scheduling and cancelling are O(1), and advancing the wheel only touches the slots
+    that elapsed, so the cost of a tick is proportional to the timers that are due,
+    not to the number of sandboxes being tracked. Deadlines further away than one
+    rotation simply stay in their slot until their tick comes around.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512, clock: Callable[[], float] = time.monotonic):
+        if tick <= 0 or slots <= 0:
+            raise ValueError("tick and slots must be positive")
+        self.tick = tick
+        self.slots = slots
+        self._clock = clock
+        self._wheel: List[Dict[int, Tuple[int, Callable[[], None]]]] = [{} for _ in range(slots)]
+        self._index: Dict[int, int] = {}  # handle -> slot
+        self._handles = itertools.count(1)
+        self._current_tick = self._tick_of(clock())
+        self._lock = threading.Lock()
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick)
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> int:
+        """
+        Run callback once the clock passes deadline (an absolute clock() timestamp).
+
+        Returns:
+            A handle that can be passed to cancel().
+        """
+        with self._lock:
+            target_tick = max(math.ceil(deadline / self.tick), self._current_tick + 1)
+            slot = target_tick % self.slots
+            handle = next(self._handles)
+            self._wheel[slot][handle] = (target_tick, callback)
+            self._index[handle] = slot
+            return handle
+
+    def schedule_in(self, delay: float, callback: Callable[[], None]) -> int:
+        """Run callback after delay seconds."""
+        return self.schedule(self._clock() + delay, callback)
+
+    def cancel(self, handle: int) -> bool:
+        """Cancel a pending timer. Returns False if it already fired or was cancelled."""
+        with self._lock:
+            slot = self._index.pop(handle, None)
+            if slot is None:
+                return False
+            self._wheel[slot].pop(handle, None)
+            return True
+
+    def advance(self, now: Optional[float] = None) -> List[Callable[[], None]]:
+        """
+        Move the wheel forward to now and return the callbacks that became due.
+        Callbacks are returned rather than run so the caller controls where they execute.
+        """
+        now_tick = self._tick_of(self._clock() if now is None else now)
+        due = []
+        with self._lock:
+            if now_tick <= self._current_tick:
+                return due
+
+            # After a long stall, one full rotation visits every slot
+            elapsed = min(now_tick - self._current_tick, self.slots)
+            for offset in range(elapsed, 0, -1):
+                slot_entries = self._wheel[(now_tick - offset + 1) % self.slots]
+                for handle, (target_tick, callback) in list(slot_entries.items()):
+                    if target_tick <= now_tick:
+                        due.append(callback)
+                        del slot_entries[handle]
+                        del self._index[handle]
+            self._current_tick = now_tick
+        return due
+
+    def seconds_until_next_tick(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        return max(0.0, (self._tick_of(now) + 1) * self.tick - now)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
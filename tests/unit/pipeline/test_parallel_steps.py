@@ -0,0 +1,141 @@
+"""
+Tests for dependency-aware concurrent step scheduling in AutograderPipeline.
+"""
+
+import threading
+import time
+
+import pytest
+
+from autograder.autograder import AutograderPipeline
+from autograder.models.abstract.step import Step
+from autograder.models.dataclass.step_result import StepName, StepResult
+from autograder.models.dataclass.submission import Submission, SubmissionFile
+from autograder.models.pipeline_execution import PipelineExecution, PipelineStatus
+from sandbox_manager.models.sandbox_models import Language
+
+
+class FakeStep(Step):
+    def __init__(self, name, depends_on=(), delay=0.0, fail=False, sandbox=None, log=None):
+        self._name = name
+        self.depends_on = depends_on
+        self.delay = delay
+        self.fail = fail
+        self.sandbox = sandbox
+        self.log = log if log is not None else []
+        self.seen = None
+        self.started = threading.Event()
+
+    @property
+    def step_name(self):
+        return self._name
+
+    def _execute(self, pipeline_exec):
+        self.seen = [result.step for result in pipeline_exec.step_results]
+        self.started.set()
+        self.log.append(("start", self._name, time.monotonic()))
+        time.sleep(self.delay)
+        self.log.append(("end", self._name, time.monotonic()))
+        if self.sandbox is not None:
+            pipeline_exec.sandbox = self.sandbox
+        if self.fail:
+            return pipeline_exec.add_step_result(StepResult.fail(self._name, "failed"))
+        return pipeline_exec.add_step_result(StepResult.success(self._name, self._name.value))
+
+
+@pytest.fixture
+def execution():
+    submission = Submission(
+        username="testuser", user_id=1, assignment_id=1, language=Language.PYTHON,
+        submission_files={"main.py": SubmissionFile(filename="main.py", content="print('hello')")},
+    )
+    return PipelineExecution.start_execution(submission)
+
+
+def _pipeline(*steps, max_workers=4):
+    pipeline = AutograderPipeline(max_workers=max_workers)
+    for step in steps:
+        pipeline.add_step(step.step_name, step)
+    return pipeline
+
+
+def test_independent_steps_overlap_and_results_keep_step_order(execution):
+    log = []
+    pipeline = _pipeline(
+        FakeStep(StepName.LOAD_TEMPLATE, log=log),
+        FakeStep(StepName.BUILD_TREE, (StepName.LOAD_TEMPLATE,), delay=0.1, log=log),
+        FakeStep(StepName.SANDBOX, (StepName.LOAD_TEMPLATE,), delay=0.1, log=log),
+        FakeStep(StepName.GRADE, (StepName.BUILD_TREE, StepName.SANDBOX), log=log),
+    )
+
+    started = time.monotonic()
+    pipeline._run_concurrently(execution)
+
+    assert time.monotonic() - started < 0.19
+    assert [result.step for result in execution.step_results] == [
+        StepName.BOOTSTRAP, StepName.LOAD_TEMPLATE, StepName.BUILD_TREE, StepName.SANDBOX, StepName.GRADE,
+    ]
+    assert execution.status == PipelineStatus.RUNNING
+
+
+def test_step_only_sees_results_it_may_depend_on(execution):
+    grade = FakeStep(StepName.GRADE, (StepName.BUILD_TREE, StepName.SANDBOX))
+    pipeline = _pipeline(
+        FakeStep(StepName.BUILD_TREE),
+        FakeStep(StepName.SANDBOX, delay=0.05),
+        grade,
+    )
+
+    pipeline._run_concurrently(execution)
+
+    assert set(grade.seen) == {StepName.BOOTSTRAP, StepName.BUILD_TREE, StepName.SANDBOX}
+
+
+def test_failure_stops_in_step_order_and_drops_later_results(execution):
+    feedback = FakeStep(StepName.FEEDBACK, (StepName.GRADE,))
+    pipeline = _pipeline(
+        FakeStep(StepName.SANDBOX, delay=0.05, fail=True),
+        FakeStep(StepName.AI_BATCH),  # Independent; finishes first but is after the failure
+        FakeStep(StepName.GRADE, (StepName.SANDBOX, StepName.AI_BATCH)),
+        feedback,
+    )
+
+    pipeline._run_concurrently(execution)
+
+    assert [result.step for result in execution.step_results] == [StepName.BOOTSTRAP, StepName.SANDBOX]
+    assert execution.status == PipelineStatus.FAILED
+    assert feedback.seen is None
+
+
+def test_unhandled_exception_interrupts_and_keeps_sandbox_for_cleanup(execution):
+    sandbox = object()
+    sandbox_step = FakeStep(StepName.SANDBOX, sandbox=sandbox, delay=0.1)
+
+    class CrashingStep(FakeStep):
+        def execute(self, pipeline_exec):
+            sandbox_step.started.wait(1)
+            raise RuntimeError("boom")  # Escapes Step.execute's own error handling
+
+    pipeline = _pipeline(CrashingStep(StepName.BUILD_TREE), sandbox_step, max_workers=2)
+
+    pipeline._run_concurrently(execution)
+
+    assert execution.status == PipelineStatus.INTERRUPTED
+    assert [result.step for result in execution.step_results] == [StepName.BOOTSTRAP]
+    assert execution.sandbox is sandbox  # Still destroyed by _cleanup_sandbox
+
+
+def test_steps_without_declared_dependencies_wait_for_all_earlier_steps(execution):
+    log = []
+    exporter = FakeStep(StepName.EXPORTER, depends_on=None, log=log)
+    pipeline = _pipeline(
+        FakeStep(StepName.GRADE, delay=0.05, log=log),
+        FakeStep(StepName.FEEDBACK, delay=0.1, log=log),
+        exporter,
+    )
+
+    pipeline._run_concurrently(execution)
+
+    ends = {name: ts for kind, name, ts in log if kind == "end"}
+    exporter_start = next(ts for kind, name, ts in log if kind == "start" and name == StepName.EXPORTER)
+    assert exporter_start >= ends[StepName.FEEDBACK]
@@ -215,6 +215,32 @@ def test_build_tree_step():
     print(f"  - Bonus category: {criteria_tree.bonus.name}")
 
 
+def test_build_tree_step_reuses_tree_for_same_templates():
+    """A shared BuildTreeStep compiles the tree once for the same loaded templates."""
+    criteria = create_simple_criteria()
+    template = MockTemplate()
+    build_step = BuildTreeStep(criteria)
+
+    def run(templates):
+        submission = Submission(
+            username="test_user",
+            user_id=1,
+            assignment_id=1,
+            submission_files={"main.py": SubmissionFile(filename="main.py", content="print(input())")}
+        )
+        pipeline_execution = PipelineExecution.start_execution(submission)
+        pipeline_execution.add_step_result(StepResult(
+            step=StepName.LOAD_TEMPLATE,
+            data=templates,
+            status=StepStatus.SUCCESS
+        ))
+        return build_step.execute(pipeline_execution).get_step_result(StepName.BUILD_TREE).data
+
+    first = run(template)
+    assert run(template) is first
+    assert run(MockTemplate()) is not first
+
+
 def test_grade_from_tree():
     """Test that GradeStep can grade from a CriteriaTree."""
     print("\n" + "=" * 80)
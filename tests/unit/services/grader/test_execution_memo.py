@@ -0,0 +1,139 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from autograder.models.criteria_tree import CategoryNode, TestNode
+from autograder.services.grader.criteria_grader import SubmissionGrader
+from autograder.services.grader.execution_memo import SandboxExecutionMemo
+from autograder.template_library.input_output import DontFailTest, ExpectOutputTest
+from sandbox_manager.models.sandbox_models import CommandResponse, ResponseCategory
+
+
+def _response(stdout="8\n", category=ResponseCategory.SUCCESS):
+    return CommandResponse(stdout=stdout, stderr="", exit_code=0, execution_time=0.01, category=category)
+
+
+class CountingSandbox:
+    def __init__(self, response=None, delay=0.0):
+        self.response = response or _response()
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.batches = []
+        self.commands = []
+
+    def run_commands(self, commands, program_command=None, timeout=30, workdir="/app"):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append((tuple(commands), program_command))
+        return self.response
+
+    def run_command(self, command, timeout=30, workdir="/app"):
+        with self.lock:
+            self.commands.append(command)
+        return self.response
+
+    def extract_file(self, path, max_bytes=1_048_576):
+        return f"extracted {path}"
+
+
+def test_identical_executions_run_once():
+    sandbox = CountingSandbox()
+    memo = SandboxExecutionMemo()
+    wrapped = memo.wrap(sandbox)
+
+    first = wrapped.run_commands(["5", "3"], program_command="python calc.py")
+    second = wrapped.run_commands(["5", "3"], program_command="python calc.py")
+
+    assert first is second
+    assert len(sandbox.batches) == 1
+    assert (memo.runs, memo.hits) == (1, 1)
+
+
+def test_key_covers_inputs_command_timeout_and_workdir():
+    sandbox = CountingSandbox()
+    wrapped = SandboxExecutionMemo().wrap(sandbox)
+
+    wrapped.run_commands(["5", "3"], program_command="python calc.py")
+    wrapped.run_commands(["5", "4"], program_command="python calc.py")
+    wrapped.run_commands(["5", "3"], program_command="python other.py")
+    wrapped.run_commands(["5", "3"], program_command="python calc.py", timeout=10)
+    wrapped.run_commands(["5", "3"], program_command="python calc.py", workdir="/app/src")
+    wrapped.run_command("ls")
+    wrapped.run_command("ls")
+
+    assert len(sandbox.batches) == 5
+    assert sandbox.commands == ["ls"]
+
+
+def test_executions_are_not_shared_between_sandboxes():
+    memo = SandboxExecutionMemo()
+    primary, shard = CountingSandbox(), CountingSandbox()
+
+    memo.wrap(primary).run_commands(["1"], program_command="./main")
+    memo.wrap(shard).run_commands(["1"], program_command="./main")
+
+    assert len(primary.batches) == len(shard.batches) == 1
+
+
+def test_system_errors_are_retried():
+    sandbox = CountingSandbox(response=_response(category=ResponseCategory.SYSTEM_ERROR))
+    wrapped = SandboxExecutionMemo().wrap(sandbox)
+
+    wrapped.run_commands(["1"], program_command="./main")
+    wrapped.run_commands(["1"], program_command="./main")
+
+    assert len(sandbox.batches) == 2
+
+
+def test_exceptions_propagate_and_are_retried():
+    sandbox = MagicMock()
+    sandbox.run_command.side_effect = [RuntimeError("docker gone"), _response()]
+    wrapped = SandboxExecutionMemo().wrap(sandbox)
+
+    with pytest.raises(RuntimeError):
+        wrapped.run_command("./main")
+    assert wrapped.run_command("./main").stdout == "8\n"
+
+
+def test_concurrent_duplicates_wait_for_the_first_run():
+    sandbox = CountingSandbox(delay=0.05)
+    wrapped = SandboxExecutionMemo().wrap(sandbox)
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(wrapped.run_commands(["2"], program_command="./main")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(sandbox.batches) == 1
+    assert len(results) == 4 and all(result is results[0] for result in results)
+
+
+def test_other_sandbox_calls_pass_through():
+    wrapped = SandboxExecutionMemo().wrap(CountingSandbox())
+    assert wrapped.extract_file("/app/out.txt") == "extracted /app/out.txt"
+
+
+def test_grader_shares_execution_between_tests():
+    sandbox = CountingSandbox(response=_response("8\n"))
+    params = {"inputs": ["5", "3"], "program_command": "python calc.py"}
+    category = CategoryNode(name="base", weight=100, tests=[
+        TestNode(name="runs", test_function=DontFailTest(),
+                 parameters={"user_input": "5\n3", "program_command": "python calc.py"}),
+        TestNode(name="sum", test_function=ExpectOutputTest(), parameters=dict(params, expected_output="8")),
+    ])
+    command_resolver = MagicMock()
+    command_resolver.resolve_command.side_effect = lambda c, lang: c
+
+    grader = SubmissionGrader(submission_files={}, command_resolver=command_resolver,
+                              sandbox=sandbox, dedup_sandbox_runs=True)
+    result = grader.process_category(category)
+
+    assert len(sandbox.batches) == 1
+    assert [test.score for test in result.tests] == [100.0, 100.0]
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+
+from autograder.models.abstract.test_function import TestFunction
+from autograder.models.criteria_tree import CategoryNode, CriteriaTree, SubjectNode, TestNode
+from autograder.models.dataclass.test_result import TestResult
+from autograder.models.result_tree import ResultTree
+from autograder.services.grader.grader_service import GraderService
+from autograder.services.grader.incremental_regrade import (
+    FINGERPRINT_KEY,
+    diff_criteria_tree,
+    iter_criteria_tests,
+)
+
+
+class CountingTestFunction(TestFunction):
+    """Scores each test with its `score` parameter and counts executions."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executed = []
+
+    @property
+    def name(self) -> str:
+        return "expect_output"
+
+    @property
+    def description(self) -> str:
+        return "counting test"
+
+    @property
+    def parameter_description(self) -> list:
+        return []
+
+    def execute(self, files=None, sandbox=None, **kwargs):
+        with self.lock:
+            self.executed.append(kwargs.get("label"))
+        return TestResult(test_name=self.name, score=kwargs.get("score", 100.0), report=f"ran {kwargs.get('label')}")
+
+
+def _tree(fn, io_weight=60, tests=(("a", 100.0), ("b", 0.0)), bonus=None):
+    io = SubjectNode(
+        name="io",
+        weight=io_weight,
+        tests=[
+            TestNode(name="expect_output", test_function=fn, parameters={"label": label, "score": score},
+                     requires_sandbox=False)
+            for label, score in tests
+        ],
+    )
+    style = SubjectNode(
+        name="style",
+        weight=100 - io_weight,
+        tests=[TestNode(name="lint", test_function=fn, parameters={"label": "lint", "score": 50.0},
+                        requires_sandbox=False)],
+    )
+    base = CategoryNode(name="base", weight=100, subjects=[io, style])
+    return CriteriaTree(base=base, bonus=bonus)
+
+
+def _stored(result_tree: ResultTree) -> ResultTree:
+    """Round trip through the dict stored in submission_results.result_tree."""
+    return ResultTree.from_dict({"final_score": result_tree.root.score, "children": result_tree.root.to_dict()})
+
+
+def _grade(tree, previous=None, **kwargs):
+    result = GraderService(test_workers=1).grade_from_tree(tree, {}, previous_result=previous, **kwargs)
+    result.calculate_final_score()
+    return result
+
+
+def test_diff_matches_by_path_function_and_parameters():
+    fn = CountingTestFunction()
+    previous = _stored(_grade(_tree(fn)))
+
+    edited = _tree(fn, tests=(("a", 100.0), ("c", 100.0)))
+    diff = diff_criteria_tree(edited, previous)
+
+    changed = [test.parameters["label"] for test in diff.changed]
+    reused = {path for path, test in iter_criteria_tests(edited) if id(test) in diff.reused}
+    assert changed == ["c"]
+    assert reused == {"base/io/expect_output", "base/style/lint"}
+    assert diff.removed == ["base/io/expect_output"]
+
+
+def test_regrade_runs_only_changed_tests_and_rescores_merged_tree():
+    fn = CountingTestFunction()
+    previous = _stored(_grade(_tree(fn)))
+    fn.executed.clear()
+
+    # Reweight the subjects and fix one test: only that test runs again
+    regraded = _grade(_tree(fn, io_weight=80, tests=(("a", 100.0), ("b2", 100.0))), previous)
+    full = _grade(_tree(CountingTestFunction(), io_weight=80, tests=(("a", 100.0), ("b2", 100.0))))
+
+    assert fn.executed == ["b2"]
+    assert regraded.root.score == pytest.approx(full.root.score)
+    assert regraded.to_score_vector() == full.to_score_vector()
+    reports = [node.report for _, node in regraded.iter_test_results()]
+    assert reports == ["ran a", "ran b2", "ran lint"]
+    assert all(node.metadata.get(FINGERPRINT_KEY) for _, node in regraded.iter_test_results())
+
+
+def test_results_are_not_reused_across_locales_or_without_fingerprints():
+    fn = CountingTestFunction()
+    previous = _stored(_grade(_tree(fn)))
+    fn.executed.clear()
+
+    _grade(_tree(fn), previous, locale="pt_br")
+    assert len(fn.executed) == 3
+
+    for _, node in previous.iter_test_results():
+        node.metadata.pop(FINGERPRINT_KEY)
+    fn.executed.clear()
+    _grade(_tree(fn), previous)
+    assert len(fn.executed) == 3
+
+
+def test_new_category_is_executed():
+    fn = CountingTestFunction()
+    previous = _stored(_grade(_tree(fn)))
+    fn.executed.clear()
+
+    bonus = CategoryNode(name="bonus", weight=10, tests=[
+        TestNode(name="extra", test_function=fn, parameters={"label": "extra"}, requires_sandbox=False)
+    ])
+    regraded = _grade(_tree(fn, bonus=bonus), previous)
+
+    assert fn.executed == ["extra"]
+    assert regraded.root.bonus.tests[0].score == 100.0
@@ -163,3 +163,92 @@ def test_get_file_target_specific():
     target_files = grader.get_file_target(t1)
     assert len(target_files) == 1
     assert target_files[0] is file1
+
+
+class RecordingTestFunction(MockTestFunction):
+    """Sleeps for the 'delay' parameter and records start order and peak concurrency."""
+
+    def __init__(self):
+        import threading
+        self.lock = threading.Lock()
+        self.started = []
+        self.running = 0
+        self.peak = 0
+
+    def execute(self, files=None, sandbox=None, **kwargs):
+        import time
+        with self.lock:
+            self.started.append(kwargs.get("label"))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(kwargs.get("delay", 0.0))
+        with self.lock:
+            self.running -= 1
+        if kwargs.get("fail"):
+            raise RuntimeError(kwargs["label"])
+        return TestResult(test_name="mock_test", score=kwargs.get("score", 100.0), report=kwargs.get("label"))
+
+
+def _planned_category(tf, static_count=6, sandbox_count=3):
+    static = [
+        TestNode(name=f"static{i}", test_function=tf, weight=10 + i, requires_sandbox=False,
+                 parameters={"label": f"static{i}", "delay": 0.05 * (static_count - i), "score": 10.0 * i})
+        for i in range(static_count)
+    ]
+    sandboxed = [
+        TestNode(name=f"sandbox{i}", test_function=tf, weight=20,
+                 parameters={"label": f"sandbox{i}", "delay": 0.01, "score": 50.0})
+        for i in range(sandbox_count)
+    ]
+    subject = SubjectNode(name="S1", weight=60, tests=static[:3] + sandboxed)
+    return CategoryNode(name="base", weight=100, subjects=[subject], tests=static[3:], subjects_weight=70)
+
+
+def _grade(category, **kwargs):
+    command_resolver = MagicMock()
+    command_resolver.resolve_command.side_effect = lambda c, lang: c
+    grader = SubmissionGrader(submission_files={}, command_resolver=command_resolver, **kwargs)
+    with grader.execution_plan(category):
+        return grader.process_category(category)
+
+
+def test_execution_plan_matches_serial_grading():
+    serial = _grade(_planned_category(RecordingTestFunction()))
+    tf = RecordingTestFunction()
+    concurrent = _grade(_planned_category(tf), test_workers=4)
+
+    assert concurrent.to_dict() == serial.to_dict()
+    assert concurrent.calculate_score() == pytest.approx(serial.calculate_score())
+    assert tf.peak > 1
+
+
+def test_sandbox_tests_run_in_order_one_at_a_time():
+    tf = RecordingTestFunction()
+    _grade(_planned_category(tf, static_count=0, sandbox_count=4), test_workers=4)
+
+    assert tf.started == ["sandbox0", "sandbox1", "sandbox2", "sandbox3"]
+    assert tf.peak == 1
+
+
+def test_sandbox_concurrency_is_configurable():
+    tf = RecordingTestFunction()
+    category = CategoryNode(name="base", weight=100, tests=[
+        TestNode(name=f"sandbox{i}", test_function=tf, parameters={"label": f"sandbox{i}", "delay": 0.1})
+        for i in range(4)
+    ])
+    _grade(category, sandbox_concurrency=2)
+
+    assert tf.peak == 2
+
+
+def test_execution_plan_raises_first_error_in_traversal_order():
+    tf = RecordingTestFunction()
+    category = CategoryNode(name="base", weight=100, tests=[
+        TestNode(name="slow_fail", test_function=tf, requires_sandbox=False,
+                 parameters={"label": "slow_fail", "delay": 0.1, "fail": True}),
+        TestNode(name="fast_fail", test_function=tf, requires_sandbox=False,
+                 parameters={"label": "fast_fail", "fail": True}),
+    ])
+
+    with pytest.raises(RuntimeError, match="slow_fail"):
+        _grade(category, test_workers=2)
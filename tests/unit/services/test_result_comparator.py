@@ -261,6 +261,59 @@ class TestResultComparator:
         assert deltas["base/s2/t4"].head_score == 100.0
 
 
+class TestBatchComparison:
+    """Test suite for comparing one baseline with many heads."""
+
+    @staticmethod
+    def _tree(final_score, **scores):
+        tests = [_make_test(name, score) for name, score in scores.items()]
+        return _make_tree(base=_make_category("base", subjects=[_make_subject("s1", tests=tests)]),
+                          final_score=final_score)
+
+    def test_each_head_matches_pairwise_compare(self):
+        """Verify every batch comparison equals compare() for that head."""
+        baseline = self._tree(60.0, t1=50.0, t2=100.0, t3=30.0)
+        heads = [
+            self._tree(80.0, t1=90.0, t2=100.0, t3=30.0),
+            self._tree(40.0, t1=10.0, t2=100.0, t4=70.0),
+            self._tree(60.0, t1=50.0, t2=100.0, t3=30.0),
+        ]
+
+        batch = ResultComparator.compare_many(baseline, heads)
+
+        assert [c.to_dict() for c in batch.comparisons] == [
+            ResultComparator.compare(baseline, head).to_dict() for head in heads
+        ]
+
+    def test_path_summaries_and_aggregates(self):
+        """Verify per-path status counts and head-level aggregates."""
+        baseline = self._tree(60.0, t1=50.0, t2=100.0, t3=30.0)
+        heads = [
+            self._tree(80.0, t1=90.0, t2=100.0, t3=30.0),
+            self._tree(40.0, t1=10.0, t2=100.0, t4=70.0),
+        ]
+
+        batch = ResultComparator.compare_many(baseline, heads)
+        summaries = {s.path: s for s in batch.path_summaries}
+
+        assert list(summaries) == ["base/s1/t1", "base/s1/t2", "base/s1/t3", "base/s1/t4"]
+        t1 = summaries["base/s1/t1"]
+        assert (t1.improved, t1.regressed, t1.mean_delta) == (1, 1, 0.0)
+        assert (summaries["base/s1/t2"].unchanged, summaries["base/s1/t2"].mean_delta) == (2, 0.0)
+        assert (summaries["base/s1/t3"].unchanged, summaries["base/s1/t3"].removed) == (1, 1)
+        t4 = summaries["base/s1/t4"]
+        assert (t4.introduced, t4.baseline_score, t4.mean_delta) == (1, None, None)
+        assert (batch.improved_heads, batch.regressed_heads, batch.mean_score_delta) == (1, 1, 0.0)
+
+    def test_no_heads(self):
+        """Verify an empty batch keeps the baseline paths with no counts."""
+        batch = ResultComparator.compare_many(self._tree(60.0, t1=50.0), [])
+
+        assert batch.comparisons == []
+        assert batch.mean_score_delta is None
+        assert batch.to_dict()["path_summaries"][0]["baseline_score"] == 50.0
+
+
 class TestResultTreeFromDict:
     """Test suite for ResultTree.from_dict deserialization."""
 
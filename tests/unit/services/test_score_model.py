@@ -0,0 +1,103 @@
+import pytest
+
+from autograder.models.abstract.test_function import TestFunction
+from autograder.models.criteria_tree import CategoryNode, CriteriaTree, SubjectNode, TestNode
+from autograder.models.dataclass.test_result import TestResult
+from autograder.models.result_tree import ResultTree
+from autograder.services.grader.grader_service import GraderService
+from autograder.services.score_model import compile_score_model
+
+
+class ScoreParameterTestFunction(TestFunction):
+    """Scores each test with its `score` parameter."""
+
+    @property
+    def name(self) -> str:
+        return "fixed_score"
+
+    @property
+    def description(self) -> str:
+        return "fixed score"
+
+    @property
+    def parameter_description(self) -> list:
+        return []
+
+    def execute(self, files=None, sandbox=None, **kwargs):
+        return TestResult(test_name=self.name, score=kwargs["score"], report="")
+
+
+def _test(name, score, weight=100):
+    return TestNode(name=name, test_function=ScoreParameterTestFunction(), parameters={"score": score},
+                    weight=weight, requires_sandbox=False)
+
+
+def _tree(io_weight=60, style_weight=40, bonus_weight=20, penalty_weight=30, io_tests_weight=70):
+    io = SubjectNode(
+        name="io",
+        weight=io_weight,
+        subjects=[SubjectNode(name="edge", weight=100, tests=[_test("expect_output", 0.0)])],
+        # Repeated test names share a path but keep their own scores
+        tests=[_test("expect_output", 100.0, weight=75), _test("expect_output", 40.0, weight=25)],
+        subjects_weight=100 - io_tests_weight,
+    )
+    style = SubjectNode(name="style", weight=style_weight, tests=[_test("lint", 50.0)])
+    return CriteriaTree(
+        base=CategoryNode(name="base", weight=100, subjects=[io, style]),
+        bonus=CategoryNode(name="bonus", weight=bonus_weight, tests=[_test("extra", 80.0)]),
+        penalty=CategoryNode(name="penalty", weight=penalty_weight, tests=[_test("late", 60.0)]),
+    )
+
+
+def _graded(tree: CriteriaTree) -> dict:
+    result = GraderService(test_workers=1).grade_from_tree(tree, {})
+    result.calculate_final_score()
+    return {"final_score": result.root.score, "children": result.root.to_dict()}
+
+
+def test_compiled_model_reproduces_graded_final_score():
+    tree = _tree()
+    stored = _graded(tree)
+    model = compile_score_model(tree)
+
+    row, missing = model.row_from_result_tree(stored)
+
+    assert missing == 0
+    assert model.paths.count("base/io/expect_output") == 2
+    assert model.score(row) == pytest.approx(stored["final_score"], abs=0.01)
+
+
+def test_what_if_weights_match_regrading_with_those_weights():
+    stored = _graded(_tree())
+    row, _ = compile_score_model(_tree()).row_from_result_tree(stored)
+
+    what_if = compile_score_model(
+        _tree(),
+        weights={"base/io": 30, "bonus": 10, "penalty": 0},
+        subjects_weight={"base/io": 50},
+    )
+    regraded = _graded(_tree(io_weight=30, style_weight=70, bonus_weight=10, penalty_weight=0, io_tests_weight=50))
+
+    assert what_if.score(row) == pytest.approx(regraded["final_score"], abs=0.01)
+
+
+def test_rows_from_result_tree_dict_formats_and_score_vectors():
+    tree = _tree()
+    model = compile_score_model(tree)
+    result = GraderService(test_workers=1).grade_from_tree(tree, {})
+    result.calculate_final_score()
+
+    row, _ = model.row_from_result_tree(result.to_dict())
+    vector_row, missing = model.row_from_score_vector(result.to_score_vector())
+    partial_row, partial_missing = model.row_from_result_tree({"children": {"base": {"name": "base", "tests": []}}})
+
+    assert row == [0.0, 100.0, 40.0, 50.0, 80.0, 60.0]
+    assert missing == 0 and len(vector_row) == len(row)
+    assert partial_row == [0.0] * 6 and partial_missing == 6
+
+
+def test_invalid_overrides_are_rejected():
+    with pytest.raises(ValueError, match="Unknown criteria paths"):
+        compile_score_model(_tree(), weights={"base/missing": 10})
+    with pytest.raises(ValueError, match="more than 100"):
+        compile_score_model(_tree(), weights={"base/io": 120})
@@ -0,0 +1,151 @@
+"""
+Unit tests for runtime capability probing and precomputed container specs.
+"""
+
+from unittest.mock import MagicMock
+
+import docker
+import pytest
+
+from sandbox_manager.container_spec import (
+    ContainerSpec,
+    RuntimeCapabilities,
+    ensure_image,
+    ensure_images,
+)
+from sandbox_manager.language_pool import LanguagePool, LABEL_LANGUAGE
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language
+
+
+def _pool_config(language=Language.PYTHON):
+    return SandboxPoolConfig(
+        language=language, pool_size=1, scale_limit=2, idle_timeout=300, running_timeout=60
+    )
+
+
+def test_probe_detects_gvisor_and_kernel_features():
+    client = MagicMock()
+    client.info.return_value = {
+        "Runtimes": {"runc": {}, "runsc": {}},
+        "DefaultRuntime": "runc",
+        "KernelVersion": "6.1.0",
+        "CgroupVersion": "2",
+        "SwapLimit": False,
+        "PidsLimit": True,
+    }
+
+    capabilities = RuntimeCapabilities.probe(client)
+
+    assert capabilities.gvisor is True
+    assert capabilities.runtimes == ("runc", "runsc")
+    assert capabilities.swap_limit is False
+    assert capabilities.cgroup_version == "2"
+
+
+def test_probe_falls_back_when_daemon_unreachable():
+    client = MagicMock()
+    client.info.side_effect = docker.errors.APIError("boom")
+
+    capabilities = RuntimeCapabilities.probe(client)
+
+    assert capabilities.gvisor is False
+
+
+@pytest.mark.parametrize("gvisor", [True, False])
+def test_spec_mounts_app_tmpfs_only_on_opted_in_runtimes(gvisor):
+    runtimes = ("runc", "runsc") if gvisor else ("runc",)
+    spec = ContainerSpec.build("sha256:abc", RuntimeCapabilities(runtimes=runtimes))
+
+    kwargs = spec.run_kwargs("ag-sbx-python-0001", {"k": "v"})
+
+    expected = {"/tmp": "rw,size=32m,noexec"}
+    if gvisor:
+        expected["/app"] = "rw,size=64m,exec"
+    assert kwargs["tmpfs"] == expected
+    assert kwargs["image"] == "sha256:abc"
+    assert kwargs["network_mode"] == "none"
+    assert ("runtime" in kwargs) is gvisor
+
+
+def test_spec_omits_memswap_without_swap_accounting():
+    spec = ContainerSpec.build("img", RuntimeCapabilities(swap_limit=False))
+    assert "memswap_limit" not in spec.run_kwargs("name", {})
+
+
+def test_spec_is_immutable():
+    spec = ContainerSpec.build("img", RuntimeCapabilities())
+    with pytest.raises(Exception):
+        spec.image = "other"
+
+
+def test_ensure_image_pulls_when_missing():
+    client = MagicMock()
+    client.images.get.side_effect = docker.errors.ImageNotFound("missing")
+    client.images.pull.return_value.id = "sha256:pulled"
+
+    assert ensure_image(client, "sandbox-py:latest") == "sha256:pulled"
+    client.images.pull.assert_called_once_with("sandbox-py", tag="latest")
+
+
+@pytest.mark.parametrize("image, repository, tag", [
+    ("registry:5000/org/sandbox-py:3.12", "registry:5000/org/sandbox-py", "3.12"),
+    ("registry:5000/org/sandbox-py", "registry:5000/org/sandbox-py", "latest"),
+    ("sandbox-py@sha256:abc", "sandbox-py", "sha256:abc"),
+])
+def test_ensure_image_pulls_registry_and_digest_references(image, repository, tag):
+    client = MagicMock()
+    client.images.get.side_effect = docker.errors.ImageNotFound("missing")
+
+    ensure_image(client, image)
+
+    client.images.pull.assert_called_once_with(repository, tag=tag)
+
+
+def test_ensure_images_reports_unavailable_images_as_none():
+    client = MagicMock()
+
+    def get(image):
+        if image == "sandbox-java:latest":
+            raise docker.errors.ImageNotFound("missing")
+        return MagicMock(id=f"sha256:{image}")
+
+    client.images.get.side_effect = get
+    client.images.pull.side_effect = docker.errors.APIError("no registry")
+
+    resolved = ensure_images(client, ["sandbox-py:latest", "sandbox-java:latest", "sandbox-py:latest"])
+
+    assert resolved == {"sandbox-java:latest": None, "sandbox-py:latest": "sha256:sandbox-py:latest"}
+
+
+def test_create_sandbox_is_a_single_docker_call():
+    client = MagicMock()
+    client.containers.run.return_value.id = "container123456"
+    pool = LanguagePool(Language.PYTHON, _pool_config(), client=client,
+                        capabilities=RuntimeCapabilities(runtimes=("runc",)))
+    pool.prepare("sha256:pinned")
+
+    sandbox = pool._create_sandbox()
+
+    assert client.containers.run.call_count == 1
+    kwargs = client.containers.run.call_args.kwargs
+    assert kwargs["image"] == "sha256:pinned"
+    assert "runtime" not in kwargs
+    assert "/app" not in kwargs["tmpfs"]  # runc keeps the image's /app volume
+    assert kwargs["labels"][LABEL_LANGUAGE] == "python"
+    assert sandbox.container_ref is client.containers.run.return_value
+
+
+def test_create_sandbox_prepares_spec_lazily():
+    client = MagicMock()
+    client.info.return_value = {"Runtimes": {"runc": {}, "runsc": {}}}
+    client.images.get.return_value.id = "sha256:local"
+    client.containers.run.return_value.id = "container123456"
+    pool = LanguagePool(Language.PYTHON, _pool_config(), client=client)
+
+    pool._create_sandbox()
+    pool._create_sandbox()
+
+    client.info.assert_called_once()
+    client.images.get.assert_called_once()
+    assert client.containers.run.call_args.kwargs["runtime"] == "runsc"
@@ -0,0 +1,79 @@
+"""
+Unit tests for the pool history ring buffer and capacity planning report.
+"""
+
+from unittest.mock import MagicMock
+
+from sandbox_manager.language_pool import LanguagePool
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.pool_history import PoolHistory, percentile
+
+
+def test_ring_buffer_keeps_only_latest_samples():
+    history = PoolHistory(capacity=3)
+    for second in range(5):
+        history.sample(idle=1, active=second, now=1000.0 + second)
+
+    assert [sample.active for sample in history.samples()] == [2, 3, 4]
+
+
+def test_sample_closes_interval_counters():
+    history = PoolHistory()
+    history.record_acquire(0.01)
+    history.record_acquire(2.0, served=False)
+    history.record_created(1.5)
+    history.record_destroyed()
+
+    first = history.sample(idle=2, active=1, now=1000.0)
+    second = history.sample(idle=2, active=1, now=1001.0)
+
+    assert (first.acquired, first.rejected, first.created, first.destroyed) == (1, 1, 1, 1)
+    assert (second.acquired, second.rejected, second.created, second.destroyed) == (0, 0, 0, 0)
+
+
+def test_report_downsamples_and_recommends_sizing():
+    history = PoolHistory()
+    for second in range(120):
+        # A burst of 4 acquires per second during the second minute
+        for _ in range(4 if second >= 60 else 1):
+            history.record_acquire(0.02, now=1000.0 + second)
+        history.record_created(2.0)
+        history.sample(idle=3, active=8 if second >= 60 else 2, now=1020.0 + second)
+
+    report = history.report(pool_size=2, scale_limit=5, resolution=60, now=1140.0)
+
+    assert report["sample_count"] == 120
+    assert [point["active"] for point in report["series"]] == [2, 8]
+    assert report["summary"]["peak_concurrency"] == 8
+    assert report["summary"]["p95_wait_seconds"] == 0.02
+    assert report["recommendation"]["pool_size"] == 8  # 4 acquires/s over a 2s start-up
+    assert report["recommendation"]["scale_limit"] == 10
+
+
+def test_report_without_samples_keeps_current_sizing():
+    report = PoolHistory().report(pool_size=2, scale_limit=5)
+    assert report["recommendation"]["pool_size"] == 2
+    assert report["recommendation"]["scale_limit"] == 5
+    assert report["summary"]["p95_wait_seconds"] is None
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 95) is None
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_pool_feeds_history():
+    config = SandboxPoolConfig(language=Language.PYTHON, pool_size=1, scale_limit=2,
+                               idle_timeout=300, running_timeout=60)
+    pool = LanguagePool(Language.PYTHON, config, client=MagicMock())
+    pool._create_sandbox = MagicMock(side_effect=lambda: MagicMock())
+    pool.replenish()
+    pool.acquire()
+    pool.sample_history()
+
+    report = pool.capacity_report()
+
+    assert report["language"] == "python"
+    assert report["summary"]["acquired"] == 1
+    assert report["series"][0]["active"] == 1
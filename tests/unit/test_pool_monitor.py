@@ -0,0 +1,163 @@
+"""
+Unit tests for the event-driven pool monitor: timer wheel deadlines and
+Docker event handling.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from sandbox_manager.language_pool import LanguagePool, LABEL_POOL_ID
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.pool_monitor import PoolEventMonitor
+from sandbox_manager.timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _make_pool(pool_size=1, scale_limit=3, idle_timeout=300, running_timeout=60, timers=None):
+    config = SandboxPoolConfig(
+        language=Language.PYTHON, pool_size=pool_size, scale_limit=scale_limit,
+        idle_timeout=idle_timeout, running_timeout=running_timeout
+    )
+    pool = LanguagePool(Language.PYTHON, config, client=MagicMock())
+    pool.timers = timers
+    counter = iter(range(10_000))
+
+    def create():
+        sandbox = MagicMock()
+        sandbox.container_ref.id = f"container{next(counter):08d}"
+        sandbox.last_updated = datetime.now()
+        return sandbox
+
+    pool._create_sandbox = MagicMock(side_effect=create)
+    pool._destroy_sandbox = MagicMock()
+    return pool
+
+
+def test_timer_wheel_fires_only_due_callbacks():
+    clock = FakeClock()
+    wheel = TimerWheel(tick=1.0, slots=8, clock=clock)
+    fired = []
+    wheel.schedule_in(2, lambda: fired.append("soon"))
+    wheel.schedule_in(20, lambda: fired.append("later"))  # More than one rotation away
+    cancelled = wheel.schedule_in(2, lambda: fired.append("cancelled"))
+    assert wheel.cancel(cancelled)
+
+    clock.now += 2
+    for callback in wheel.advance():
+        callback()
+    assert fired == ["soon"]
+
+    clock.now += 8  # Passes the "later" slot once without firing it
+    assert wheel.advance() == []
+
+    clock.now += 10
+    for callback in wheel.advance():
+        callback()
+    assert fired == ["soon", "later"]
+    assert len(wheel) == 0
+
+
+def test_timer_wheel_catches_up_after_stall():
+    clock = FakeClock()
+    wheel = TimerWheel(tick=1.0, slots=4, clock=clock)
+    for delay in (1, 3, 6):
+        wheel.schedule_in(delay, lambda: None)
+
+    clock.now += 100
+    assert len(wheel.advance()) == 3
+
+
+def test_running_deadline_releases_overdue_sandbox():
+    clock = FakeClock()
+    wheel = TimerWheel(clock=clock)
+    pool = _make_pool(running_timeout=60, timers=wheel)
+    pool.replenish()
+    sandbox = pool.acquire()
+    assert sandbox in pool.active_sandboxes
+
+    sandbox.last_updated = datetime.now() - timedelta(seconds=61)
+    clock.now += 61
+    for callback in wheel.advance():
+        callback()
+
+    assert sandbox not in pool.active_sandboxes
+    pool._destroy_sandbox.assert_any_call(sandbox)
+
+
+def test_running_deadline_rearms_for_reused_sandbox():
+    clock = FakeClock()
+    wheel = TimerWheel(clock=clock)
+    pool = _make_pool(running_timeout=60, timers=wheel)
+    pool.replenish()
+    sandbox = pool.acquire()
+
+    sandbox.last_updated = datetime.now()  # Picked up again just now
+    clock.now += 61
+    for callback in wheel.advance():
+        callback()
+
+    assert sandbox in pool.active_sandboxes
+    assert len(wheel) >= 1
+
+
+def test_idle_deadline_scales_down_surplus_only():
+    clock = FakeClock()
+    wheel = TimerWheel(clock=clock)
+    pool = _make_pool(pool_size=2, idle_timeout=300, timers=wheel)
+    pool.replenish()
+    pool.config.pool_size = 1  # Pool shrank after the sandboxes were created
+
+    clock.now += 301
+    for callback in wheel.advance():
+        callback()
+
+    assert len(pool.idle_sandboxes) == 1
+
+
+def test_idle_container_death_is_evicted_and_replaced():
+    pool = _make_pool(pool_size=2)
+    pool.replenish()
+    dead = pool.idle_sandboxes[0]
+
+    assert pool.handle_container_event(dead.container_ref.id, "die") is True
+
+    assert dead not in pool.idle_sandboxes
+    assert len(pool.idle_sandboxes) == 2
+    pool._destroy_sandbox.assert_called_once_with(dead)
+
+
+def test_active_container_event_is_left_to_its_holder():
+    pool = _make_pool(pool_size=1)
+    pool.replenish()
+    sandbox = pool.acquire()
+
+    assert pool.handle_container_event(sandbox.container_ref.id, "oom") is False
+    assert sandbox in pool.active_sandboxes
+
+
+def test_monitor_dispatches_events_by_pool_label():
+    pool = _make_pool(pool_size=1)
+    pool.replenish()
+    monitor = PoolEventMonitor({Language.PYTHON: pool}, TimerWheel())
+    container_id = pool.idle_sandboxes[0].container_ref.id
+
+    assert monitor.dispatch({"Action": "exec_start", "Actor": {"ID": container_id}}) is False
+    assert monitor.dispatch({
+        "Action": "die",
+        "Actor": {"ID": container_id, "Attributes": {LABEL_POOL_ID: "other-pool"}},
+    }) is False
+    assert monitor.dispatch({
+        "Action": "die",
+        "Actor": {"ID": container_id, "Attributes": {LABEL_POOL_ID: pool.pool_id}},
+    }) is True
+
+    monitor._tasks.get_nowait()()
+    assert container_id not in [sb.container_ref.id for sb in pool.idle_sandboxes]
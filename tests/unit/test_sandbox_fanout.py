@@ -0,0 +1,200 @@
+"""
+Unit tests for sandbox fan-out.
+
+Tests cover:
+- Workdir snapshot and chunked restore through exec_run
+- Fan-out capped by pool pressure (waiting acquires, idle reserve)
+- Fan-out stopping on acquire or seeding failures
+- Sharding sandbox tests across the seeded sandboxes
+- Fan-out sizing from the criteria tree
+"""
+
+import base64
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from autograder.models.abstract.test_function import TestFunction
+from autograder.models.criteria_tree import CategoryNode, CriteriaTree, TestNode
+from autograder.models.dataclass.test_result import TestResult
+from autograder.services.grader.criteria_grader import SubmissionGrader
+from autograder.services.grader.grader_service import GraderService
+from autograder.services import sandbox_service
+from autograder.services.sandbox_service import SandboxService
+from sandbox_manager import sandbox_container
+from sandbox_manager.models.sandbox_models import Language
+from sandbox_manager.sandbox_container import SandboxContainer
+
+
+def _exec_run_result(exit_code, output):
+    result = MagicMock()
+    result.exit_code = exit_code
+    result.output = output
+    return result
+
+
+def _sandbox():
+    container = MagicMock()
+    container.id = "abc123def456"
+    return SandboxContainer(language=Language.PYTHON, container_ref=container)
+
+
+def test_snapshot_workdir_decodes_archive():
+    sandbox = _sandbox()
+    sandbox.container_ref.exec_run.return_value = _exec_run_result(0, (base64.encodebytes(b"tar-bytes"), b""))
+
+    assert sandbox.snapshot_workdir() == b"tar-bytes"
+    command = sandbox.container_ref.exec_run.call_args.kwargs["cmd"][2]
+    assert command.startswith("tar -C / -czf - app tmp")
+
+
+def test_snapshot_workdir_failure_raises():
+    sandbox = _sandbox()
+    sandbox.container_ref.exec_run.return_value = _exec_run_result(2, (b"", b"tar: error"))
+
+    with pytest.raises(RuntimeError, match="tar: error"):
+        sandbox.snapshot_workdir()
+
+
+def test_restore_workdir_stages_in_chunks():
+    sandbox = _sandbox()
+    sandbox.container_ref.exec_run.return_value = _exec_run_result(0, b"")
+    archive = bytes(range(256)) * 10
+
+    with patch.object(sandbox_container, "RESTORE_CHUNK_SIZE", 1000):
+        sandbox.restore_workdir(archive)
+
+    commands = [call.kwargs["cmd"][2] for call in sandbox.container_ref.exec_run.call_args_list]
+    staged = "".join(command.split("'")[1] for command in commands[:-1])
+    assert base64.b64decode(staged) == archive
+    assert len(commands) == 5  # 3416 base64 characters in 4 chunks, then unpack
+    assert " > " in commands[0] and all(" >> " in command for command in commands[1:-1])
+    assert "tar -C / -xzpf -" in commands[-1]
+
+
+def test_restore_workdir_failure_raises():
+    sandbox = _sandbox()
+    sandbox.container_ref.exec_run.side_effect = [_exec_run_result(0, b""), _exec_run_result(1, b"gzip: invalid")]
+
+    with pytest.raises(RuntimeError, match="unpack"):
+        sandbox.restore_workdir(b"archive")
+
+
+def _manager(idle, waiting=0, acquire_errors=0):
+    manager = MagicMock()
+    manager.get_pool_stats.return_value = {"python": {"idle": idle, "waiting": waiting}}
+    shards = [MagicMock(name=f"shard{i}") for i in range(idle)]
+    effects = [ValueError("pool exhausted")] * acquire_errors + shards
+    manager.get_sandbox.side_effect = effects
+    return manager
+
+
+def _fan_out(manager, wanted):
+    primary = MagicMock(language=Language.PYTHON)
+    primary.snapshot_workdir.return_value = b"archive"
+    with patch("sandbox_manager.manager.get_sandbox_manager", return_value=manager), \
+         patch.object(sandbox_service, "FANOUT_IDLE_RESERVE", 1):
+        return primary, SandboxService().fan_out(primary, wanted)
+
+
+def test_fan_out_seeds_idle_sandboxes_and_keeps_reserve():
+    manager = _manager(idle=4)
+    _, shards = _fan_out(manager, wanted=8)
+
+    assert len(shards) == 3
+    for shard in shards:
+        shard.restore_workdir.assert_called_once_with(b"archive")
+
+
+def test_fan_out_backs_off_while_acquires_wait():
+    manager = _manager(idle=4, waiting=1)
+    primary, shards = _fan_out(manager, wanted=2)
+
+    assert shards == []
+    primary.snapshot_workdir.assert_not_called()
+    manager.get_sandbox.assert_not_called()
+
+
+def test_fan_out_stops_when_acquire_fails():
+    manager = _manager(idle=4, acquire_errors=1)
+    _, shards = _fan_out(manager, wanted=2)
+
+    assert shards == []
+
+
+def test_fan_out_destroys_sandbox_that_fails_to_seed():
+    manager = _manager(idle=4)
+    manager.get_sandbox.side_effect = None
+    broken = MagicMock()
+    broken.restore_workdir.side_effect = RuntimeError("disk full")
+    manager.get_sandbox.return_value = broken
+    _, shards = _fan_out(manager, wanted=2)
+
+    assert shards == []
+    manager.destroy_sandbox.assert_called_once_with(Language.PYTHON, broken)
+
+
+class SandboxRecordingTest(TestFunction):
+    """Records which sandbox ran each test and how many sandboxes ran at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.used = set()
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def name(self):
+        return "sandbox_test"
+
+    @property
+    def description(self):
+        return "records the sandbox"
+
+    @property
+    def parameter_description(self):
+        return []
+
+    def execute(self, files=None, sandbox=None, **kwargs):
+        with self.lock:
+            self.used.add(sandbox)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return TestResult(test_name="sandbox_test", score=kwargs["score"], report=f"ran {kwargs['score']}")
+
+
+def _sandbox_category(tf, count):
+    return CategoryNode(name="base", weight=100, tests=[
+        TestNode(name=f"case{i}", test_function=tf, parameters={"score": float(i)}) for i in range(count)
+    ])
+
+
+def test_sandbox_tests_are_sharded_across_extra_sandboxes():
+    tf = SandboxRecordingTest()
+    category = _sandbox_category(tf, 12)
+    grader = SubmissionGrader(submission_files={}, command_resolver=MagicMock(),
+                              sandbox="primary", extra_sandboxes=["shard1", "shard2"])
+    with grader.execution_plan(category):
+        sharded = grader.process_category(category)
+
+    serial = SubmissionGrader(submission_files={}, command_resolver=MagicMock(), sandbox="primary")
+    expected = serial.process_category(_sandbox_category(SandboxRecordingTest(), 12))
+
+    assert tf.used == {"primary", "shard1", "shard2"}
+    assert tf.peak <= 3
+    assert sharded.to_dict() == expected.to_dict()
+
+
+def test_fanout_size_follows_sandbox_test_count():
+    tf = SandboxRecordingTest()
+    tree = CriteriaTree(base=_sandbox_category(tf, 100))
+
+    assert GraderService.fanout_size(tree, max_fanout=0) == 0
+    assert GraderService.fanout_size(tree, max_fanout=3, min_tests_per_sandbox=20) == 3
+    assert GraderService.fanout_size(tree, max_fanout=8, min_tests_per_sandbox=40) == 1
+    assert GraderService.fanout_size(tree, max_fanout=8, min_tests_per_sandbox=200) == 0
@@ -0,0 +1,127 @@
+"""
+Unit tests for sandbox API leases.
+
+Tests cover:
+- Lease grant, implicit renewal and heartbeats
+- Expiry and reclamation of abandoned sandboxes
+- Lease table visibility in /stats
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sandbox_manager import api
+from sandbox_manager.leases import LeaseTable
+from sandbox_manager.models.sandbox_models import Language
+
+
+def _make_sandbox(container_id="abc123def456789"):
+    sandbox = MagicMock()
+    sandbox.language = Language.PYTHON
+    sandbox.container_ref.id = container_id
+    return sandbox
+
+
+@pytest.fixture
+def clock():
+    """Controllable monotonic clock for lease deadlines."""
+    now = [1000.0]
+    with patch("sandbox_manager.leases.time.monotonic", side_effect=lambda: now[0]):
+        yield now
+
+
+@pytest.fixture
+def leases(clock):
+    table = LeaseTable(ttl=10)
+    with patch.object(api, "lease_table", table):
+        yield table
+
+
+def test_grant_and_touch_returns_sandbox(leases):
+    sandbox = _make_sandbox()
+    leases.grant("sbx1", sandbox)
+
+    assert leases.touch("sbx1") is sandbox
+    assert leases.touch("missing") is None
+
+
+def test_lease_expires_without_renewal(leases, clock):
+    leases.grant("sbx1", _make_sandbox())
+    clock[0] += 11
+
+    assert leases.touch("sbx1") is None
+    expired = leases.pop_expired()
+    assert [lease.sandbox_id for lease in expired] == ["sbx1"]
+    assert "sbx1" not in leases
+
+
+def test_heartbeat_extends_lease(leases, clock):
+    leases.grant("sbx1", _make_sandbox())
+    for _ in range(3):
+        clock[0] += 8
+        assert leases.heartbeat("sbx1") is not None
+
+    assert leases.pop_expired() == []
+
+
+def test_hold_for_covers_long_calls(leases, clock):
+    leases.grant("sbx1", _make_sandbox())
+    leases.touch("sbx1", hold_for=60)
+    clock[0] += 65
+
+    assert leases.pop_expired() == []
+    clock[0] += 10
+    assert len(leases.pop_expired()) == 1
+
+
+def test_reaper_destroys_expired_sandboxes(leases, clock):
+    sandbox = _make_sandbox()
+    leases.grant("sbx1", sandbox)
+    leases.grant("sbx2", _make_sandbox("other"))
+    leases.heartbeat("sbx2")
+    clock[0] += 5
+    leases.heartbeat("sbx2")
+    clock[0] += 6
+
+    manager = MagicMock()
+    with patch.object(api, "get_sandbox_manager", return_value=manager):
+        reclaimed = api.reap_expired_leases()
+
+    assert reclaimed == 1
+    manager.destroy_sandbox.assert_called_once_with(Language.PYTHON, sandbox)
+    assert "sbx2" in leases
+
+
+def test_reaper_tolerates_sandbox_already_removed(leases, clock):
+    leases.grant("sbx1", _make_sandbox())
+    clock[0] += 11
+
+    manager = MagicMock()
+    manager.destroy_sandbox.side_effect = ValueError("Sandbox not found in active sandboxes")
+    with patch.object(api, "get_sandbox_manager", return_value=manager):
+        assert api.reap_expired_leases() == 1
+
+
+def test_api_heartbeat_and_stats(leases):
+    sandbox = _make_sandbox("sbx-container-1")
+    manager = MagicMock()
+    manager.get_sandbox.return_value = sandbox
+    manager.get_pool_stats.return_value = {"python": {"idle": 0, "active": 1}}
+
+    client = TestClient(api.app)  # no context manager: skip lifespan (Docker)
+    with patch.object(api, "get_sandbox_manager", return_value=manager):
+        acquired = client.post("/sandboxes/python").json()
+        assert acquired == {"sandbox_id": "sbx-container-1", "lease_ttl": 10.0}
+
+        assert client.post("/sandboxes/sbx-container-1/heartbeat").status_code == 200
+        assert client.post("/sandboxes/unknown/heartbeat").status_code == 404
+
+        stats = client.get("/stats").json()
+        assert stats["python"]["active"] == 1
+        assert stats["leases"]["count"] == 1
+        assert stats["leases"]["leases"][0]["sandbox_id"] == "sbx-container-1"
+
+        assert client.delete("/sandboxes/sbx-container-1").status_code == 200
+        assert "sbx-container-1" not in leases
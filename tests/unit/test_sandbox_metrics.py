@@ -0,0 +1,83 @@
+"""
+Unit tests for sandbox metrics: the Prometheus text registry and the
+instrumentation of pools and containers.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from sandbox_manager import metrics
+from sandbox_manager.language_pool import LanguagePool
+from sandbox_manager.metrics import Counter, GaugeCallback, Histogram, MetricsRegistry
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language, ResponseCategory
+from sandbox_manager.sandbox_container import SandboxContainer
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("op_seconds", "Op latency.", ["kind"], buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, kind="a")
+
+    text = registry.render()
+
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{kind="a",le="0.1"} 1' in text
+    assert 'op_seconds_bucket{kind="a",le="1"} 3' in text
+    assert 'op_seconds_bucket{kind="a",le="+Inf"} 4' in text
+    assert 'op_seconds_count{kind="a"} 4' in text
+    assert 'op_seconds_sum{kind="a"} 4.25' in text
+
+
+def test_counter_and_gauge_callback_render():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("bytes_total", "Bytes.", ["language"]))
+    counter.inc(10, language='py"thon')
+    registry.register(GaugeCallback("pool", "Pool.", ["state"], lambda: {("idle",): 2}))
+
+    text = registry.render()
+
+    assert 'bytes_total{language="py\\"thon"} 10' in text
+    assert 'pool{state="idle"} 2' in text
+
+
+def test_metric_rejects_wrong_labels():
+    with pytest.raises(ValueError):
+        Counter("c", "C.", ["language"]).inc(language="python", extra="x")
+    with pytest.raises(ValueError):
+        Counter("c", "C.").inc(-1)
+
+
+def test_pool_records_acquire_wait_by_outcome():
+    config = SandboxPoolConfig(language=Language.NODE, pool_size=0, scale_limit=1,
+                               idle_timeout=300, running_timeout=60)
+    pool = LanguagePool(Language.NODE, config, client=MagicMock())
+    pool._create_sandbox = MagicMock(return_value=MagicMock())
+    before_created = metrics.ACQUIRE_WAIT.count(language="node", outcome="created")
+    before_rejected = metrics.ACQUIRE_WAIT.count(language="node", outcome="rejected")
+
+    pool.acquire()
+    with pytest.raises(ValueError):
+        pool.acquire()
+
+    assert metrics.ACQUIRE_WAIT.count(language="node", outcome="created") == before_created + 1
+    assert metrics.ACQUIRE_WAIT.count(language="node", outcome="rejected") == before_rejected + 1
+
+
+def test_container_records_exec_bytes_and_timeouts():
+    container_ref = MagicMock()
+    container_ref.exec_run.return_value = MagicMock(exit_code=0, output=(b"hello\n", b""))
+    sandbox = SandboxContainer(Language.CPP, container_ref)
+    bytes_out = metrics.BYTES_OUT.value(language="cpp", operation="command")
+    timeouts = metrics.TIMEOUTS.value(language="cpp", operation="command")
+
+    response = sandbox.run_command("./main")
+    assert response.stdout == "hello\n"
+    assert metrics.BYTES_OUT.value(language="cpp", operation="command") == bytes_out + 6
+
+    sandbox._run_with_timeout = MagicMock(return_value=(None, None, True, 1.0))
+    response = sandbox.run_command("./main", timeout=1)
+    assert response.category == ResponseCategory.TIMEOUT
+    assert metrics.TIMEOUTS.value(language="cpp", operation="command") == timeouts + 1
@@ -0,0 +1,89 @@
+"""
+Unit tests for hot-reloading sandbox pool configuration.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from sandbox_manager.container_spec import ContainerSpec, RuntimeCapabilities
+from sandbox_manager.language_pool import LanguagePool
+from sandbox_manager.manager import SandboxManager
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language
+
+
+def _config(language=Language.PYTHON, pool_size=2, scale_limit=4, idle_timeout=300, running_timeout=60):
+    return SandboxPoolConfig(
+        language=language, pool_size=pool_size, scale_limit=scale_limit,
+        idle_timeout=idle_timeout, running_timeout=running_timeout
+    )
+
+
+def _make_pool(config):
+    pool = LanguagePool(config.language, config, client=MagicMock())
+    counter = iter(range(10_000))
+
+    def create():
+        sandbox = MagicMock()
+        sandbox.container_ref.id = f"container{next(counter):08d}"
+        sandbox.spec = pool.spec
+        return sandbox
+
+    pool._create_sandbox = MagicMock(side_effect=create)
+    pool._destroy_sandbox = MagicMock()
+    return pool
+
+
+def test_reconfigure_grows_warm_pool():
+    pool = _make_pool(_config(pool_size=2, scale_limit=4))
+    pool.replenish()
+
+    changes = pool.reconfigure(_config(pool_size=5, scale_limit=8))
+
+    assert changes == {"pool_size": {"old": 2, "new": 5}, "scale_limit": {"old": 4, "new": 8}}
+    assert len(pool.idle_sandboxes) == 5
+
+
+def test_reconfigure_shrinks_idle_but_keeps_active_sandboxes():
+    pool = _make_pool(_config(pool_size=3, scale_limit=5))
+    pool.replenish()
+    busy = [pool.acquire(), pool.acquire()]
+    pool.replenish()
+    assert len(pool.idle_sandboxes) == 3
+
+    pool.reconfigure(_config(pool_size=1, scale_limit=2))
+
+    assert len(pool.idle_sandboxes) == 1
+    assert pool._destroy_sandbox.call_count == 2
+    assert all(sandbox in pool.active_sandboxes for sandbox in busy)
+    pool.acquire()  # The remaining warm sandbox is still handed out
+    with pytest.raises(ValueError):
+        pool.acquire()  # Over the new scale_limit until in-flight work is released
+
+
+def test_reconfigure_rejects_other_language():
+    pool = _make_pool(_config())
+    with pytest.raises(ValueError):
+        pool.reconfigure(_config(language=Language.JAVA))
+
+
+def test_manager_reload_applies_new_spec_only_to_new_containers():
+    pool = _make_pool(_config(pool_size=1))
+    pool.spec = ContainerSpec.build("sha256:old", RuntimeCapabilities())
+    pool.client.info.return_value = {}
+    pool.client.images.get.return_value.id = "sha256:new"
+    manager = SandboxManager({Language.PYTHON: pool}, warmup_workers=1)
+    try:
+        assert manager.wait_until_ready(timeout=1)
+        existing = pool.idle_sandboxes[0]
+
+        changes = manager.reload([_config(pool_size=2), _config(language=Language.JAVA)])
+
+        assert changes["python"]["image"] == {"old": "sha256:old", "new": "sha256:new"}
+        assert changes["python"]["pool_size"] == {"old": 1, "new": 2}
+        assert existing.spec.image == "sha256:old"
+        assert pool.idle_sandboxes[-1].spec.image == "sha256:new"
+        assert "java" not in changes
+    finally:
+        manager.shutdown()
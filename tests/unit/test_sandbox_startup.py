@@ -0,0 +1,137 @@
+"""
+Unit tests for sandbox manager start-up: parallel orphan cleanup, parallel
+pool warm-up and progressive readiness.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from sandbox_manager.language_pool import LanguagePool
+from sandbox_manager.manager import SandboxManager, _cleanup_orphaned_containers
+from sandbox_manager.models.pool_config import SandboxPoolConfig
+from sandbox_manager.models.sandbox_models import Language
+
+
+def _make_pool(language=Language.PYTHON, pool_size=3, scale_limit=5, create_delay=0.0):
+    config = SandboxPoolConfig(
+        language=language, pool_size=pool_size, scale_limit=scale_limit,
+        idle_timeout=300, running_timeout=60
+    )
+    pool = LanguagePool(language, config, client=MagicMock())
+    counter = iter(range(10_000))
+
+    def create():
+        time.sleep(create_delay)
+        sandbox = MagicMock()
+        sandbox.container_ref.id = f"container{next(counter):08d}"
+        return sandbox
+
+    pool._create_sandbox = MagicMock(side_effect=create)
+    pool._destroy_sandbox = MagicMock()
+    return pool
+
+
+def test_orphan_cleanup_removes_containers_concurrently():
+    client = MagicMock()
+    active = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def make_container(i):
+        container = MagicMock()
+        container.id = f"orphan{i:06d}"
+        container.name = f"ag-sbx-python-{i}"
+
+        def remove(force):
+            with lock:
+                active.append(i)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(i)
+            if i == 3:
+                raise RuntimeError("already gone")
+
+        container.remove.side_effect = remove
+        return container
+
+    containers = [make_container(i) for i in range(12)]
+    client.containers.list.return_value = containers
+
+    _cleanup_orphaned_containers(client, max_workers=4)
+
+    for container in containers:
+        container.remove.assert_called_once_with(force=True)
+    assert 1 < peak[0] <= 4
+
+
+def test_replenish_with_executor_creates_in_parallel_and_marks_ready():
+    pool = _make_pool(pool_size=4, create_delay=0.05)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        created = pool.replenish(executor=executor)
+    elapsed = time.monotonic() - started
+
+    assert created == 4
+    assert len(pool.idle_sandboxes) == 4
+    assert pool.ready.is_set()
+    assert elapsed < 0.15  # Well under 4 sequential creations
+
+
+def test_concurrent_replenish_does_not_overshoot():
+    pool = _make_pool(pool_size=3, scale_limit=5, create_delay=0.02)
+
+    threads = [threading.Thread(target=pool.replenish) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool._create_sandbox.call_count == 3
+    assert len(pool.idle_sandboxes) == 3
+
+
+def test_acquire_waits_for_warming_container_at_scale_limit():
+    pool = _make_pool(pool_size=2, scale_limit=2, create_delay=0.1)
+    warmup = threading.Thread(target=pool.replenish)
+    warmup.start()
+    time.sleep(0.02)  # Both slots reserved, nothing idle yet
+
+    sandbox = pool.acquire()
+    warmup.join()
+
+    assert sandbox in pool.active_sandboxes
+    assert pool._create_sandbox.call_count == 2
+
+
+def test_shutdown_during_warm_up_destroys_late_containers():
+    pool = _make_pool(pool_size=1, create_delay=0.1)
+    warmup = threading.Thread(target=pool.replenish)
+    warmup.start()
+    time.sleep(0.02)
+
+    pool.shutdown()
+    warmup.join()
+
+    assert not pool.idle_sandboxes
+    pool._destroy_sandbox.assert_called_once()
+
+
+def test_manager_reports_readiness_per_language():
+    fast = _make_pool(Language.PYTHON, pool_size=1)
+    slow = _make_pool(Language.JAVA, pool_size=1, create_delay=0.3)
+    manager = SandboxManager({Language.PYTHON: fast, Language.JAVA: slow}, warmup_workers=2)
+    try:
+        assert manager.wait_until_ready(timeout=1, lang=Language.PYTHON)
+        readiness = manager.get_readiness()
+        assert readiness["languages"]["python"]["ready"] is True
+        assert readiness["languages"]["java"]["ready"] is False
+        assert readiness["ready"] is False
+
+        assert manager.wait_until_ready(timeout=2)
+        assert manager.is_ready()
+    finally:
+        manager.shutdown()
@@ -0,0 +1,187 @@
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from autograder.autograder import AutograderPipeline
+from autograder.models.abstract.step import Step
+from autograder.models.dataclass.step_result import StepName, StepResult, StepStatus
+from autograder.models.dataclass.submission import Submission, SubmissionFile
+from autograder.services.focus_service import FocusService
+from autograder.services.sandbox_transcript import ReplaySandbox, SandboxTranscript
+from autograder.steps.build_tree_step import BuildTreeStep
+from autograder.steps.focus_step import FocusStep
+from autograder.steps.grade_step import GradeStep
+from autograder.steps.sandbox_step import SandboxStep
+from autograder.template_library.input_output import InputOutputTemplate
+from sandbox_manager.models.sandbox_models import (
+    CommandResponse,
+    ExtractedFile,
+    Language,
+    ResponseCategory,
+)
+
+
+class EchoSandbox:
+    """Fake sandbox whose program prints its stdin back."""
+
+    def __init__(self):
+        self.language = Language.PYTHON
+        self.batches = []
+
+    def run_commands(self, commands, program_command=None, timeout=30, workdir="/app"):
+        self.batches.append(list(commands))
+        return CommandResponse(stdout="\n".join(commands) + "\n", stderr="", exit_code=0, execution_time=0.01)
+
+    def run_command(self, command, timeout=30, workdir="/app"):
+        return CommandResponse(stdout=f"ran {command}", stderr="", exit_code=0, execution_time=0.01)
+
+    def extract_file(self, path, max_bytes=1_048_576):
+        if path != "/app/out.bin":
+            raise FileNotFoundError(f"File not found in container: {path}")
+        return ExtractedFile(path=path, content_bytes=b"\x00\x01ok", size=4, content_text="\x00\x01ok")
+
+
+def _round_trip(transcript: SandboxTranscript) -> SandboxTranscript:
+    return SandboxTranscript.from_dict(json.loads(json.dumps(transcript.to_dict())))
+
+
+def test_replay_answers_recorded_calls():
+    transcript = SandboxTranscript()
+    recorder = transcript.record(EchoSandbox())
+
+    recorder.run_commands(["5", "3"], program_command="python calc.py")
+    recorder.run_command("ls", workdir="/tmp")
+    recorder.extract_file("/app/out.bin")
+    with pytest.raises(FileNotFoundError):
+        recorder.extract_file("/app/missing.txt")
+
+    replay = ReplaySandbox(_round_trip(transcript), Language.PYTHON)
+
+    # Same stdin whether sent as lines or as one string
+    assert replay.run_commands(["5\n3"], program_command="python calc.py").stdout == "5\n3\n"
+    assert replay.run_command("ls", workdir="/tmp").stdout == "ran ls"
+    extracted = replay.extract_file("/app/out.bin")
+    assert (extracted.content_bytes, extracted.size) == (b"\x00\x01ok", 4)
+    with pytest.raises(FileNotFoundError):
+        replay.extract_file("/app/missing.txt")
+    assert replay.misses == []
+
+
+def test_repeated_calls_replay_in_recorded_order():
+    responses = iter(["first", "second"])
+    sandbox = MagicMock()
+    sandbox.run_command.side_effect = lambda *a, **k: CommandResponse(
+        stdout=next(responses), stderr="", exit_code=0, execution_time=0.0
+    )
+    transcript = SandboxTranscript()
+    recorder = transcript.record(sandbox)
+    recorder.run_command("cat state")
+    recorder.run_command("cat state")
+
+    replay = ReplaySandbox(transcript)
+    assert [replay.run_command("cat state").stdout for _ in range(3)] == ["first", "second", "second"]
+
+
+def test_unrecorded_calls_are_reported():
+    replay = ReplaySandbox(SandboxTranscript())
+
+    response = replay.run_commands(["1"], program_command="./main")
+    with pytest.raises(RuntimeError):
+        replay.extract_file("/app/out.txt")
+
+    assert response.category == ResponseCategory.SYSTEM_ERROR
+    assert len(replay.misses) == 2
+
+
+def test_unsupported_version_is_rejected():
+    with pytest.raises(ValueError):
+        SandboxTranscript.from_dict({"version": 99, "entries": []})
+
+
+class TemplateLoaderStub(Step):
+    def __init__(self, template):
+        self.template = template
+
+    @property
+    def step_name(self) -> StepName:
+        return StepName.LOAD_TEMPLATE
+
+    def _execute(self, pipeline_exec):
+        return pipeline_exec.add_step_result(StepResult(
+            step=StepName.LOAD_TEMPLATE, data=[self.template], status=StepStatus.SUCCESS
+        ))
+
+
+def _criteria(*cases, base_weight=100, bonus_weight=0):
+    def test(value):
+        return {
+            "name": "expect_output",
+            "parameters": [
+                {"name": "inputs", "value": [value]},
+                {"name": "expected_output", "value": value},
+                {"name": "program_command", "value": "python main.py"},
+            ],
+        }
+    criteria = {"base": {"weight": base_weight, "tests": [test(value) for value in cases]}}
+    if bonus_weight:
+        criteria["bonus"] = {"weight": bonus_weight, "tests": [test(cases[0])]}
+    return criteria
+
+
+def _pipeline(criteria, sandbox_service, record_transcript=False):
+    pipeline = AutograderPipeline(record_transcript=record_transcript)
+    pipeline.add_step(StepName.LOAD_TEMPLATE, TemplateLoaderStub(InputOutputTemplate()))
+    pipeline.add_step(StepName.BUILD_TREE, BuildTreeStep(criteria))
+    sandbox_step = SandboxStep()
+    sandbox_step._sandbox_service = sandbox_service
+    pipeline.add_step(StepName.SANDBOX, sandbox_step)
+    pipeline.add_step(StepName.GRADE, GradeStep())
+    pipeline.add_step(StepName.FOCUS, FocusStep(FocusService()))
+    return pipeline
+
+
+@pytest.fixture
+def submission():
+    return Submission(
+        username="student",
+        user_id="u1",
+        assignment_id=1,
+        language=Language.PYTHON,
+        submission_files={"main.py": SubmissionFile(filename="main.py", content="print(input())")},
+    )
+
+
+@patch("sandbox_manager.manager.get_sandbox_manager")
+def test_pipeline_regrades_from_transcript_without_container(mock_get_manager, submission):
+    sandbox = EchoSandbox()
+    live_service = MagicMock()
+    live_service.create_sandbox.return_value = sandbox
+    recorded = _pipeline(_criteria("a", "b"), live_service, record_transcript=True).run(submission)
+    assert recorded.result.final_score == 100.0
+    transcript = _round_trip(recorded.transcript)
+    assert len(transcript) == 2
+
+    # Reweighting and a bonus over an already-run execution need no new runs
+    offline_service = MagicMock()
+    replayed = _pipeline(_criteria("a", "b", bonus_weight=10), offline_service).run(
+        copy.deepcopy(submission), replay_transcript=transcript
+    )
+
+    assert replayed.status.value == "success"
+    assert replayed.result.final_score == 100.0
+    offline_service.create_sandbox.assert_not_called()
+    assert len(sandbox.batches) == 2
+    mock_get_manager.return_value.destroy_sandbox.assert_called_once_with(Language.PYTHON, sandbox)
+
+
+def test_replay_fails_when_transcript_lacks_an_execution(submission):
+    transcript = SandboxTranscript()
+    transcript.record(EchoSandbox()).run_commands(["a"], program_command="python main.py")
+
+    replayed = _pipeline(_criteria("a", "c"), MagicMock()).run(submission, replay_transcript=transcript)
+
+    assert replayed.status.value == "failed"
+    grade = replayed.get_step_result(StepName.GRADE)
+    assert "transcript" in grade.error
@@ -8,6 +8,8 @@ from httpx import AsyncClient, ASGITransport
 
 from web.database.base import Base
 from web.database import session
+from web.service.admission_service import capacity_cache
+from web.service.config_cache import config_cache
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -56,6 +58,22 @@ def mock_external_dependencies():
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_capacity_cache():
+    """Start every test without sandbox capacity cached by an earlier one."""
+    capacity_cache.clear()
+    yield
+    capacity_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_config_cache():
+    """Start every test without grading configurations cached from an earlier test's database."""
+    config_cache.clear()
+    yield
+    config_cache.clear()
+
+
 @pytest.fixture
 async def db_engine():
     """
@@ -0,0 +1,119 @@
+"""Tests for admission control on submission intake."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from web.database.models.submission import SubmissionStatus
+from web.repositories import GradingConfigRepository, SubmissionRepository
+from web.service.admission_service import assess, capacity_cache
+
+
+SUBMISSION = {
+    "external_assignment_id": "admission-1", "external_user_id": "u1", "username": "student",
+    "files": [{"filename": "main.py", "content": "print(1)"}],
+}
+
+
+async def _seed(db_session, *visible_at):
+    """Create a config and python jobs leased until each visible_at (None: waiting)."""
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="admission-1", template_name="input_output",
+        criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+    )
+    repo = SubmissionRepository(db_session)
+    for index, lease in enumerate(visible_at):
+        submission = await repo.create(
+            grading_config_id=config.id, external_user_id=f"seed{index}", username="student",
+            submission_files={}, language="python",
+        )
+        await repo.update(submission.id, visible_at=lease)
+    await db_session.commit()
+
+
+def _capacity(**pools):
+    return patch("web.service.admission_service.sandbox_capacity", AsyncMock(return_value=pools))
+
+
+@pytest.mark.asyncio
+async def test_estimate_from_depth_and_capacity(db_session):
+    leased = datetime.utcnow() + timedelta(minutes=5)
+    await _seed(db_session, leased, leased, None, None)
+
+    with _capacity(python=2), \
+         patch("web.service.admission_service.settings.GRADING_ESTIMATED_SECONDS", 10.0):
+        decision = await assess(db_session, "python")
+        idle = await assess(db_session, "java")
+
+    assert (decision.running, decision.waiting, decision.capacity) == (2, 2, 2)
+    assert decision.saturated
+    assert decision.estimated_start_seconds == 15.0  # 3 jobs ahead drain 2 at a time, 10s each
+    assert (idle.admitted, idle.saturated, idle.estimated_start_seconds) == (True, False, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_is_rejected_with_retry_after(test_client, db_session):
+    await _seed(db_session, None, None, None)
+
+    with _capacity(python=1), \
+         patch("web.service.admission_service.settings.ADMISSION_MAX_BACKLOG", 2), \
+         patch("web.service.admission_service.settings.GRADING_ESTIMATED_SECONDS", 10.0), \
+         patch("web.api.v1.submissions.grade_submission", new_callable=AsyncMock) as grade:
+        response = await test_client.post("/api/v1/submissions", json=SUBMISSION)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "20"
+    grade.assert_not_called()
+    assert len(await SubmissionRepository(db_session).get_by_user("u1")) == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_language_is_queued_for_the_worker(test_client, db_session):
+    await _seed(db_session, datetime.utcnow() + timedelta(minutes=5))
+    worker = Mock()
+
+    with _capacity(python=1), \
+         patch("web.core.lifespan.grading_worker", worker), \
+         patch("web.api.v1.submissions.grade_submission", new_callable=AsyncMock) as grade:
+        response = await test_client.post("/api/v1/submissions", json=SUBMISSION)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["queue_position"] == 0
+    assert body["estimated_start_at"] is not None
+    grade.assert_not_called()
+    worker.notify.assert_called_once()
+    submission = await SubmissionRepository(db_session).get_by_id(body["id"])
+    assert (submission.status, submission.visible_at) == (SubmissionStatus.PENDING, None)
+
+
+@pytest.mark.asyncio
+async def test_capacity_skips_non_pool_entries_of_remote_stats():
+    manager = Mock()
+    manager.get_pool_stats.return_value = {
+        "python": {"language": "python", "idle": 1, "active": 3, "scale_limit": 4},
+        "java": {"language": "java", "idle": 0, "active": 0, "scale_limit": 2},
+        "leases": {"active": 3, "expired": 0},
+    }
+
+    with patch("web.service.admission_service.get_sandbox_manager", return_value=manager):
+        assert await capacity_cache.get() == {"python": 4, "java": 2}
+        await capacity_cache.get()
+
+    manager.get_pool_stats.assert_called_once()  # Cached for CAPACITY_TTL_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_saturated_language_is_rejected_inline_without_a_worker(test_client, db_session):
+    await _seed(db_session, datetime.utcnow() + timedelta(minutes=5))
+
+    with _capacity(python=1), \
+         patch("web.core.lifespan.grading_worker", None), \
+         patch("web.service.admission_service.settings.GRADING_ESTIMATED_SECONDS", 10.0), \
+         patch("web.api.v1.submissions.grade_submission", new_callable=AsyncMock) as grade:
+        response = await test_client.post("/api/v1/submissions", json=SUBMISSION)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+    grade.assert_not_called()
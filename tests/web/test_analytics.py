@@ -0,0 +1,85 @@
+"""Tests for per-assignment score analytics."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+from web.service.analytics_service import histogram, percentile
+
+
+def _tree(*scores):
+    """Stored result tree with one subject holding repeated expect_output tests."""
+    tests = [{"name": "expect_output", "score": score} for score in scores[:-1]]
+    return {"children": {"base": {"name": "base", "subjects": [
+        {"name": "io", "tests": tests},
+        {"name": "style", "tests": [{"name": "lint", "score": scores[-1]}]},
+    ]}}}
+
+
+async def _seed(session_factory, results):
+    async with session_factory() as session:
+        config = await GradingConfigRepository(session).create(
+            external_assignment_id="analytics-1", template_name="input_output",
+            criteria_config={"base": {"weight": 100}}, languages=["python"],
+        )
+        ids = []
+        for status, result_tree, score_vector in results:
+            submission = await SubmissionRepository(session).create(
+                grading_config_id=config.id, external_user_id="u", username="u",
+                submission_files={}, language="python", status=SubmissionStatus.COMPLETED,
+            )
+            await ResultRepository(session).create(
+                submission_id=submission.id, final_score=0.0, execution_time_ms=1, pipeline_status=status,
+                result_tree=result_tree, score_vector=score_vector,
+            )
+            ids.append(submission.id)
+        await session.commit()
+        return config.id, ids
+
+
+@pytest.mark.asyncio
+async def test_analytics_aggregate_recorded_test_scores(test_client, db_engine):
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    config_id, ids = await _seed(session_factory, [
+        (PipelineStatus.SUCCESS, _tree(100, 0, 100), None),
+        (PipelineStatus.SUCCESS, _tree(100, 100, 40), None),
+        # External results only carry a score vector
+        (PipelineStatus.SUCCESS, None, {"base/io/expect_output": 50, "base/style/lint": 100}),
+        (PipelineStatus.FAILED, _tree(0, 0, 0), None),
+    ])
+
+    response = await test_client.get(f"/api/v1/configs/{config_id}/analytics", params={"bins": 4})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == 3
+    io, lint = data["tests"]
+    assert (io["path"], io["count"], io["pass_rate"]) == ("base/io/expect_output", 5, 0.6)
+    assert io["histogram"] == [1, 0, 1, 3]
+    assert io["percentiles"]["p50"] == 100.0
+    assert (lint["count"], lint["mean"], lint["min"]) == (3, 80.0, 40.0)
+    assert data["hardest"] == ["base/io/expect_output", "base/style/lint"]
+
+    # Regrading drops the old scores with the old result
+    async with session_factory() as session:
+        await ResultRepository(session).delete_by_submission_id(ids[0])
+        await session.commit()
+    data = (await test_client.get(f"/api/v1/configs/{config_id}/analytics")).json()
+    assert data["results"] == 2
+    assert data["tests"][0]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_analytics_for_unknown_config(test_client):
+    assert (await test_client.get("/api/v1/configs/999/analytics")).status_code == 404
+
+
+def test_percentile_and_histogram_helpers():
+    scores = [0.0, 25.0, 50.0, 100.0]
+
+    assert percentile(scores, 50) == 37.5
+    assert percentile([70.0], 90) == 70.0
+    assert histogram(scores, 2) == [2, 2]
+    assert histogram([], 3) == [0, 0, 0]
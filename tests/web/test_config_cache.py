@@ -0,0 +1,103 @@
+"""Tests for the grading configuration cache used by submission intake."""
+
+import pytest
+from sqlalchemy import event
+
+from web.repositories import GradingConfigRepository
+from web.service.config_cache import ConfigCache, config_cache
+
+
+async def _config(db_session, external_id="cache-1", **overrides):
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id=external_id,
+        template_name="input_output",
+        criteria_config=overrides.pop("criteria_config", {"base": {"weight": 100, "tests": []}}),
+        languages=["python"],
+        **overrides,
+    )
+    await db_session.commit()
+    return config
+
+
+def _record_statements(db_session):
+    statements = []
+    event.listen(
+        db_session.bind.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_warm_lookup_only_checks_the_version(db_session):
+    config = await _config(db_session)
+    cache = ConfigCache(maxsize=4)
+
+    first = await cache.get_by_external_id(db_session, "cache-1")
+    statements = _record_statements(db_session)
+    second = await cache.get_by_external_id(db_session, "cache-1")
+
+    assert first is second
+    assert (second.id, second.version, second.languages) == (config.id, 1, ["python"])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(statements) == 1
+    assert "criteria_config" not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_reloaded_when_another_process_bumps_the_version(db_session):
+    config = await _config(db_session)
+    cache = ConfigCache(maxsize=4)
+    await cache.get_by_external_id(db_session, "cache-1")
+
+    # Updated without invalidating this cache, as another API process would
+    await GradingConfigRepository(db_session).update(config.id, criteria_config={"base": {"weight": 50, "tests": []}})
+    await db_session.commit()
+
+    snapshot = await cache.get_by_external_id(db_session, "cache-1")
+    assert snapshot.version == 2
+    assert snapshot.criteria_config["base"]["weight"] == 50
+
+
+@pytest.mark.asyncio
+async def test_inactive_and_missing_configs_are_not_served(db_session):
+    config = await _config(db_session)
+    cache = ConfigCache(maxsize=4)
+    await cache.get_by_external_id(db_session, "cache-1")
+
+    await GradingConfigRepository(db_session).update(config.id, is_active=False)
+    await db_session.commit()
+
+    assert await cache.get_by_external_id(db_session, "cache-1") is None
+    assert await cache.get_by_external_id(db_session, "missing") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_config_is_evicted(db_session):
+    for external_id in ("a", "b", "c"):
+        await _config(db_session, external_id)
+    cache = ConfigCache(maxsize=2)
+
+    await cache.get_by_external_id(db_session, "a")
+    await cache.get_by_external_id(db_session, "b")
+    await cache.get_by_external_id(db_session, "a")  # touch a
+    await cache.get_by_external_id(db_session, "c")  # evicts b
+
+    assert len(cache) == 2
+    await cache.get_by_external_id(db_session, "b")
+    assert cache.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_updating_a_config_through_the_api_invalidates_it(test_client, db_session):
+    config = await _config(db_session)
+    await config_cache.get_by_external_id(db_session, "cache-1")
+    assert len(config_cache) == 1
+
+    response = await test_client.put(f"/api/v1/configs/{config.id}", json={"languages": ["python", "java"]})
+
+    assert response.status_code == 200
+    assert len(config_cache) == 0
+    db_session.expire_all()  # The API updated the row in its own session
+    assert (await config_cache.get_by_external_id(db_session, "cache-1")).languages == ["python", "java"]
@@ -5,6 +5,15 @@ from unittest.mock import Mock, AsyncMock, patch
 
 from web.core.config import settings, Settings
 from web.core.lifespan import get_template_service, get_grading_tasks, lifespan
+import web.service.grading_worker  # noqa: F401  Imported by lifespan(); load it before os.getenv is patched
+
+
+def _mock_grading_worker():
+    """GradingWorker class whose instances do not poll the database."""
+    worker = Mock()
+    worker.run = AsyncMock()
+    worker.stop = AsyncMock()
+    return Mock(return_value=worker)
 
 
 def test_settings_defaults():
@@ -44,6 +53,8 @@ async def test_lifespan_startup_shutdown():
          patch("web.core.lifespan.initialize_sandbox_manager") as mock_init_sandbox, \
          patch("web.core.lifespan.TemplateLibraryService.get_instance") as mock_get_template, \
          patch("web.core.lifespan.get_sandbox_manager") as mock_get_sandbox_mgr, \
+         patch("web.core.lifespan.settings.GRADING_DISPATCH", "inline"), \
+         patch("web.service.grading_worker.GradingWorker", _mock_grading_worker()) as mock_worker_class, \
          patch("os.getenv", return_value="sandbox_config.yml"):
 
         # Setup mocks
@@ -62,8 +73,10 @@ async def test_lifespan_startup_shutdown():
             mock_load_yaml.assert_called_once()
             mock_init_sandbox.assert_called_once()
             mock_get_template.assert_called_once()
+            mock_worker_class.return_value.run.assert_called_once()
 
         # Verify shutdown was called
+        mock_worker_class.return_value.stop.assert_awaited_once()
         mock_sandbox_mgr.shutdown.assert_called_once()
 
 
@@ -79,6 +92,7 @@ async def test_lifespan_with_pending_tasks():
          patch("web.core.lifespan.get_sandbox_manager") as mock_get_sandbox, \
          patch("web.core.lifespan.grading_tasks") as mock_tasks, \
          patch("asyncio.gather", new_callable=AsyncMock) as mock_gather, \
+         patch("web.service.grading_worker.GradingWorker", _mock_grading_worker()), \
          patch("os.getenv", return_value="sandbox_config.yml"):
 
         # Create mock tasks
@@ -2,7 +2,9 @@
 
 import pytest
 import asyncio
+from contextlib import contextmanager
 from datetime import datetime
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
@@ -85,6 +87,28 @@ async def test_get_config_by_external_id(db_session):
     assert config.template_name == "api"
 
 
+@pytest.mark.asyncio
+async def test_update_config_bumps_version(db_session):
+    """Changing a field bumps the version; a no-op update keeps it."""
+    repo = GradingConfigRepository(db_session)
+    config = await repo.create(
+        external_assignment_id="test-assignment-version",
+        template_name="webdev",
+        criteria_config={"tests": ["test1"]},
+        languages=["python"],
+    )
+    assert config.version == 1
+
+    config = await repo.update(config.id, criteria_config={"tests": ["test1", "test2"]})
+    assert config.version == 2
+
+    config = await repo.update(config.id, template_name="webdev")
+    assert config.version == 2
+
+    config = await repo.update_by_external_id("test-assignment-version", languages=["java"])
+    assert config.version == 3
+
+
 @pytest.mark.asyncio
 async def test_get_active_configs(db_session):
     """Test getting all active configurations."""
@@ -207,6 +231,78 @@ async def test_update_submission_status(db_session):
     assert updated.status == SubmissionStatus.PROCESSING
 
 
+@contextmanager
+def _count_statements(session):
+    """Collect the SQL statements the session's engine sends to the database."""
+    statements = []
+    engine = session.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_guarded_status_transition_skips_submissions_in_another_state(db_session):
+    """A transition guarded on the current status leaves a finished submission alone."""
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="test-assignment-guard",
+        template_name="webdev",
+        criteria_config={},
+        languages=["python"],
+    )
+    submission_repo = SubmissionRepository(db_session)
+    submission = await submission_repo.create(
+        grading_config_id=config.id,
+        external_user_id="user-guard",
+        username="guard",
+        submission_files={"main.py": "code"},
+        language="python",
+        status=SubmissionStatus.COMPLETED,
+    )
+
+    skipped = await submission_repo.update_status(
+        submission.id, SubmissionStatus.FAILED, from_statuses=(SubmissionStatus.PROCESSING,)
+    )
+
+    assert skipped is None
+    assert (await submission_repo.get_by_id(submission.id)).status == SubmissionStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_resubmission_and_claim_round_trips(db_session):
+    """A resubmission only checks its stored files before its INSERT; a claim is one UPDATE."""
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="test-assignment-trips",
+        template_name="webdev",
+        criteria_config={},
+        languages=["python"],
+    )
+    submission_repo = SubmissionRepository(db_session)
+    files = {"main.py": {"filename": "main.py", "content": "code"}}
+    first = await submission_repo.create(
+        grading_config_id=config.id, external_user_id="user-trips", username="trips", submission_files=files,
+    )
+
+    with _count_statements(db_session) as statements:
+        await submission_repo.create(
+            grading_config_id=config.id, external_user_id="user-trips", username="trips", submission_files=files,
+        )
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "INSERT"]
+    assert "file_blobs" in statements[0] and "submissions" in statements[1]
+
+    with _count_statements(db_session) as statements:
+        claimed = await submission_repo.claim_next("worker-1", lease_seconds=60)
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE")
+    assert (claimed.id, claimed.attempts, claimed.locked_by) == (first.id, 1, "worker-1")
+
+
 # SubmissionResult tests
 @pytest.mark.asyncio
 async def test_create_submission_result(db_session):
@@ -0,0 +1,71 @@
+"""Tests for weighted fair scheduling of grading jobs."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from web.database.models.submission import BULK_LANE, INTERACTIVE_LANE, SubmissionStatus
+from web.repositories import GradingConfigRepository, SubmissionRepository
+from web.service.fair_scheduler import QUEUE_WAIT, DeficitRoundRobin, FairScheduler
+from web.service.grading_worker import GradingWorker
+
+
+def _queue(tenant, lane=INTERACTIVE_LANE, waiting=1, running=0):
+    return {"tenant": tenant, "lane": lane, "waiting": waiting, "running": running, "oldest_queued_at": None}
+
+
+def test_deficit_round_robin_serves_tenants_by_weight():
+    rounds = DeficitRoundRobin({"a": 2, "b": 1, "c": 0.5})
+
+    picks = [rounds.select({"a", "b", "c"}) for _ in range(10)]
+
+    assert picks == ["a", "a", "b", "a", "a", "b", "c", "a", "a", "b"]
+    assert rounds.select({"b"}) == "b"  # Tenants that stop waiting leave the round
+    assert rounds.select(set()) is None
+
+
+def test_interactive_lane_first_and_capped_tenants_skipped():
+    scheduler = FairScheduler(weights={}, max_concurrency=0, concurrency={"busy": 2})
+
+    assert scheduler.pick([_queue("a", BULK_LANE), _queue("b")]) == ("b", INTERACTIVE_LANE)
+    assert scheduler.pick([_queue("busy", running=2), _queue("a", BULK_LANE)]) == ("a", BULK_LANE)
+    assert scheduler.pick([_queue("busy", running=2)]) is None
+    assert scheduler.pick([_queue("a", waiting=0)]) is None
+
+
+@pytest.mark.asyncio
+async def test_worker_interleaves_tenants_instead_of_first_come_first_served(db_session):
+    config_repo = GradingConfigRepository(db_session)
+    configs = [
+        await config_repo.create(
+            external_assignment_id=name, template_name="input_output",
+            criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+        )
+        for name in ("bulk-course", "other-course")
+    ]
+    repo = SubmissionRepository(db_session)
+    jobs = [(configs[0], BULK_LANE)] * 3 + [(configs[1], INTERACTIVE_LANE), (configs[1], BULK_LANE)]
+    for index, (config, lane) in enumerate(jobs):
+        await repo.create(
+            grading_config_id=config.id, external_user_id=f"u{index}", username="student",
+            submission_files={}, language="python", status=SubmissionStatus.PENDING,
+            grading_options={}, tenant=f"assignment:{config.external_assignment_id}", lane=lane,
+        )
+    await db_session.commit()
+    worker = GradingWorker(concurrency=1, lease_seconds=60, max_attempts=3, owner="w1")
+
+    with patch("web.service.grading_worker.grade_submission", new_callable=AsyncMock) as grade:
+        for _ in jobs:
+            assert await worker.claim_available() == 1
+            await asyncio.gather(*list(worker._active))
+
+    graded = [await repo.get_by_id(call.args[0].submission_id) for call in grade.await_args_list]
+    assert [(s.tenant, s.lane) for s in graded] == [
+        ("assignment:other-course", INTERACTIVE_LANE),
+        ("assignment:bulk-course", BULK_LANE),
+        ("assignment:other-course", BULK_LANE),
+        ("assignment:bulk-course", BULK_LANE),
+        ("assignment:bulk-course", BULK_LANE),
+    ]
+    assert QUEUE_WAIT.count(tenant="assignment:bulk-course", lane=BULK_LANE) >= 3
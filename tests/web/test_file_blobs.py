@@ -0,0 +1,72 @@
+"""Tests for content-addressed submission file storage."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import func, select
+
+from web.database.models import FileBlob
+from web.repositories import GradingConfigRepository, SubmissionRepository
+from web.service.grading_service import grade_submission, grading_request_for
+
+
+MAIN = "def solve(x):\n    return x * 2\n" * 40
+FILES = {
+    "main.py": {"filename": "main.py", "content": MAIN},
+    "util.py": {"filename": "util.py", "content": "HELPER = 1\n"},
+}
+
+
+async def _submit(db_session, files=FILES):
+    config = await GradingConfigRepository(db_session).get_by_external_id("blobs-1")
+    if config is None:
+        config = await GradingConfigRepository(db_session).create(
+            external_assignment_id="blobs-1", template_name="input_output",
+            criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+        )
+    submission = await SubmissionRepository(db_session).create(
+        grading_config_id=config.id, external_user_id="u1", username="student",
+        submission_files=files, language="python",
+    )
+    await db_session.commit()
+    return submission, config
+
+
+@pytest.mark.asyncio
+async def test_resubmitted_files_are_stored_once_and_compressed(db_session):
+    first, _ = await _submit(db_session)
+    second, _ = await _submit(db_session, {**FILES, "util.py": {"filename": "util.py", "content": "HELPER = 2\n"}})
+
+    blobs = (await db_session.scalars(select(FileBlob))).all()
+    assert len(blobs) == 3  # main.py once, util.py twice
+    main = next(blob for blob in blobs if blob.sha256 == first.file_manifest["main.py"]["sha256"])
+    assert main.size == len(MAIN) and len(main.content) < main.size
+    assert first.file_manifest["main.py"] == second.file_manifest["main.py"]
+    assert "content" not in first.file_manifest["main.py"]
+
+    assert await SubmissionRepository(db_session).get_files(second) == {
+        **FILES, "util.py": {"filename": "util.py", "content": "HELPER = 2\n"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_files_within_a_submission_share_blobs(db_session):
+    await _submit(db_session, {
+        "a.py": {"filename": "a.py", "content": "same"},
+        "b.py": {"filename": "b.py", "content": "same"},
+    })
+
+    assert await db_session.scalar(select(func.count()).select_from(FileBlob)) == 1
+
+
+@pytest.mark.asyncio
+async def test_grading_loads_files_from_the_manifest(db_session):
+    submission, config = await _submit(db_session)
+    request = grading_request_for(submission, config)
+    assert request.submission_files == {}
+
+    with patch("web.service.grading_service._run_pipeline", new_callable=AsyncMock,
+               side_effect=RuntimeError("stop")) as run:
+        await grade_submission(request)
+
+    assert run.await_args.args[0].submission_files == FILES
@@ -6,6 +6,7 @@ from unittest.mock import Mock, AsyncMock, patch
 
 from web.service.grading_service import grade_submission, _node_to_dict
 from web.database.models.submission import SubmissionStatus
+from web.repositories.submission_repository import ACTIVE_STATUSES
 from web.database.models.submission_result import PipelineStatus
 
 
@@ -69,9 +70,14 @@ async def test_grade_submission_success():
             )
             await grade_submission(request)
 
-            # Verify status updates
-            assert mock_submission_repo.update_status.call_count == 1
-            mock_submission_repo.update_status.assert_called_with(1, SubmissionStatus.PROCESSING)
+            # Verify status transitions: guarded on the submission still being graded
+            assert mock_submission_repo.update_status.call_count == 2
+            start, finish = mock_submission_repo.update_status.call_args_list
+            assert start.args == (1, SubmissionStatus.PROCESSING)
+            assert start.kwargs["from_statuses"] == ACTIVE_STATUSES
+            assert finish.args == (1, SubmissionStatus.COMPLETED)
+            assert finish.kwargs["from_statuses"] == (SubmissionStatus.PROCESSING,)
+            assert "graded_at" in finish.kwargs
 
             # Verify result creation
             assert mock_result_repo.create.call_count == 1
@@ -148,6 +154,38 @@ async def test_grade_submission_pipeline_failure():
             assert create_call["failed_at_step"] == "PreFlightStep"
 
 
+@pytest.mark.asyncio
+async def test_grade_submission_skips_submissions_no_longer_pending():
+    """A job another worker already finished is neither graded nor given a second result."""
+    submission_repo = Mock(update_status=AsyncMock(return_value=None))
+    result_repo = Mock(create=AsyncMock())
+
+    with patch("web.service.grading_service.get_session") as mock_session, \
+         patch("web.service.grading_service.SubmissionRepository", return_value=submission_repo), \
+         patch("web.service.grading_service.ResultRepository", return_value=result_repo), \
+         patch("web.service.grading_service.build_pipeline") as build:
+        mock_session.return_value.__aenter__.return_value = AsyncMock()
+
+        from web.service.grading_service import GradingRequest
+        await grade_submission(GradingRequest(
+            submission_id=3,
+            grading_config_id=1,
+            template_name="input_output",
+            criteria_config={"tests": []},
+            setup_config={},
+            feedback_config={},
+            include_feedback=False,
+            language="python",
+            username="student3",
+            external_user_id="user_003",
+            submission_files={"main.py": {"filename": "main.py", "content": "print(3)"}},
+        ))
+
+    build.assert_not_called()
+    result_repo.create.assert_not_called()
+    assert submission_repo.update_status.call_count == 1
+
+
 def test_node_to_dict():
     """Test node to dict conversion."""
     # Test with object that has to_dict method
@@ -169,3 +207,47 @@ def test_node_to_dict():
     result = _node_to_dict(mock_nodes)
     assert result == [{"id": 1}, {"id": 2}]
 
+
+
+@pytest.mark.asyncio
+async def test_no_connection_is_held_while_the_pipeline_runs(db_engine, db_session):
+    """The pipeline runs between short units of work, without a pooled connection checked out."""
+    from sqlalchemy import event
+    from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+    from web.service.grading_service import GradingRequest
+
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="short-tx", template_name="input_output",
+        criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+    )
+    submission = await SubmissionRepository(db_session).create(
+        grading_config_id=config.id, external_user_id="u1", username="student",
+        submission_files={}, language="python",
+    )
+    await db_session.commit()
+
+    checked_out = []
+    pool = db_engine.sync_engine.pool
+    event.listen(pool, "checkout", lambda *args: checked_out.append(1))
+    event.listen(pool, "checkin", lambda *args: checked_out.pop())
+    held_during_pipeline = []
+
+    async def run_pipeline(request):
+        held_during_pipeline.append(len(checked_out))
+        raise RuntimeError("sandbox crashed")
+
+    request = GradingRequest(
+        submission_id=submission.id, grading_config_id=config.id, template_name="input_output",
+        criteria_config={}, setup_config={}, feedback_config={}, include_feedback=False,
+        language="python", username="student", external_user_id="u1", submission_files={},
+    )
+    with patch("web.service.grading_service._run_pipeline", side_effect=run_pipeline), \
+         patch("web.service.grading_service.result_cache_key", return_value="f" * 64):
+        await grade_submission(request)
+
+    assert held_during_pipeline == [0]
+    submission_id = submission.id
+    db_session.expire_all()
+    result = await ResultRepository(db_session).get_by_submission_id(submission_id)
+    assert result.pipeline_status == PipelineStatus.INTERRUPTED
+    assert (await SubmissionRepository(db_session).get_by_id(submission_id)).status == SubmissionStatus.FAILED
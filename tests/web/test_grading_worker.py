@@ -0,0 +1,121 @@
+"""Tests for the database-backed grading queue and its workers."""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+from web.service.grading_worker import GradingWorker
+
+
+async def _seed(db_session, *jobs):
+    """Create a config and submissions with the given (status, visible_at, attempts) job state."""
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="queue-1", template_name="input_output",
+        criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+    )
+    repo = SubmissionRepository(db_session)
+    ids = []
+    for index, (status, visible_at, attempts) in enumerate(jobs):
+        submission = await repo.create(
+            grading_config_id=config.id, external_user_id=f"u{index}", username="student",
+            submission_files={"main.py": {"filename": "main.py", "content": "print(1)"}},
+            language="python", status=status,
+            grading_options={"locale": "pt_br", "baseline_result_tree": {"final_score": 10.0}},
+        )
+        await repo.update(submission.id, visible_at=visible_at, attempts=attempts)
+        ids.append(submission.id)
+    await db_session.commit()
+    return ids
+
+
+def _now():
+    return datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_leased_jobs_and_reclaims_expired_ones(db_session):
+    pending, leased, expired, done = await _seed(
+        db_session,
+        (SubmissionStatus.PENDING, None, 0),
+        (SubmissionStatus.PROCESSING, _now() + timedelta(minutes=5), 1),
+        (SubmissionStatus.PROCESSING, _now() - timedelta(seconds=1), 1),
+        (SubmissionStatus.COMPLETED, None, 1),
+    )
+    repo = SubmissionRepository(db_session)
+
+    first = await repo.claim_next("w1", lease_seconds=60)
+    second = await repo.claim_next("w1", lease_seconds=60)
+    third = await repo.claim_next("w1", lease_seconds=60)
+
+    assert [first.id, second.id, third] == [pending, expired, None]
+    assert (second.attempts, second.locked_by) == (2, "w1")
+    assert second.visible_at > _now()
+    assert {leased, done}.isdisjoint({first.id, second.id})
+
+
+@pytest.mark.asyncio
+async def test_worker_grades_claimed_jobs_from_stored_options(db_session):
+    ids = await _seed(db_session, *[(SubmissionStatus.PENDING, None, 0)] * 3)
+    worker = GradingWorker(concurrency=2, lease_seconds=60, max_attempts=3, owner="w1")
+    release = asyncio.Event()
+
+    async def hold(*_):  # Jobs stay active until released
+        await release.wait()
+
+    with patch("web.service.grading_worker.grade_submission", new_callable=AsyncMock, side_effect=hold) as grade:
+        assert await worker.claim_available() == 2
+        release.set()
+        await asyncio.gather(*list(worker._active))
+        assert await worker.claim_available() == 1
+        await asyncio.gather(*list(worker._active))
+
+    requests = [call.args[0] for call in grade.await_args_list]
+    assert [request.submission_id for request in requests] == ids
+    assert requests[0].locale == "pt_br"
+    assert requests[0].baseline_result_tree == {"final_score": 10.0}
+    assert requests[0].regrade is False
+
+
+@pytest.mark.asyncio
+async def test_job_is_failed_after_max_attempts(db_session):
+    (submission_id,) = await _seed(db_session, (SubmissionStatus.PROCESSING, _now() - timedelta(seconds=1), 3))
+    worker = GradingWorker(concurrency=1, lease_seconds=60, max_attempts=3, owner="w1")
+
+    with patch("web.service.grading_worker.grade_submission", new_callable=AsyncMock) as grade:
+        await worker.claim_available()
+        await asyncio.gather(*list(worker._active))
+
+    grade.assert_not_awaited()
+    db_session.expire_all()
+    submission = await SubmissionRepository(db_session).get_by_id(submission_id)
+    result = await ResultRepository(db_session).get_by_submission_id(submission_id)
+    assert submission.status == SubmissionStatus.FAILED
+    assert result.pipeline_status == PipelineStatus.INTERRUPTED
+    assert "3 interrupted attempt" in result.error_message
+
+
+@pytest.mark.asyncio
+async def test_queue_dispatch_leaves_grading_to_workers(test_client, db_session):
+    await GradingConfigRepository(db_session).create(
+        external_assignment_id="queue-2", template_name="input_output",
+        criteria_config={"base": {"weight": 100, "tests": []}}, languages=["python"],
+    )
+    await db_session.commit()
+
+    with patch("web.api.v1.submissions.settings.GRADING_DISPATCH", "queue"), \
+         patch("web.api.v1.submissions.grade_submission", new_callable=AsyncMock) as grade:
+        response = await test_client.post("/api/v1/submissions", json={
+            "external_assignment_id": "queue-2", "external_user_id": "u1", "username": "student",
+            "files": [{"filename": "main.py", "content": "print(1)"}], "locale": "pt_br",
+        })
+
+    assert response.status_code == 200
+    grade.assert_not_called()
+    submission = await SubmissionRepository(db_session).get_by_id(response.json()["id"])
+    assert (submission.status, submission.visible_at, submission.attempts) == (SubmissionStatus.PENDING, None, 0)
+    assert submission.grading_options["locale"] == "pt_br"
@@ -0,0 +1,114 @@
+"""Tests for the compiled pipeline cache."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from web.service.grading_service import GradingRequest, _run_pipeline
+from web.service.pipeline_cache import PipelineCache, pipeline_key
+
+
+def _key(config_id=1, version=1, locale="en", include_feedback=False, feedback_config=None):
+    return pipeline_key(config_id, version, locale, include_feedback, feedback_config or {})
+
+
+def test_get_or_build_compiles_once_per_key():
+    cache = PipelineCache(maxsize=4)
+    build = Mock(side_effect=lambda: object())
+
+    first = cache.get_or_build(_key(), build)
+    second = cache.get_or_build(_key(), build)
+
+    assert first is second
+    assert build.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_key_changes_with_version_locale_and_feedback():
+    keys = {
+        _key(),
+        _key(version=2),
+        _key(locale="pt_br"),
+        _key(include_feedback=True),
+        _key(feedback_config={"general": {"report_title": "Report"}}),
+    }
+    assert len(keys) == 5
+    assert _key(feedback_config={"a": 1, "b": 2}) == _key(feedback_config={"b": 2, "a": 1})
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PipelineCache(maxsize=2)
+    cache.get_or_build(_key(config_id=1), object)
+    cache.get_or_build(_key(config_id=2), object)
+    cache.get_or_build(_key(config_id=1), object)  # touch 1
+    cache.get_or_build(_key(config_id=3), object)  # evicts 2
+
+    build = Mock(side_effect=object)
+    cache.get_or_build(_key(config_id=1), build)
+    cache.get_or_build(_key(config_id=2), build)
+    assert build.call_count == 1
+    assert len(cache) == 2
+
+
+def test_invalidate_drops_every_entry_of_a_config():
+    cache = PipelineCache(maxsize=8)
+    cache.get_or_build(_key(config_id=1, version=1), object)
+    cache.get_or_build(_key(config_id=1, version=1, locale="pt_br"), object)
+    cache.get_or_build(_key(config_id=2), object)
+
+    assert cache.invalidate(1) == 2
+    assert len(cache) == 1
+    assert cache.invalidate(1) == 0
+
+
+def test_zero_size_disables_caching():
+    cache = PipelineCache(maxsize=0)
+    build = Mock(side_effect=object)
+    cache.get_or_build(_key(), build)
+    cache.get_or_build(_key(), build)
+    assert build.call_count == 2
+    assert len(cache) == 0
+
+
+def _request(**overrides):
+    fields = dict(
+        submission_id=1,
+        grading_config_id=7,
+        template_name="input_output",
+        criteria_config={"test_library": "input_output", "base": {"weight": 100}},
+        feedback_config=None,
+        setup_config=None,
+        include_feedback=False,
+        language="python",
+        username="student",
+        external_user_id="u1",
+        submission_files={"main.py": {"filename": "main.py", "content": "print(1)"}},
+    )
+    fields.update(overrides)
+    return GradingRequest(**fields)
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_reuses_compiled_pipeline_for_same_version():
+    cache = PipelineCache(maxsize=4)
+    pipeline = Mock()
+    with patch("web.service.grading_service.pipeline_cache", cache), \
+         patch("web.service.grading_service.build_pipeline", return_value=pipeline) as build:
+        await _run_pipeline(_request(grading_config_version=3))
+        await _run_pipeline(_request(submission_id=2, grading_config_version=3))
+        await _run_pipeline(_request(submission_id=3, grading_config_version=4))
+
+    assert build.call_count == 2
+    assert pipeline.run.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_without_version_skips_cache():
+    cache = PipelineCache(maxsize=4)
+    with patch("web.service.grading_service.pipeline_cache", cache), \
+         patch("web.service.grading_service.build_pipeline", return_value=Mock()) as build:
+        await _run_pipeline(_request())
+        await _run_pipeline(_request())
+
+    assert build.call_count == 2
+    assert len(cache) == 0
@@ -0,0 +1,113 @@
+"""Tests for regrading submissions against the current grading configuration."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+from web.service.grading_service import GradingRequest, grade_submission, setup_fingerprint
+
+
+SETUP = {"python": {"required_files": ["main.py"]}}
+TRANSCRIPT = {"version": 1, "entries": []}
+
+
+async def _seed(db_engine, status=SubmissionStatus.COMPLETED, setup_config=SETUP):
+    """Create a config and a graded submission whose result was graded under setup_config."""
+    async with async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        config = await GradingConfigRepository(session).create(
+            external_assignment_id="regrade-1", template_name="input_output",
+            criteria_config={"base": {"weight": 100, "tests": []}}, setup_config=SETUP, languages=["python"],
+        )
+        submission = await SubmissionRepository(session).create(
+            grading_config_id=config.id, external_user_id="u1", username="student",
+            submission_files={"main.py": {"filename": "main.py", "content": "print(1)"}},
+            language="python", status=status,
+        )
+        await ResultRepository(session).create(
+            submission_id=submission.id, final_score=50.0, execution_time_ms=10,
+            pipeline_status=PipelineStatus.SUCCESS, transcript=TRANSCRIPT,
+            result_tree={"final_score": 50.0, "children": {"base": {}},
+                         "setup_fingerprint": setup_fingerprint(setup_config)},
+        )
+        await session.commit()
+        return submission.id
+
+
+async def _regrade(test_client, submission_id, **body):
+    with patch("web.api.v1.submissions.grade_submission", new_callable=AsyncMock) as grade, \
+         patch("web.api.v1.submissions.get_grading_tasks", return_value=set()):
+        response = await test_client.post(f"/api/v1/submissions/{submission_id}/regrade", json=body or None)
+    request = grade.call_args.args[0] if grade.call_args else None
+    return response, request
+
+
+@pytest.mark.asyncio
+async def test_regrade_reuses_stored_results_and_transcript(test_client, db_engine):
+    submission_id = await _seed(db_engine)
+
+    response, request = await _regrade(test_client, submission_id, locale="pt_br")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "pending"
+    assert request.regrade is True
+    assert request.locale == "pt_br"
+    assert request.previous_result_tree["final_score"] == 50.0
+    assert request.replay_transcript == TRANSCRIPT
+
+
+@pytest.mark.asyncio
+async def test_regrade_does_not_reuse_results_graded_under_another_setup(test_client, db_engine):
+    submission_id = await _seed(db_engine, setup_config={"python": {"setup_commands": ["make"]}})
+
+    _, request = await _regrade(test_client, submission_id)
+
+    assert request.previous_result_tree is None
+    assert request.replay_transcript == TRANSCRIPT
+
+
+@pytest.mark.asyncio
+async def test_full_regrade_ignores_stored_state(test_client, db_engine):
+    submission_id = await _seed(db_engine)
+
+    _, request = await _regrade(test_client, submission_id, incremental=False)
+
+    assert (request.previous_result_tree, request.replay_transcript) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_regrade_rejects_unknown_or_in_progress_submissions(test_client, db_engine):
+    submission_id = await _seed(db_engine, status=SubmissionStatus.PROCESSING)
+
+    assert (await _regrade(test_client, 999))[0].status_code == 404
+    assert (await _regrade(test_client, submission_id))[0].status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_grade_submission_falls_back_to_sandbox_when_transcript_misses():
+    replayed = Mock(replay_misses=["program './main' with stdin ['7']"])
+    live = Mock(replay_misses=[], result=None, step_results=[])
+    run = AsyncMock(side_effect=[replayed, live])
+    submission_repo = Mock(update_status=AsyncMock(), update=AsyncMock())
+    result_repo = Mock(create=AsyncMock(), delete_by_submission_id=AsyncMock())
+    request = GradingRequest(
+        submission_id=3, grading_config_id=1, template_name="input_output", criteria_config={},
+        setup_config={}, feedback_config={}, include_feedback=False, language="python",
+        username="student", external_user_id="u1", submission_files={},
+        replay_transcript=TRANSCRIPT, regrade=True,
+    )
+
+    with patch("web.service.grading_service.get_session") as mock_session, \
+         patch("web.service.grading_service.SubmissionRepository", return_value=submission_repo), \
+         patch("web.service.grading_service.ResultRepository", return_value=result_repo), \
+         patch("web.service.grading_service._run_pipeline", run), \
+         patch("web.service.grading_service.PipelineExecutionSerializer.serialize", return_value={}):
+        mock_session.return_value.__aenter__.return_value = AsyncMock()
+        await grade_submission(request)
+
+    result_repo.delete_by_submission_id.assert_awaited_once_with(3)
+    assert run.await_args_list[0].args[0].replay_transcript == TRANSCRIPT
+    assert run.await_args_list[1].args[0].replay_transcript is None
@@ -0,0 +1,180 @@
+"""Tests for the content-addressed submission result cache."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from autograder.models.abstract.ai_test_function import AiTestFunction
+from autograder.models.abstract.test_function import TestFunction
+from autograder.services.template_library_service import TemplateLibraryService
+from web.database.base import Base
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, SubmissionRepository, ResultRepository
+from web.service.grading_service import GradingRequest, grade_submission
+from web.service.result_cache import result_cache_key, submission_content_hash, uses_ai_tests
+
+
+FILES = {
+    "main.py": {"filename": "main.py", "content": "print(input())"},
+    "src/util.py": {"filename": "src/util.py", "content": "X = 1\n"},
+}
+STATIC_CRITERIA = {"base": {"weight": 100, "tests": [{"name": "no eval", "type": "forbidden_keyword"}]}}
+AI_CRITERIA = {
+    "base": {
+        "weight": 100,
+        "subjects": [{"subject_name": "algorithms", "weight": 100,
+                      "tests": [{"name": "sorting", "type": "ai_sorting_algorithm"}]}],
+    }
+}
+
+
+def _templates(name="static_analysis"):
+    return [TemplateLibraryService.get_instance().load_builtin_template(name)]
+
+
+def _hash(files=FILES, language="python", version=1, locale="en", templates=None):
+    return submission_content_hash(files, language, 7, version, templates or _templates(), locale)
+
+
+def _request(**overrides):
+    fields = dict(
+        submission_id=2,
+        grading_config_id=7,
+        template_name="static_analysis",
+        criteria_config=STATIC_CRITERIA,
+        setup_config={},
+        feedback_config={},
+        include_feedback=True,
+        language="python",
+        username="student",
+        external_user_id="u1",
+        submission_files=FILES,
+        grading_config_version=1,
+    )
+    fields.update(overrides)
+    return GradingRequest(**fields)
+
+
+def test_hash_ignores_file_order_and_path_spelling():
+    reordered = {
+        "./src/util.py": {"filename": "./src/util.py", "content": "X = 1\n"},
+        "main.py": {"filename": "main.py", "content": "print(input())"},
+    }
+    assert _hash(reordered) == _hash()
+
+
+def test_hash_covers_content_language_version_locale_and_template_version():
+    changed_file = dict(FILES, **{"main.py": {"filename": "main.py", "content": "print(input()) "}})
+    template = _templates()[0]
+    with patch.object(type(template), "template_version", new="2"):
+        bumped_template = _hash()
+
+    hashes = {
+        _hash(),
+        _hash(changed_file),
+        _hash(language="java"),
+        _hash(version=2),
+        _hash(locale="pt_br"),
+        bumped_template,
+    }
+    assert len(hashes) == 6
+
+
+def test_uses_ai_tests_looks_into_nested_subjects():
+    assert uses_ai_tests(AI_CRITERIA, _templates()) is True
+    assert uses_ai_tests(STATIC_CRITERIA, _templates()) is False
+
+
+def test_uses_ai_tests_with_mixed_ai_and_deterministic_tests():
+    mixed = {**STATIC_CRITERIA, "bonus": {"weight": 10, "tests": [{"name": "sorting", "type": "ai_sorting_algorithm"}]}}
+    assert uses_ai_tests(mixed, _templates()) is True
+
+
+def test_uses_ai_tests_checks_every_template_defining_a_test():
+    missing = Mock(get_test=Mock(side_effect=AttributeError("Test 'forbidden_keyword' not found")))
+    deterministic = Mock(get_test=Mock(return_value=Mock(spec=TestFunction)))
+    ai = Mock(get_test=Mock(return_value=Mock(spec=AiTestFunction)))
+
+    assert uses_ai_tests(STATIC_CRITERIA, [missing, deterministic, ai]) is True
+    assert uses_ai_tests(STATIC_CRITERIA, [missing, deterministic]) is False
+
+
+def test_result_cache_key_excludes_ai_configs_unless_opted_in():
+    assert result_cache_key(_request()) == _hash()
+    assert result_cache_key(_request(criteria_config=AI_CRITERIA)) is None
+    assert result_cache_key(_request(criteria_config=AI_CRITERIA, cache_ai_results=True)) == _hash()
+    assert result_cache_key(_request(grading_config_version=None)) is None
+
+
+@pytest.fixture
+async def db_session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_cached_result_returns_latest_success(db_session):
+    config = await GradingConfigRepository(db_session).create(
+        external_assignment_id="cache-1", template_name="input_output",
+        criteria_config={}, languages=["python"],
+    )
+    submission_repo = SubmissionRepository(db_session)
+    result_repo = ResultRepository(db_session)
+
+    async def graded(score, status, content_hash="abc"):
+        submission = await submission_repo.create(
+            grading_config_id=config.id, external_user_id="u1", username="s", submission_files=FILES,
+        )
+        await submission_repo.update(submission.id, content_hash=content_hash)
+        await result_repo.create(submission_id=submission.id, final_score=score,
+                                 execution_time_ms=10, pipeline_status=status)
+        return submission
+
+    await graded(70.0, PipelineStatus.SUCCESS)
+    latest = await graded(80.0, PipelineStatus.SUCCESS)
+    await graded(0.0, PipelineStatus.FAILED)
+    await graded(99.0, PipelineStatus.SUCCESS, content_hash="other")
+
+    cached = await result_repo.get_cached_result("abc")
+    assert cached.final_score == 80.0
+    assert (await result_repo.get_cached_result("abc", exclude_submission_id=latest.id)).final_score == 70.0
+    assert await result_repo.get_cached_result("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_grade_submission_copies_cached_result():
+    cached = Mock(
+        submission_id=1, final_score=90.0, result_tree={"final_score": 90.0, "children": {}},
+        feedback="Well done", focus={"areas": []}, score_vector={"base/t1": 90.0},
+        pipeline_execution={"status": "success"}, transcript={"version": 1, "entries": []},
+    )
+    submission_repo = Mock(update_status=AsyncMock(), update=AsyncMock())
+    result_repo = Mock(create=AsyncMock(), get_cached_result=AsyncMock(return_value=cached))
+
+    with patch("web.service.grading_service.get_session") as mock_session, \
+         patch("web.service.grading_service.SubmissionRepository", return_value=submission_repo), \
+         patch("web.service.grading_service.ResultRepository", return_value=result_repo), \
+         patch("web.service.grading_service.build_pipeline") as build:
+        mock_session.return_value.__aenter__.return_value = AsyncMock()
+        await grade_submission(_request())
+
+    build.assert_not_called()
+    result_repo.get_cached_result.assert_awaited_once_with(_hash(), exclude_submission_id=2)
+    created = result_repo.create.call_args.kwargs
+    assert created["submission_id"] == 2
+    assert created["final_score"] == 90.0
+    assert created["feedback"] == "Well done"
+    assert created["pipeline_status"] == PipelineStatus.SUCCESS
+    assert created["transcript"] == {"version": 1, "entries": []}  # Later regrades can replay it
+    assert submission_repo.update_status.call_args_list[-1].args == (2, SubmissionStatus.COMPLETED)
@@ -98,6 +98,14 @@ class TestHealthEndpoints:
         assert "ready" in data
         assert "timestamp" in data
 
+    @pytest.mark.asyncio
+    async def test_metrics(self, client):
+        """Test /api/v1/metrics endpoint."""
+        response = await client.get("/api/v1/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE sandbox_acquire_wait_seconds histogram" in response.text
+
 
 class TestTemplateEndpoints:
     """Test template-related endpoints."""
@@ -0,0 +1,93 @@
+"""Tests for what-if reweighting of stored results."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+
+
+def _test(value):
+    return {
+        "name": "expect_output",
+        "parameters": [
+            {"name": "inputs", "value": [value]},
+            {"name": "expected_output", "value": value},
+            {"name": "program_command", "value": "python main.py"},
+        ],
+    }
+
+
+CRITERIA = {
+    "base": {
+        "weight": 100,
+        "subjects": [
+            {"subject_name": "io", "weight": 50, "tests": [_test("a")]},
+            {"subject_name": "style", "weight": 50, "tests": [_test("b")]},
+        ],
+    },
+    "bonus": {"weight": 10, "tests": [_test("c")]},
+}
+
+
+def _stored(io, style, bonus):
+    def subject(name, score):
+        return {"name": name, "tests": [{"name": "expect_output", "score": score}]}
+    return {"children": {
+        "base": {"name": "base", "subjects": [subject("io", io), subject("style", style)]},
+        "bonus": {"name": "bonus", "tests": [{"name": "expect_output", "score": bonus}]},
+    }}
+
+
+async def _seed(db_engine, results):
+    async with async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        config = await GradingConfigRepository(session).create(
+            external_assignment_id="what-if-1", template_name="input_output",
+            criteria_config=CRITERIA, languages=["python"],
+        )
+        for user, tree, status in results:
+            submission = await SubmissionRepository(session).create(
+                grading_config_id=config.id, external_user_id=user, username=user,
+                submission_files={}, language="python", status=SubmissionStatus.COMPLETED,
+            )
+            await ResultRepository(session).create(
+                submission_id=submission.id, final_score=0.0, execution_time_ms=1,
+                pipeline_status=status, result_tree=tree,
+            )
+        await session.commit()
+        return config.id
+
+
+@pytest.mark.asyncio
+async def test_what_if_recomputes_scores_under_new_weights(test_client, db_engine):
+    config_id = await _seed(db_engine, [
+        ("u1", _stored(100, 0, 0), PipelineStatus.SUCCESS),
+        ("u2", _stored(0, 100, 100), PipelineStatus.SUCCESS),
+        ("u2", _stored(100, 100, 100), PipelineStatus.SUCCESS),
+        ("u3", None, PipelineStatus.FAILED),
+    ])
+
+    response = await test_client.post(
+        f"/api/v1/configs/{config_id}/what-if", json={"weights": {"base/io": 80, "bonus": 20}}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tests"] == 3
+    scores = {s["external_user_id"]: (s["current_score"], s["what_if_score"]) for s in data["submissions"]}
+    # u2's newest submission wins; u3 never graded successfully
+    assert scores == {"u1": (50.0, 80.0), "u2": (100.0, 100.0)}
+    assert data["summary"]["changed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_what_if_rejects_unknown_paths_and_configs(test_client, db_engine):
+    config_id = await _seed(db_engine, [])
+
+    unknown = await test_client.post(f"/api/v1/configs/{config_id}/what-if", json={"weights": {"base/nope": 10}})
+    missing = await test_client.post("/api/v1/configs/999/what-if", json={})
+
+    assert unknown.status_code == 400
+    assert "base/nope" in unknown.json()["detail"]
+    assert missing.status_code == 404
@@ -2,17 +2,24 @@
 
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from web.api.deps import get_db_session, require_integration_token
 from web.config.logging import get_logger
-from web.repositories import GradingConfigRepository
+from web.repositories import AnalyticsRepository, GradingConfigRepository, ResultRepository
 from web.schemas import (
+    AssignmentAnalyticsResponse,
     GradingConfigCreate,
     GradingConfigResponse,
     GradingConfigUpdate,
+    WhatIfRequest,
+    WhatIfResponse,
 )
+from web.service.analytics_service import assignment_analytics
+from web.service.config_cache import config_cache
+from web.service.pipeline_cache import pipeline_cache
+from web.service.what_if_service import what_if
 
 
 logger = get_logger(__name__)
@@ -55,6 +62,7 @@ async def create_grading_config(
         setup_config=config.setup_config,
         feedback_config=config.feedback_config,
         include_feedback=config.include_feedback,
+        cache_ai_results=config.cache_ai_results,
     )
 
     logger.info(
@@ -152,6 +160,8 @@ async def update_grading_config(
     update_data = update.model_dump(exclude_unset=True)
     if update_data:
         updated_config = await repo.update(config_id, **update_data)
+        pipeline_cache.invalidate(config_id)
+        config_cache.invalidate(config_id)
         logger.info(
             "Grading configuration updated: config_id=%d, fields=%s",
             config_id,
@@ -183,6 +193,8 @@ async def update_grading_config_external(
     update_data = update.model_dump(exclude_unset=True)
     if update_data:
         updated_config = await repo.update_by_external_id(external_assignment_id, **update_data)
+        pipeline_cache.invalidate(config.id)
+        config_cache.invalidate(config.id)
         logger.info(
             "Grading configuration updated by external ID: assignment=%s, fields=%s",
             external_assignment_id,
@@ -192,3 +204,52 @@ async def update_grading_config_external(
 
     logger.info("No fields to update for grading configuration: assignment=%s", external_assignment_id)
     return config
+
+
+@router.post("/{config_id}/what-if", response_model=WhatIfResponse)
+async def what_if_reweighting(
+    config_id: int,
+    request: WhatIfRequest,
+    session: AsyncSession = Depends(get_db_session)
+):
+    """Recompute the stored final scores of a configuration under alternative weights."""
+    logger.info(
+        "What-if reweighting requested: config_id=%d, weights=%s, subjects_weight=%s",
+        config_id,
+        request.weights,
+        request.subjects_weight,
+    )
+    config = await GradingConfigRepository(session).get_by_id(config_id)
+    if not config:
+        logger.warning("Grading configuration not found for what-if: config_id=%d", config_id)
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    graded = await ResultRepository(session).get_successful_by_config(config_id)
+    try:
+        return what_if(config, graded, request)
+    except ValueError as exc:
+        logger.warning("Invalid what-if request: config_id=%d, error=%s", config_id, exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/{config_id}/analytics", response_model=AssignmentAnalyticsResponse)
+async def get_assignment_analytics(
+    config_id: int,
+    bins: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_db_session)
+):
+    """Per-test pass rates, percentiles and histograms over a configuration's graded results."""
+    logger.info("Computing assignment analytics: config_id=%d, bins=%d", config_id, bins)
+    config = await GradingConfigRepository(session).get_by_id(config_id)
+    if not config:
+        logger.warning("Grading configuration not found for analytics: config_id=%d", config_id)
+        raise HTTPException(status_code=404, detail="Configuration not found")
+
+    analytics = await assignment_analytics(AnalyticsRepository(session), config_id, bins)
+    logger.info(
+        "Assignment analytics computed: config_id=%d, results=%d, tests=%d",
+        config_id,
+        analytics.results,
+        len(analytics.tests),
+    )
+    return analytics
@@ -3,8 +3,9 @@
 from datetime import datetime, timezone
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
+from sandbox_manager.metrics import CONTENT_TYPE, render_metrics
 from web.config.logging import get_logger
 from web.core.lifespan import get_template_service
 
@@ -45,3 +46,8 @@ async def readiness_check():
         }
     )
 
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus metrics; includes the sandbox pools when they run in this process (local mode)."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
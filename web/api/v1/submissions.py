@@ -1,16 +1,17 @@
 """Submission endpoints."""
 
 import asyncio
+import math
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from web.api.deps import get_db_session, require_integration_token
 from web.config.logging import get_logger
-from web.core.lifespan import get_grading_tasks
-from web.database.models.submission import SubmissionStatus
+from web.core.lifespan import get_grading_tasks, get_grading_worker
+from web.database.models.submission import BULK_LANE, SubmissionStatus
 from web.database.models.submission_result import PipelineStatus
 from web.repositories import (
     GradingConfigRepository,
@@ -19,19 +20,93 @@ from web.repositories import (
 )
 from web.schemas import (
     SubmissionCreate,
+    RegradeRequest,
     SubmissionResponse,
     SubmissionDetailResponse,
     ExternalResultCreate,
     ExternalResultResponse,
 )
-from web.service.grading_service import grade_submission, GradingRequest
+from web.core.config import settings
+from web.service.admission_service import AdmissionDecision, assess
+from web.service.config_cache import config_cache
+from web.service.fair_scheduler import tenant_for
+from web.service.grading_service import grade_submission, grading_request_for, GradingRequest
+from web.service.grading_worker import worker_id
 
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/submissions", tags=["Submissions"])
 
+# Lease owner recorded on the jobs this API process grades inline
+INLINE_OWNER = f"api:{worker_id()}"
 
-@router.post("", response_model=SubmissionResponse)
+
+async def _admit(session, language: str) -> AdmissionDecision:
+    """
+    Admission decision for a new job, raising 429 with Retry-After when its language's
+    backlog is full. Inline dispatch without an embedded worker has nobody to hand a
+    waiting job to, so there a job is rejected as soon as its language has no free sandbox.
+    """
+    decision = await assess(session, language)
+    if decision.admitted and decision.saturated and settings.GRADING_DISPATCH == "inline" \
+            and get_grading_worker() is None:
+        decision.admitted = False
+        decision.retry_after_seconds = max(1, math.ceil(decision.estimated_start_seconds))
+    if not decision.admitted:
+        logger.warning(
+            "Submission rejected: %s backlog full or no sandbox free (waiting=%d, running=%d, capacity=%s), retry after %ds",
+            language, decision.waiting, decision.running, decision.capacity, decision.retry_after_seconds,
+        )
+        raise HTTPException(
+            status_code=429,
+            detail=f"No grading capacity for {language} ({decision.running} running, "
+                   f"{decision.waiting} waiting). Retry in {decision.retry_after_seconds} seconds.",
+            headers={"Retry-After": str(decision.retry_after_seconds)},
+        )
+    return decision
+
+
+def _accepted(db_submission, decision: AdmissionDecision) -> SubmissionResponse:
+    """Submission response carrying its place in the queue."""
+    response = SubmissionResponse.model_validate(db_submission)
+    response.queue_position = decision.waiting
+    response.estimated_start_at = decision.estimated_start_at
+    return response
+
+
+async def _dispatch(
+    session, submission_repo, db_submission, grading_config, decision: AdmissionDecision
+) -> Optional[GradingRequest]:
+    """
+    Commit a queued submission and hand it to grading.
+
+    In inline dispatch this process leases the job and grades it right away; the lease
+    lets a worker retry it if the process dies. When every sandbox of its language is
+    taken, the job stays queued for the embedded worker instead of failing for lack of
+    one. In queue dispatch the grading workers claim it from the database.
+    """
+    worker = get_grading_worker()
+    if settings.GRADING_DISPATCH != "inline" or decision.saturated:
+        await session.commit()
+        if worker is not None:
+            worker.notify()
+        return None
+
+    # Build the request before committing: incremental regrades read the stored result
+    grading_request = grading_request_for(db_submission, grading_config)
+    await submission_repo.lease(db_submission.id, INLINE_OWNER, settings.GRADING_LEASE_SECONDS)
+    await session.commit()
+
+    task = asyncio.create_task(grade_submission(grading_request))
+
+    # Track task to prevent garbage collection
+    grading_tasks = get_grading_tasks()
+    grading_tasks.add(task)
+    task.add_done_callback(grading_tasks.discard)
+    return grading_request
+
+
+@router.post("", response_model=SubmissionResponse, responses={429: {"description": "Grading backlog full"}})
 async def create_submission(
     submission: SubmissionCreate,
     session: AsyncSession = Depends(get_db_session)
@@ -45,9 +120,8 @@ async def create_submission(
         [f.filename for f in submission.files],
     )
 
-    # Get grading configuration
-    config_repo = GradingConfigRepository(session)
-    grading_config = await config_repo.get_by_external_id(submission.external_assignment_id)
+    # Get grading configuration (a cached snapshot while its version is current)
+    grading_config = await config_cache.get_by_external_id(session, submission.external_assignment_id)
 
     if not grading_config:
         logger.warning(
@@ -87,6 +161,8 @@ async def create_submission(
             submission.external_user_id,
         )
 
+    decision = await _admit(session, submission_language)
+
     # Convert list of SubmissionFileData to dict format for storage and quick access
     # This indexing by filename allows O(1) file lookups during grading
     submission_files_dict = {
@@ -94,7 +170,7 @@ async def create_submission(
         for file_data in submission.files
     }
 
-    # Create submission record
+    # Create submission record; it is also the grading job
     submission_repo = SubmissionRepository(session)
     db_submission = await submission_repo.create(
         grading_config_id=grading_config.id,
@@ -104,45 +180,68 @@ async def create_submission(
         language=submission_language,
         status=SubmissionStatus.PENDING,
         submission_metadata=submission.metadata,
+        grading_options={"locale": submission.locale, "baseline_result_tree": submission.baseline_result_tree},
+        tenant=tenant_for(grading_config, submission.metadata),
     )
 
-    # Commit to save submission
-    await session.commit()
-
-    # Schedule concurrent grading task using asyncio
-    # This allows multiple submissions to be graded simultaneously,
-    # fully utilizing the sandbox pool's capacity
-    grading_request = GradingRequest(
-        submission_id=db_submission.id,
-        grading_config_id=grading_config.id,
-        template_name=grading_config.template_name,
-        criteria_config=grading_config.criteria_config,
-        setup_config=grading_config.setup_config,
-        feedback_config=grading_config.feedback_config or {},
-        include_feedback=grading_config.include_feedback,
-        language=db_submission.language,
-        username=db_submission.username,
-        external_user_id=db_submission.external_user_id,
-        submission_files=db_submission.submission_files,
-        locale=submission.locale,
-        baseline_result_tree=submission.baseline_result_tree,
-    )
-    task = asyncio.create_task(grade_submission(grading_request))
-
-    # Track task to prevent garbage collection
-    grading_tasks = get_grading_tasks()
-    grading_tasks.add(task)
-    task.add_done_callback(grading_tasks.discard)
+    response = _accepted(db_submission, decision)
+    await _dispatch(session, submission_repo, db_submission, grading_config, decision)
 
     logger.info(
-        "Submission created and grading task scheduled: submission_id=%d, user=%s, assignment=%s, language=%s",
+        "Submission created and queued for grading: submission_id=%d, user=%s, assignment=%s, language=%s, "
+        "dispatch=%s, position=%d, estimated_start=%.1fs",
         db_submission.id,
         db_submission.external_user_id,
         submission.external_assignment_id,
         db_submission.language,
+        settings.GRADING_DISPATCH,
+        decision.waiting,
+        decision.estimated_start_seconds,
+    )
+
+    return response
+
+
+@router.post(
+    "/{submission_id}/regrade", response_model=SubmissionResponse, responses={429: {"description": "Grading backlog full"}}
+)
+async def regrade_submission(
+    submission_id: int,
+    payload: Optional[RegradeRequest] = None,
+    session: AsyncSession = Depends(get_db_session)
+):
+    """Regrade a submission against the current version of its grading configuration."""
+    payload = payload or RegradeRequest()
+    submission_repo = SubmissionRepository(session)
+    db_submission = await submission_repo.get_by_id_with_result(submission_id)
+
+    if not db_submission:
+        logger.warning("Regrade rejected: submission not found: submission_id=%d", submission_id)
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    if db_submission.status in (SubmissionStatus.PENDING, SubmissionStatus.PROCESSING):
+        logger.warning("Regrade rejected: submission_id=%d is still %s", submission_id, db_submission.status.value)
+        raise HTTPException(status_code=409, detail="Submission is still being graded")
+
+    config_repo = GradingConfigRepository(session)
+    grading_config = await config_repo.get_by_id(db_submission.grading_config_id)
+    decision = await _admit(session, db_submission.language or grading_config.languages[0])
+
+    # Incremental regrades reuse the stored result and transcript (see grading_request_for)
+    grading_options = {"locale": payload.locale, "regrade": True, "incremental": payload.incremental}
+    # Regrades wait in the bulk lane so they never hold up new submissions
+    await submission_repo.enqueue(db_submission.id, grading_options, lane=BULK_LANE)
+    grading_request = await _dispatch(session, submission_repo, db_submission, grading_config, decision)
+
+    logger.info(
+        "Regrade queued: submission_id=%d, config_version=%s, reused_tree=%s, transcript=%s",
+        db_submission.id,
+        grading_config.version,
+        grading_request is not None and grading_request.previous_result_tree is not None,
+        grading_request is not None and grading_request.replay_transcript is not None,
     )
 
-    return db_submission
+    return _accepted(await submission_repo.get_by_id(db_submission.id), decision)
 
 
 @router.get("/{submission_id}", response_model=SubmissionDetailResponse)
@@ -160,18 +259,9 @@ async def get_submission(
         logger.warning("Submission not found: submission_id=%d", submission_id)
         raise HTTPException(status_code=404, detail="Submission not found")
 
-    # Convert submission_files from storage format to API response format
+    # Files are stored by content hash; only this endpoint and grading read them back
     # Storage: Dict[str, Dict] -> Response: Dict[str, str]
-    formatted_files = {}
-    if submission.submission_files:
-        for name, data in submission.submission_files.items():
-            # Extract content from the stored dict structure
-            if isinstance(data, dict):
-                # New format: {"filename": "...", "content": "..."}
-                formatted_files[name] = data.get("content", "")
-            else:
-                # Legacy format or unexpected type: convert to string
-                formatted_files[name] = str(data)
+    formatted_files = {name: data["content"] for name, data in (await repo.get_files(submission)).items()}
 
     # Build response
     response_data = {
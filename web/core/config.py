@@ -1,5 +1,6 @@
 """Application configuration."""
 
+import json
 import os
 
 
@@ -27,6 +28,32 @@ class Settings:
     SANDBOX_MODE: str = os.getenv("SANDBOX_MODE", "local")  # "local" or "remote"
     SANDBOX_API_URL: str = os.getenv("SANDBOX_API_URL", "http://localhost:8001")
 
+    # Grading Configuration
+    PIPELINE_CACHE_SIZE: int = int(os.getenv("PIPELINE_CACHE_SIZE", "64"))  # 0 disables caching
+    CONFIG_CACHE_SIZE: int = int(os.getenv("CONFIG_CACHE_SIZE", "256"))  # 0 disables caching
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RECORD_TRANSCRIPTS: bool = os.getenv("RECORD_TRANSCRIPTS", "true").lower() == "true"
+
+    # Grading Queue Configuration
+    # "inline": the API grades its own submissions right away (and recovers lost ones);
+    # "queue": the API only enqueues and `python -m web.worker` processes grade
+    GRADING_DISPATCH: str = os.getenv("GRADING_DISPATCH", "inline")
+    GRADING_WORKER_CONCURRENCY: int = int(os.getenv("GRADING_WORKER_CONCURRENCY", "4"))  # 0 disables the API's worker
+    GRADING_LEASE_SECONDS: float = float(os.getenv("GRADING_LEASE_SECONDS", "60"))  # Visibility timeout of a claimed job
+    GRADING_MAX_ATTEMPTS: int = int(os.getenv("GRADING_MAX_ATTEMPTS", "3"))
+    GRADING_POLL_INTERVAL: float = float(os.getenv("GRADING_POLL_INTERVAL", "1.0"))
+
+    # Fair Scheduling
+    # Queues grading workers share fairly: "assignment", or "course" (metadata course_id, else assignment)
+    GRADING_TENANT_BY: str = os.getenv("GRADING_TENANT_BY", "assignment")
+    GRADING_TENANT_WEIGHTS: dict = json.loads(os.getenv("GRADING_TENANT_WEIGHTS", "{}"))  # Tenant -> weight (default 1)
+    GRADING_TENANT_MAX_CONCURRENCY: int = int(os.getenv("GRADING_TENANT_MAX_CONCURRENCY", "0"))  # Per tenant; 0 = no cap
+    GRADING_TENANT_CONCURRENCY: dict = json.loads(os.getenv("GRADING_TENANT_CONCURRENCY", "{}"))  # Tenant -> cap override
+
+    # Admission Control
+    ADMISSION_MAX_BACKLOG: int = int(os.getenv("ADMISSION_MAX_BACKLOG", "200"))  # Waiting jobs per language; 0 disables
+    GRADING_ESTIMATED_SECONDS: float = float(os.getenv("GRADING_ESTIMATED_SECONDS", "10"))  # Used until a language has history
+
 
 settings = Settings()
 
@@ -20,6 +20,7 @@ logger = get_logger(__name__)
 # Global state
 template_service: Optional[TemplateLibraryService] = None
 grading_tasks: set = set()  # Track active grading tasks to prevent garbage collection
+grading_worker = None  # GradingWorker that recovers and retries queued submissions in inline dispatch
 
 
 def get_template_service() -> Optional[TemplateLibraryService]:
@@ -32,6 +33,38 @@ def get_grading_tasks() -> set:
     return grading_tasks
 
 
+def get_grading_worker():
+    """Get the embedded grading worker (None unless the API grades inline with a worker)."""
+    return grading_worker
+
+
+def setup_sandbox_manager() -> None:
+    """Initialize the sandbox manager from settings (local pools from SANDBOX_CONFIG_FILE, or remote)."""
+    logger.info("Initializing sandbox manager...")
+
+    if settings.SANDBOX_MODE == "remote":
+        pool_configs = []
+        logger.info("Sandbox configured for remote mode, skipping local pool configuration")
+    else:
+        config_file = settings.SANDBOX_CONFIG_FILE
+        try:
+            pool_configs = SandboxPoolConfig.load_from_yaml(config_file)
+            logger.info("Loaded sandbox configurations from %s", config_file)
+        except FileNotFoundError as e:
+            logger.error("Sandbox configuration file not found: %s", e)
+            raise
+        except Exception as e:
+            logger.error("Error loading sandbox configuration: %s", e)
+            raise
+
+    initialize_sandbox_manager(
+        pool_configs=pool_configs,
+        mode=settings.SANDBOX_MODE,
+        api_url=settings.SANDBOX_API_URL
+    )
+    logger.info("Sandbox manager initialized in %s mode", settings.SANDBOX_MODE)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -41,6 +74,7 @@ async def lifespan(app: FastAPI):
     - Initialize database
     - Initialize sandbox manager
     - Load template library
+    - Start the embedded grading worker (inline dispatch)
 
     Shutdown:
     - Clean up resources
@@ -49,7 +83,7 @@ async def lifespan(app: FastAPI):
 
     load_dotenv()  # Load environment variables first from .env file
 
-    global template_service, grading_tasks
+    global template_service, grading_tasks, grading_worker
 
     # Startup
     logger.info("Starting Autograder Web API...")
@@ -60,35 +94,22 @@ async def lifespan(app: FastAPI):
     logger.info("Database initialized successfully")
 
     # Initialize sandbox manager
-    logger.info("Initializing sandbox manager...")
-
-    if settings.SANDBOX_MODE == "remote":
-        pool_configs = []
-        logger.info("Sandbox configured for remote mode, skipping local pool configuration")
-    else:
-        config_file = settings.SANDBOX_CONFIG_FILE
-        try:
-            pool_configs = SandboxPoolConfig.load_from_yaml(config_file)
-            logger.info("Loaded sandbox configurations from %s", config_file)
-        except FileNotFoundError as e:
-            logger.error("Sandbox configuration file not found: %s", e)
-            raise
-        except Exception as e:
-            logger.error("Error loading sandbox configuration: %s", e)
-            raise
-
-    initialize_sandbox_manager(
-        pool_configs=pool_configs,
-        mode=settings.SANDBOX_MODE,
-        api_url=settings.SANDBOX_API_URL
-    )
-    logger.info("Sandbox manager initialized in %s mode", settings.SANDBOX_MODE)
+    setup_sandbox_manager()
 
     # Initialize template library
     logger.info("Loading template library...")
     template_service = TemplateLibraryService.get_instance()
     logger.info("Template library loaded successfully")
 
+    # In inline dispatch the API grades its own submissions; its worker picks up the ones a
+    # previous process left unfinished and retries jobs whose worker died
+    grading_worker_task = None
+    if settings.GRADING_DISPATCH == "inline" and settings.GRADING_WORKER_CONCURRENCY > 0:
+        # Imported here: the grading service imports web.core, which imports this module
+        from web.service.grading_worker import GradingWorker  # pylint: disable=import-outside-toplevel
+        grading_worker = GradingWorker()
+        grading_worker_task = asyncio.create_task(grading_worker.run())
+
     logger.info("Autograder Web API ready!")
 
     yield
@@ -96,6 +117,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Autograder Web API...")
 
+    # Stop claiming jobs; unfinished ones keep their lease and are retried after it expires
+    if grading_worker_task is not None:
+        await grading_worker.stop()
+        grading_worker_task.cancel()
+        await asyncio.wait([grading_worker_task])
+        grading_worker = None
+
     # Cancel pending grading tasks
     if grading_tasks:
         logger.info("Cancelling %s pending grading tasks...", len(grading_tasks))
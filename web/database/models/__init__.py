@@ -3,5 +3,7 @@
 from web.database.models.grading_config import GradingConfiguration
 from web.database.models.submission import Submission
 from web.database.models.submission_result import SubmissionResult
+from web.database.models.result_test_score import ResultTestScore
+from web.database.models.file_blob import FileBlob
 
-__all__ = ["GradingConfiguration", "Submission", "SubmissionResult"]
+__all__ = ["GradingConfiguration", "Submission", "SubmissionResult", "ResultTestScore", "FileBlob"]
@@ -0,0 +1,43 @@
+"""FileBlob database model."""
+
+import hashlib
+import zlib
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from web.database.base import Base
+
+
+class FileBlob(Base):
+    """
+    The content of a submitted file, stored once per SHA-256 and zlib-compressed.
+
+    Submissions reference blobs from their file manifest, so a file that is resubmitted
+    unchanged (or shared by many submissions, like starter code) is stored once, and
+    listing submissions never reads file content.
+    """
+    __tablename__ = "file_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # Uncompressed bytes
+    content: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # zlib-compressed UTF-8
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)  # pylint: disable=not-callable
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        return zlib.compress(data, 6)
+
+    @property
+    def text(self) -> str:
+        """The file content, decompressed."""
+        return zlib.decompress(self.content).decode("utf-8")
+
+    def __repr__(self):
+        return f"<FileBlob(sha256={self.sha256[:12]}, size={self.size})>"
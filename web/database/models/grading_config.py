@@ -27,6 +27,7 @@ class GradingConfiguration(Base):
     setup_config: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     feedback_config: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     include_feedback: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    cache_ai_results: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # Opt AI configs into the result cache
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)  # pylint: disable=not-callable
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)  # pylint: disable=not-callable
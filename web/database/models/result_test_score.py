@@ -0,0 +1,29 @@
+"""ResultTestScore database model."""
+
+from sqlalchemy import Integer, Float, String, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from web.database.base import Base
+
+
+class ResultTestScore(Base):
+    """
+    One test score of a successful submission result.
+
+    A normalized copy of the result's test scores (one row per test, repeated paths
+    included) so per-assignment analytics aggregate a plain float column instead of
+    parsing every result's score_vector.
+    """
+    __tablename__ = "result_test_scores"
+    __table_args__ = (Index("ix_result_test_scores_config_path", "grading_config_id", "path"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    submission_result_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("submission_results.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    grading_config_id: Mapped[int] = mapped_column(Integer, ForeignKey("grading_configurations.id"), nullable=False)
+    path: Mapped[str] = mapped_column(String(512), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ResultTestScore(result_id={self.submission_result_id}, path={self.path}, score={self.score})>"
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Integer, String, DateTime, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Integer, String, DateTime, JSON, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -19,6 +19,12 @@ class SubmissionStatus(str, Enum):
     FAILED = "failed"
 
 
+# Scheduling lanes: interactive submissions are claimed before bulk regrades
+INTERACTIVE_LANE = "interactive"
+BULK_LANE = "bulk"
+DEFAULT_TENANT = "default"  # Queue of submissions created without a tenant (e.g. external results)
+
+
 class Submission(Base):
     """
     Represents a student's code submission.
@@ -31,7 +37,7 @@ class Submission(Base):
     grading_config_id: Mapped[int] = mapped_column(Integer, ForeignKey("grading_configurations.id"), nullable=False, index=True)
     external_user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     username: Mapped[str] = mapped_column(String(255), nullable=False)
-    submission_files: Mapped[dict] = mapped_column(JSON, nullable=False)
+    file_manifest: Mapped[dict] = mapped_column(JSON, nullable=False)  # {name: {filename, sha256, size}}; content in file_blobs
     language: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     status: Mapped[SubmissionStatus] = mapped_column(
         SQLEnum(SubmissionStatus, values_callable=lambda x: [e.value for e in x]),
@@ -42,10 +48,22 @@ class Submission(Base):
     submitted_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False, index=True)  # pylint: disable=not-callable
     graded_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     submission_metadata: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)  # Result cache key
+
+    # Grading job state; the submissions table is the grading queue
+    grading_options: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # locale, baseline, regrade flags
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"), nullable=False)
+    visible_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)  # Lease expiry; claimable after
+    locked_by: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Worker holding the lease
+    tenant: Mapped[str] = mapped_column(String(255), default=DEFAULT_TENANT, server_default=DEFAULT_TENANT, nullable=False)  # Fair-share queue
+    lane: Mapped[str] = mapped_column(String(16), default=INTERACTIVE_LANE, server_default=INTERACTIVE_LANE, nullable=False)  # interactive or bulk
+    queued_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), nullable=True)  # Last (re)queued
     
     # Relationships
     grading_config: Mapped["GradingConfiguration"] = relationship("GradingConfiguration", back_populates="submissions")
     result: Mapped[Optional["SubmissionResult"]] = relationship("SubmissionResult", back_populates="submission", uselist=False)
 
+    __table_args__ = (Index("ix_submissions_queue", "tenant", "lane"),)
+
     def __repr__(self):
         return f"<Submission(id={self.id}, user={self.username}, status={self.status})>"
@@ -35,6 +35,7 @@ class SubmissionResult(Base):
     score_vector: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Flat path-keyed score map
     comparison: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Baseline comparison output
     pipeline_execution: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # NEW: Pipeline step details
+    transcript: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # Sandbox interactions, for replay regrades
     execution_time_ms: Mapped[int] = mapped_column(Integer, nullable=False)
     pipeline_status: Mapped[PipelineStatus] = mapped_column(
         SQLEnum(PipelineStatus, values_callable=lambda x: [e.value for e in x]),
@@ -0,0 +1,31 @@
+"""add content_hash to submissions and cache_ai_results to grading_configurations
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the result cache key and the AI opt-in flag."""
+    op.add_column('submissions',
+                  sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_submissions_content_hash', 'submissions', ['content_hash'])
+    op.add_column('grading_configurations',
+                  sa.Column('cache_ai_results', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    """Remove the result cache key and the AI opt-in flag."""
+    op.drop_column('grading_configurations', 'cache_ai_results')
+    op.drop_index('ix_submissions_content_hash', table_name='submissions')
+    op.drop_column('submissions', 'content_hash')
@@ -0,0 +1,26 @@
+"""add transcript to submission_results
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the recorded sandbox transcript used by replay regrades."""
+    op.add_column('submission_results',
+                  sa.Column('transcript', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove the recorded sandbox transcript."""
+    op.drop_column('submission_results', 'transcript')
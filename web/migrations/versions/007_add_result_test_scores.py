@@ -0,0 +1,55 @@
+"""add result_test_scores
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the normalized test scores used by assignment analytics, backfilled from score vectors."""
+    scores = op.create_table(
+        'result_test_scores',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('submission_result_id', sa.Integer(),
+                  sa.ForeignKey('submission_results.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('grading_config_id', sa.Integer(), sa.ForeignKey('grading_configurations.id'), nullable=False),
+        sa.Column('path', sa.String(length=512), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+    )
+    op.create_index('ix_result_test_scores_submission_result_id', 'result_test_scores', ['submission_result_id'])
+    op.create_index('ix_result_test_scores_config_path', 'result_test_scores', ['grading_config_id', 'path'])
+
+    # Existing results only have score vectors, so repeated test paths backfill as one row
+    rows = op.get_bind().execute(sa.text(
+        "SELECT submission_results.id, submissions.grading_config_id, submission_results.score_vector "
+        "FROM submission_results JOIN submissions ON submissions.id = submission_results.submission_id "
+        "WHERE submission_results.pipeline_status = 'success' AND submission_results.score_vector IS NOT NULL"
+    ).columns(score_vector=sa.JSON()))
+    backfill = []
+    for result_id, grading_config_id, score_vector in rows:
+        for path, score in (score_vector or {}).items():
+            backfill.append({
+                'submission_result_id': result_id,
+                'grading_config_id': grading_config_id,
+                'path': path,
+                'score': float(score),
+            })
+    if backfill:
+        op.bulk_insert(scores, backfill)
+
+
+def downgrade() -> None:
+    """Remove the normalized test scores."""
+    op.drop_index('ix_result_test_scores_config_path', table_name='result_test_scores')
+    op.drop_index('ix_result_test_scores_submission_result_id', table_name='result_test_scores')
+    op.drop_table('result_test_scores')
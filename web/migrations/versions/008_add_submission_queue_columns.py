@@ -0,0 +1,37 @@
+"""add grading queue columns to submissions
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the job state grading workers claim submissions with."""
+    op.add_column('submissions',
+                  sa.Column('grading_options', sa.JSON(), nullable=True))
+    op.add_column('submissions',
+                  sa.Column('attempts', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.add_column('submissions',
+                  sa.Column('visible_at', sa.DateTime(), nullable=True))
+    op.add_column('submissions',
+                  sa.Column('locked_by', sa.String(length=255), nullable=True))
+    op.create_index('ix_submissions_visible_at', 'submissions', ['visible_at'])
+
+
+def downgrade() -> None:
+    """Remove the grading job state."""
+    op.drop_index('ix_submissions_visible_at', table_name='submissions')
+    op.drop_column('submissions', 'locked_by')
+    op.drop_column('submissions', 'visible_at')
+    op.drop_column('submissions', 'attempts')
+    op.drop_column('submissions', 'grading_options')
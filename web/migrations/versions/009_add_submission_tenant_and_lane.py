@@ -0,0 +1,42 @@
+"""add fair scheduling tenant and lane to submissions
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the queue (tenant), lane and queue time grading workers schedule submissions by."""
+    op.add_column('submissions',
+                  sa.Column('tenant', sa.String(length=255), nullable=False, server_default='default'))
+    op.add_column('submissions',
+                  sa.Column('lane', sa.String(length=16), nullable=False, server_default='interactive'))
+    op.add_column('submissions',
+                  sa.Column('queued_at', sa.DateTime(), nullable=True, server_default=sa.func.now()))
+    op.create_index('ix_submissions_queue', 'submissions', ['tenant', 'lane'])
+
+    # Existing submissions share the queue of their assignment and were queued when submitted
+    op.execute("UPDATE submissions SET queued_at = submitted_at")
+    op.execute(
+        "UPDATE submissions SET tenant = 'assignment:' || ("
+        "SELECT external_assignment_id FROM grading_configurations "
+        "WHERE grading_configurations.id = submissions.grading_config_id)"
+    )
+
+
+def downgrade() -> None:
+    """Remove the fair scheduling columns."""
+    op.drop_index('ix_submissions_queue', table_name='submissions')
+    op.drop_column('submissions', 'queued_at')
+    op.drop_column('submissions', 'lane')
+    op.drop_column('submissions', 'tenant')
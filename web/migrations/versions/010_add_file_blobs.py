@@ -0,0 +1,117 @@
+"""store submission files by content hash
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+import hashlib
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+
+submissions = sa.table(
+    'submissions',
+    sa.column('id', sa.Integer()),
+    sa.column('submission_files', sa.JSON()),
+    sa.column('file_manifest', sa.JSON()),
+)
+
+
+def _batches(bind, column):
+    """Yield (id, value) rows of a submissions JSON column in id order, BATCH rows at a time."""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(submissions.c.id, submissions.c[column])
+            .where(submissions.c.id > last_id)
+            .order_by(submissions.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Move submission file content into compressed, content-addressed blobs; rows keep a manifest."""
+    blobs = op.create_table(
+        'file_blobs',
+        sa.Column('sha256', sa.String(length=64), primary_key=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.add_column('submissions', sa.Column('file_manifest', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    stored = set()
+    for rows in _batches(bind, 'submission_files'):
+        new_blobs = []
+        for submission_id, files in rows:
+            if isinstance(files, str):
+                files = json.loads(files)
+            manifest = {}
+            for name, data in (files or {}).items():
+                if isinstance(data, dict):
+                    filename, content = data.get('filename', name), data.get('content', '')
+                else:
+                    filename, content = name, str(data)
+                raw = content.encode('utf-8')
+                sha256 = hashlib.sha256(raw).hexdigest()
+                manifest[name] = {'filename': filename, 'sha256': sha256, 'size': len(raw)}
+                if sha256 not in stored:
+                    stored.add(sha256)
+                    new_blobs.append({'sha256': sha256, 'size': len(raw), 'content': zlib.compress(raw, 6)})
+            bind.execute(
+                submissions.update().where(submissions.c.id == submission_id).values(file_manifest=manifest)
+            )
+        if new_blobs:
+            op.bulk_insert(blobs, new_blobs)
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('submission_files')
+        batch_op.alter_column('file_manifest', existing_type=sa.JSON(), nullable=False)
+
+
+def downgrade() -> None:
+    """Store submission file content inline again and remove the blobs."""
+    op.add_column('submissions', sa.Column('submission_files', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    blobs = sa.table('file_blobs', sa.column('sha256', sa.String()), sa.column('content', sa.LargeBinary()))
+    for rows in _batches(bind, 'file_manifest'):
+        for submission_id, manifest in rows:
+            if isinstance(manifest, str):
+                manifest = json.loads(manifest)
+            manifest = manifest or {}
+            hashes = {entry['sha256'] for entry in manifest.values()}
+            contents = {
+                sha256: zlib.decompress(content).decode('utf-8')
+                for sha256, content in bind.execute(
+                    sa.select(blobs.c.sha256, blobs.c.content).where(blobs.c.sha256.in_(hashes))
+                )
+            } if hashes else {}
+            files = {
+                name: {'filename': entry['filename'], 'content': contents[entry['sha256']]}
+                for name, entry in manifest.items()
+            }
+            bind.execute(
+                submissions.update().where(submissions.c.id == submission_id).values(submission_files=files)
+            )
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('file_manifest')
+        batch_op.alter_column('submission_files', existing_type=sa.JSON(), nullable=False)
+    op.drop_table('file_blobs')
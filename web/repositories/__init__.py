@@ -1,12 +1,16 @@
 """Repository pattern implementations."""
 
+from web.repositories.analytics_repository import AnalyticsRepository
 from web.repositories.base_repository import BaseRepository
+from web.repositories.blob_repository import BlobRepository
 from web.repositories.grading_config_repository import GradingConfigRepository
 from web.repositories.submission_repository import SubmissionRepository
 from web.repositories.result_repository import ResultRepository
 
 __all__ = [
+    "AnalyticsRepository",
     "BaseRepository",
+    "BlobRepository",
     "GradingConfigRepository",
     "SubmissionRepository",
     "ResultRepository",
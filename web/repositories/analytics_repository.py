@@ -0,0 +1,99 @@
+"""Analytics repository over normalized test scores."""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, delete, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from autograder.services.score_model import iter_stored_scores
+from web.database.models.result_test_score import ResultTestScore
+from web.database.models.submission import Submission
+from web.database.models.submission_result import SubmissionResult
+from web.repositories.base_repository import bulk_insert
+
+# Test scores at or above this count as passed (same as ResultTree.get_passed_tests)
+PASS_SCORE = 100.0
+
+
+class AnalyticsRepository:
+    """Maintains result_test_scores and aggregates it per assignment."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_result(self, result: SubmissionResult, grading_config_id: Optional[int] = None) -> int:
+        """
+        Store the test scores of a successful result, one row per test, with multi-row INSERTs.
+
+        Scores are read from the result tree so repeated test paths keep one row each;
+        results without a tree (external results) fall back to their score vector. The
+        configuration is looked up from the submission unless grading_config_id is given.
+        """
+        if result.result_tree:
+            scores = list(iter_stored_scores(result.result_tree))
+        else:
+            scores = [(path, float(score)) for path, score in (result.score_vector or {}).items()]
+        if not scores:
+            return 0
+
+        if grading_config_id is None:
+            grading_config_id = await self.session.scalar(
+                select(Submission.grading_config_id).where(Submission.id == result.submission_id)
+            )
+        return await bulk_insert(self.session, ResultTestScore, [
+            {
+                "submission_result_id": result.id,
+                "grading_config_id": grading_config_id,
+                "path": path,
+                "score": score,
+            }
+            for path, score in scores
+        ])
+
+    async def delete_for_submission(self, submission_id: int) -> None:
+        """Drop the test scores of a submission's result."""
+        await self.session.execute(
+            delete(ResultTestScore).where(
+                ResultTestScore.submission_result_id.in_(
+                    select(SubmissionResult.id).where(SubmissionResult.submission_id == submission_id)
+                )
+            )
+        )
+
+    async def path_stats(self, grading_config_id: int) -> List[Dict]:
+        """Count, mean, min, max and passed count per test path."""
+        result = await self.session.execute(
+            select(
+                ResultTestScore.path,
+                func.count(),
+                func.avg(ResultTestScore.score),
+                func.min(ResultTestScore.score),
+                func.max(ResultTestScore.score),
+                func.sum(case((ResultTestScore.score >= PASS_SCORE, 1), else_=0)),
+            )
+            .where(ResultTestScore.grading_config_id == grading_config_id)
+            .group_by(ResultTestScore.path)
+        )
+        return [
+            {"path": path, "count": count, "mean": mean, "min": low, "max": high, "passed": passed}
+            for path, count, mean, low, high, passed in result.all()
+        ]
+
+    async def sorted_scores(self, grading_config_id: int) -> Dict[str, List[float]]:
+        """Every score per test path, ascending (for percentiles and histograms)."""
+        result = await self.session.execute(
+            select(ResultTestScore.path, ResultTestScore.score)
+            .where(ResultTestScore.grading_config_id == grading_config_id)
+            .order_by(ResultTestScore.path, ResultTestScore.score)
+        )
+        columns: Dict[str, List[float]] = {}
+        for path, score in result.all():
+            columns.setdefault(path, []).append(score)
+        return columns
+
+    async def result_count(self, grading_config_id: int) -> int:
+        """Number of results with recorded test scores."""
+        return await self.session.scalar(
+            select(func.count(distinct(ResultTestScore.submission_result_id)))
+            .where(ResultTestScore.grading_config_id == grading_config_id)
+        ) or 0
@@ -1,14 +1,24 @@
 """Base repository pattern for database operations."""
 
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Generic, TypeVar, Type, Optional, List, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from web.database.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Rows per multi-row INSERT; keeps the bound parameters under SQLite's and asyncpg's limits
+BULK_INSERT_CHUNK = 1000
+
+
+async def bulk_insert(session: AsyncSession, model: Type[Base], rows: Sequence[dict]) -> int:
+    """Insert rows with one multi-row INSERT per BULK_INSERT_CHUNK rows. Returns how many were inserted."""
+    for start in range(0, len(rows), BULK_INSERT_CHUNK):
+        await session.execute(insert(model).values(list(rows[start:start + BULK_INSERT_CHUNK])))
+    return len(rows)
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository providing common CRUD operations."""
@@ -25,12 +35,11 @@ class BaseRepository(Generic[ModelType]):
         self.session = session
 
     async def create(self, **kwargs) -> ModelType:
-        """Create a new entity."""
-        instance = self.model(**kwargs)
-        self.session.add(instance)
-        await self.session.flush()
-        await self.session.refresh(instance)
-        return instance
+        """Create a new entity with a single INSERT ... RETURNING."""
+        result = await self.session.execute(
+            insert(self.model).values(**kwargs).returning(self.model)
+        )
+        return result.scalar_one()
 
     async def get_by_id(self, id: int) -> Optional[ModelType]:
         """Get entity by ID."""
@@ -47,20 +56,27 @@ class BaseRepository(Generic[ModelType]):
         return list(result.scalars().all())
 
     async def update(self, id: int, **kwargs) -> Optional[ModelType]:
-        """Update entity by ID."""
-        instance = await self.get_by_id(id)
-        if instance:
-            for key, value in kwargs.items():
-                setattr(instance, key, value)
-            await self.session.flush()
-            await self.session.refresh(instance)
-        return instance
+        """Update entity by ID with a single UPDATE ... RETURNING (None if it does not exist)."""
+        return await self._update_where([self.model.id == id], kwargs)
 
     async def delete(self, id: int) -> bool:
         """Delete entity by ID."""
-        instance = await self.get_by_id(id)
-        if instance:
-            self.session.delete(instance)
-            await self.session.flush()
-            return True
-        return False
+        result = await self.session.execute(delete(self.model).where(self.model.id == id))
+        return result.rowcount > 0
+
+    async def _update_where(self, conditions: list, values: dict) -> Optional[ModelType]:
+        """
+        Apply values to the entity matching conditions and return it as updated, in one
+        statement. Returns None when no row matches (e.g. a guard on its current state failed).
+        """
+        if not values:
+            result = await self.session.execute(select(self.model).where(*conditions))
+            return result.scalar_one_or_none()
+        result = await self.session.execute(
+            update(self.model)
+            .where(*conditions)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.scalar_one_or_none()
@@ -0,0 +1,70 @@
+"""Content-addressed storage of submission files."""
+
+from typing import Dict
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.database.models.file_blob import FileBlob
+
+
+class BlobRepository:
+    """
+    Stores submission files as FileBlobs and resolves file manifests back to content.
+
+    A manifest maps each file name to {"filename", "sha256", "size"}; it is what a
+    submission row keeps instead of the content itself.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def store_files(self, files: dict) -> Dict[str, dict]:
+        """
+        Store the content of submission files ({name: {"filename", "content"}}) and return
+        their manifest. Content already stored is neither compressed nor written again.
+        """
+        manifest = {}
+        blobs = {}
+        for name, data in files.items():
+            if isinstance(data, dict):
+                filename, content = data.get("filename", name), data.get("content", "")
+            else:
+                filename, content = name, str(data)
+            raw = content.encode("utf-8")
+            sha256 = FileBlob.digest(raw)
+            manifest[name] = {"filename": filename, "sha256": sha256, "size": len(raw)}
+            blobs.setdefault(sha256, raw)
+
+        if blobs:
+            stored = set(await self.session.scalars(select(FileBlob.sha256).where(FileBlob.sha256.in_(list(blobs)))))
+            rows = [
+                {"sha256": sha256, "size": len(raw), "content": FileBlob.compress(raw)}
+                for sha256, raw in blobs.items()
+                if sha256 not in stored
+            ]
+            if rows:
+                await self.session.execute(self._insert_new().values(rows))
+        return manifest
+
+    async def load_files(self, manifest: Dict[str, dict]) -> Dict[str, dict]:
+        """The files of a manifest as {name: {"filename", "content"}}, decompressing each blob once."""
+        hashes = {entry["sha256"] for entry in manifest.values()}
+        if not hashes:
+            return {}
+        blobs = await self.session.scalars(select(FileBlob).where(FileBlob.sha256.in_(list(hashes))))
+        contents = {blob.sha256: blob.text for blob in blobs}
+        return {
+            name: {"filename": entry["filename"], "content": contents[entry["sha256"]]}
+            for name, entry in manifest.items()
+        }
+
+    def _insert_new(self):
+        """INSERT that skips blobs a concurrent submission stored first."""
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(FileBlob).on_conflict_do_nothing(index_elements=["sha256"])
+        if dialect == "sqlite":
+            return sqlite.insert(FileBlob).on_conflict_do_nothing(index_elements=["sha256"])
+        return insert(FileBlob)
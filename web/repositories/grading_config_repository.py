@@ -25,16 +25,35 @@ class GradingConfigRepository(BaseRepository[GradingConfiguration]):
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _apply_changes(config: GradingConfiguration, **kwargs) -> bool:
+        """Set changed fields and bump the version if anything changed."""
+        changed = False
+        for key, value in kwargs.items():
+            if hasattr(config, key) and getattr(config, key) != value:
+                setattr(config, key, value)
+                changed = True
+        if changed:
+            config.version = (config.version or 1) + 1
+        return changed
+
+    async def update(self, id: int, **kwargs) -> Optional[GradingConfiguration]:
+        """Update a grading configuration, bumping its version when a field changes."""
+        config = await self.get_by_id(id)
+        if config:
+            self._apply_changes(config, **kwargs)
+            await self.session.flush()
+            await self.session.refresh(config)
+        return config
+
     async def update_by_external_id(self, external_assignment_id: str, **kwargs) -> Optional[GradingConfiguration]:
         """Update a grading configuration by external assignment ID."""
         config = await self.get_by_external_id(external_assignment_id)
         if not config:
             return None
-            
-        for key, value in kwargs.items():
-            if hasattr(config, key):
-                setattr(config, key, value)
-                
+
+        self._apply_changes(config, **kwargs)
+
         await self.session.commit()
         await self.session.refresh(config)
         return config
@@ -1,11 +1,13 @@
 """SubmissionResult repository."""
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from web.database.models.submission_result import SubmissionResult
+from web.database.models.submission import Submission
+from web.database.models.submission_result import PipelineStatus, SubmissionResult
+from web.repositories.analytics_repository import AnalyticsRepository
 from web.repositories.base_repository import BaseRepository
 
 
@@ -21,3 +23,69 @@ class ResultRepository(BaseRepository[SubmissionResult]):
             select(SubmissionResult).where(SubmissionResult.submission_id == submission_id)
         )
         return result.scalar_one_or_none()
+
+    async def create(self, grading_config_id: Optional[int] = None, **kwargs) -> SubmissionResult:
+        """
+        Create a result, recording the test scores of successful ones for analytics.
+        Passing the submission's grading_config_id saves looking it up for the scores.
+        """
+        result = await super().create(**kwargs)
+        if result.pipeline_status == PipelineStatus.SUCCESS:
+            await AnalyticsRepository(self.session).record_result(result, grading_config_id)
+        return result
+
+    async def delete_by_submission_id(self, submission_id: int) -> bool:
+        """Delete the result of a submission (before it is regraded)."""
+        await AnalyticsRepository(self.session).delete_for_submission(submission_id)
+        result = await self.session.execute(
+            delete(SubmissionResult).where(SubmissionResult.submission_id == submission_id)
+        )
+        await self.session.flush()
+        return result.rowcount > 0
+
+    async def get_cached_result(self, content_hash: str, exclude_submission_id: Optional[int] = None) -> Optional[SubmissionResult]:
+        """Get the latest successful result of a submission with the same content hash."""
+        query = (
+            select(SubmissionResult)
+            .join(Submission, Submission.id == SubmissionResult.submission_id)
+            .where(
+                Submission.content_hash == content_hash,
+                SubmissionResult.pipeline_status == PipelineStatus.SUCCESS,
+            )
+            .order_by(SubmissionResult.id.desc())
+            .limit(1)
+        )
+        if exclude_submission_id is not None:
+            query = query.where(Submission.id != exclude_submission_id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def get_successful_by_config(self, grading_config_id: int) -> List[Tuple[Submission, SubmissionResult]]:
+        """Successful results of a configuration with their submissions, newest submission first."""
+        result = await self.session.execute(
+            select(Submission, SubmissionResult)
+            .join(SubmissionResult, SubmissionResult.submission_id == Submission.id)
+            .where(
+                Submission.grading_config_id == grading_config_id,
+                SubmissionResult.pipeline_status == PipelineStatus.SUCCESS,
+            )
+            .order_by(Submission.submitted_at.desc(), Submission.id.desc())
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def mean_execution_ms(self, language: str, sample: int = 50) -> Optional[float]:
+        """Mean execution time of the latest successful gradings in a language (None without history)."""
+        recent = (
+            select(SubmissionResult.execution_time_ms)
+            .join(Submission, Submission.id == SubmissionResult.submission_id)
+            .where(
+                Submission.language == language,
+                SubmissionResult.pipeline_status == PipelineStatus.SUCCESS,
+            )
+            .order_by(SubmissionResult.id.desc())
+            .limit(sample)
+            .subquery()
+        )
+        result = await self.session.execute(select(func.avg(recent.c.execution_time_ms)))
+        mean = result.scalar_one_or_none()
+        return float(mean) if mean is not None else None
@@ -1,13 +1,20 @@
 """Submission repository."""
 
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from web.database.models.submission import Submission, SubmissionStatus
+from web.database.models.submission import (
+    DEFAULT_TENANT,
+    INTERACTIVE_LANE,
+    Submission,
+    SubmissionStatus,
+)
 from web.repositories.base_repository import BaseRepository
+from web.repositories.blob_repository import BlobRepository
 
 
 class SubmissionRepository(BaseRepository[Submission]):
@@ -21,28 +28,31 @@ class SubmissionRepository(BaseRepository[Submission]):
             grading_config_id: int,
             external_user_id: str,
             username: str,
-            submission_files: dict,  # Receives Dict[str, str] from API
+            submission_files: dict,  # {name: {"filename", "content"}} from the API
             language: Optional[str] = None,
             status: SubmissionStatus = SubmissionStatus.PENDING,
             submission_metadata: Optional[dict] = None,
+            grading_options: Optional[dict] = None,
+            tenant: str = DEFAULT_TENANT,
+            lane: str = INTERACTIVE_LANE,
     ) -> Submission:
-        """Create a new submission."""
-
-        # submission_files is already Dict[str, str] - store as-is
-        db_submission = Submission(
+        """Create a new submission, storing its files by content hash and keeping their manifest."""
+        return await super().create(
             grading_config_id=grading_config_id,
             external_user_id=external_user_id,
             username=username,
-            submission_files=submission_files,  # Store directly
+            file_manifest=await BlobRepository(self.session).store_files(submission_files),
             language=language,
             status=status,
             submission_metadata=submission_metadata,
+            grading_options=grading_options,
+            tenant=tenant,
+            lane=lane,
         )
 
-        self.session.add(db_submission)
-        await self.session.flush()
-        await self.session.refresh(db_submission)
-        return db_submission
+    async def get_files(self, submission: Submission) -> Dict[str, dict]:
+        """The files of a submission as {name: {"filename", "content"}}, read from its manifest."""
+        return await BlobRepository(self.session).load_files(submission.file_manifest)
 
     async def get_by_id_with_result(self, id: int) -> Optional[Submission]:
         """Get submission by ID with result loaded."""
@@ -92,6 +102,153 @@ class SubmissionRepository(BaseRepository[Submission]):
         )
         return list(result.scalars().all())
 
-    async def update_status(self, id: int, status: SubmissionStatus) -> Optional[Submission]:
-        """Update submission status."""
-        return await self.update(id, status=status)
+    async def update_status(
+        self,
+        id: int,
+        status: SubmissionStatus,
+        from_statuses: Optional[Collection[SubmissionStatus]] = None,
+        **values,
+    ) -> Optional[Submission]:
+        """
+        Move a submission to status (setting any other values with it) in one UPDATE ... RETURNING.
+
+        With from_statuses the transition only applies while the submission is still in one
+        of them; None is returned when it is not, e.g. because another worker that reclaimed
+        the job already finished it.
+        """
+        conditions = [Submission.id == id]
+        if from_statuses is not None:
+            conditions.append(Submission.status.in_(list(from_statuses)))
+        return await self._update_where(conditions, dict(values, status=status))
+
+    async def enqueue(
+        self, id: int, grading_options: Optional[dict] = None, lane: str = INTERACTIVE_LANE
+    ) -> Optional[Submission]:
+        """Queue a submission for (re)grading as a fresh job in the given lane."""
+        return await self.update(
+            id,
+            status=SubmissionStatus.PENDING,
+            grading_options=grading_options,
+            lane=lane,
+            queued_at=_utcnow(),
+            attempts=0,
+            visible_at=None,
+            locked_by=None,
+        )
+
+    async def lease(self, id: int, owner: str, lease_seconds: float) -> None:
+        """Take the job of a submission for owner until the lease expires (one attempt)."""
+        await self.session.execute(
+            update(Submission)
+            .where(Submission.id == id)
+            .values(attempts=Submission.attempts + 1, visible_at=_lease_expiry(lease_seconds), locked_by=owner)
+        )
+
+    async def extend_lease(self, id: int, lease_seconds: float) -> None:
+        """Push back the lease expiry of a job that is still being graded."""
+        await self.session.execute(
+            update(Submission)
+            .where(Submission.id == id, _ACTIVE)
+            .values(visible_at=_lease_expiry(lease_seconds))
+        )
+
+    async def claim_next(
+        self,
+        owner: str,
+        lease_seconds: float,
+        exclude_languages: Collection[str] = (),
+        queue: Optional[Tuple[str, str]] = None,
+    ) -> Optional[Submission]:
+        """
+        Claim the longest queued claimable grading job: a PENDING or PROCESSING submission whose
+        lease is unset or expired (its worker died or gave it up). Jobs in
+        exclude_languages (e.g. languages without a free sandbox) are left queued, and
+        queue=(tenant, lane) only claims from that queue (as picked by the scheduler).
+
+        Rows locked by another worker's claim are skipped (FOR UPDATE SKIP LOCKED), so
+        concurrent workers never claim the same job. The claim counts as an attempt.
+        Picking and leasing the job is a single UPDATE ... RETURNING.
+        """
+        candidate = (
+            select(Submission.id)
+            .where(_ACTIVE, _claimable(_utcnow()))
+            .order_by(Submission.queued_at, Submission.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if exclude_languages:
+            candidate = candidate.where(Submission.language.not_in(list(exclude_languages)))
+        if queue is not None:
+            candidate = candidate.where(Submission.tenant == queue[0], Submission.lane == queue[1])
+
+        return await self._update_where(
+            [Submission.id == candidate.scalar_subquery()],
+            {
+                "attempts": Submission.attempts + 1,
+                "visible_at": _lease_expiry(lease_seconds),
+                "locked_by": owner,
+            },
+        )
+
+    async def queue_depth(self, language: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Grading jobs per language: "running" ones hold a live lease, "waiting" ones are
+        claimable (not yet leased, or their lease expired).
+        """
+        now = _utcnow()
+        query = (
+            select(
+                Submission.language,
+                func.count(Submission.id).filter(Submission.visible_at > now),
+                func.count(Submission.id).filter(_claimable(now)),
+            )
+            .where(_ACTIVE)
+            .group_by(Submission.language)
+        )
+        if language is not None:
+            query = query.where(Submission.language == language)
+        result = await self.session.execute(query)
+        return {lang: {"running": running, "waiting": waiting} for lang, running, waiting in result.all()}
+
+    async def queue_backlog(self, exclude_languages: Collection[str] = ()) -> List[dict]:
+        """
+        Grading jobs per (tenant, lane) queue: "running" ones hold a live lease, "waiting"
+        ones are claimable (jobs in exclude_languages are not counted as waiting), and
+        "oldest_queued_at" is when the longest waiting job was queued.
+        """
+        now = _utcnow()
+        waiting = _claimable(now)
+        if exclude_languages:
+            waiting = waiting & Submission.language.not_in(list(exclude_languages))
+        result = await self.session.execute(
+            select(
+                Submission.tenant,
+                Submission.lane,
+                func.count(Submission.id).filter(Submission.visible_at > now),
+                func.count(Submission.id).filter(waiting),
+                func.min(Submission.queued_at).filter(waiting),
+            )
+            .where(_ACTIVE)
+            .group_by(Submission.tenant, Submission.lane)
+        )
+        return [
+            {"tenant": tenant, "lane": lane, "running": running, "waiting": count, "oldest_queued_at": oldest}
+            for tenant, lane, running, count, oldest in result.all()
+        ]
+
+
+# Submissions that are grading jobs, and which of them a worker may claim at `now`
+ACTIVE_STATUSES = (SubmissionStatus.PENDING, SubmissionStatus.PROCESSING)
+_ACTIVE = Submission.status.in_(ACTIVE_STATUSES)
+
+
+def _claimable(now: datetime):
+    return or_(Submission.visible_at.is_(None), Submission.visible_at <= now)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _lease_expiry(lease_seconds: float) -> datetime:
+    return _utcnow() + timedelta(seconds=lease_seconds)
@@ -7,6 +7,7 @@ from web.schemas.assignment import (
 )
 from web.schemas.submission import (
     SubmissionCreate,
+    RegradeRequest,
     SubmissionResponse,
     SubmissionDetailResponse,
     SubmissionStatus,
@@ -14,6 +15,11 @@ from web.schemas.submission import (
     ExternalResultCreate,
     ExternalResultResponse,
 )
+from web.schemas.analytics import (
+    AssignmentAnalyticsResponse,
+    WhatIfRequest,
+    WhatIfResponse,
+)
 from web.schemas.execution import (
     DeliberateCodeExecutionRequest,
     DeliberateCodeExecutionResponse,
@@ -24,12 +30,16 @@ __all__ = [
     "GradingConfigUpdate",
     "GradingConfigResponse",
     "SubmissionCreate",
+    "RegradeRequest",
     "SubmissionResponse",
     "SubmissionDetailResponse",
     "SubmissionStatus",
     "SubmissionFileData",
     "ExternalResultCreate",
     "ExternalResultResponse",
+    "AssignmentAnalyticsResponse",
+    "WhatIfRequest",
+    "WhatIfResponse",
     "DeliberateCodeExecutionRequest",
     "DeliberateCodeExecutionResponse",
 ]
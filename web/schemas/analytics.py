@@ -0,0 +1,70 @@
+"""Analytics schemas for API requests and responses."""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class WhatIfRequest(BaseModel):
+    """Schema for recomputing an assignment's scores under alternative weights."""
+    weights: Dict[str, float] = Field(
+        default_factory=dict,
+        description=(
+            "Weight overrides by criteria path. 'bonus' and 'penalty' take the category weight; "
+            "a subject or test path (e.g. 'base/io') takes its share (0-100) among its siblings"
+        ),
+    )
+    subjects_weight: Dict[str, float] = Field(
+        default_factory=dict,
+        description="subjects_weight overrides by path, for holders with both subjects and tests",
+    )
+    latest_per_user: bool = Field(True, description="Only use each user's most recent graded submission")
+
+
+class WhatIfSubmissionScore(BaseModel):
+    """Schema for one submission's score before and after reweighting."""
+    submission_id: int
+    external_user_id: str
+    stored_score: float = Field(..., description="Final score stored when the submission was graded")
+    current_score: float = Field(..., description="Stored test scores recomputed under the current weights")
+    what_if_score: float = Field(..., description="Stored test scores recomputed under the requested weights")
+    delta: float = Field(..., description="what_if_score - current_score")
+    missing_tests: int = Field(0, description="Tests of the current criteria without a stored score (counted as 0)")
+
+
+class WhatIfSummary(BaseModel):
+    """Schema for aggregate what-if statistics."""
+    count: int
+    current_mean: Optional[float] = None
+    what_if_mean: Optional[float] = None
+    mean_delta: Optional[float] = None
+    changed: int = Field(0, description="Submissions whose score changes by at least 0.01")
+
+
+class WhatIfResponse(BaseModel):
+    """Schema for what-if reweighting results."""
+    grading_config_id: int
+    tests: int = Field(..., description="Test columns of the compiled criteria")
+    summary: WhatIfSummary
+    submissions: List[WhatIfSubmissionScore] = Field(default_factory=list)
+
+
+class PathAnalytics(BaseModel):
+    """Schema for the aggregates of one test path."""
+    path: str = Field(..., description="Test path (category/subject/.../test_name)")
+    count: int = Field(..., description="Recorded scores (repeated tests in one result count separately)")
+    mean: float
+    min: float
+    max: float
+    pass_rate: float = Field(..., description="Share of scores of 100, from 0 to 1")
+    percentiles: Dict[str, float] = Field(default_factory=dict, description="p25, p50, p75 and p90 of the score")
+    histogram: List[int] = Field(default_factory=list, description="Score counts over equal bins of 0-100")
+
+
+class AssignmentAnalyticsResponse(BaseModel):
+    """Schema for per-assignment score analytics."""
+    grading_config_id: int
+    results: int = Field(..., description="Successful results the aggregates cover")
+    bins: int
+    tests: List[PathAnalytics] = Field(default_factory=list, description="Per test path, by path")
+    hardest: List[str] = Field(default_factory=list, description="Test paths with the lowest pass rate first")
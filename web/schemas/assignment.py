@@ -26,6 +26,10 @@ class GradingConfigCreate(BaseModel):
         default=True,
         description="Whether to generate a feedback report after grading"
     )
+    cache_ai_results: bool = Field(
+        default=False,
+        description="Reuse results of byte-identical resubmissions even though the criteria contain AI tests"
+    )
 
     @field_validator('languages')
     @classmethod
@@ -73,6 +77,7 @@ class GradingConfigUpdate(BaseModel):
     setup_config: Optional[Dict[str, Any]] = None
     feedback_config: Optional[Dict[str, Any]] = None
     include_feedback: Optional[bool] = None
+    cache_ai_results: Optional[bool] = None
     is_active: Optional[bool] = None
 
     @field_validator('languages')
@@ -129,6 +134,7 @@ class GradingConfigResponse(BaseModel):
     setup_config: Optional[Dict[str, Any]]
     feedback_config: Optional[Dict[str, Any]]
     include_feedback: bool
+    cache_ai_results: bool = False
     version: int
     created_at: datetime
     updated_at: datetime
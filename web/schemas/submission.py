@@ -80,6 +80,18 @@ class SubmissionCreate(BaseModel):
         return Language[language_upper].value
 
 
+class RegradeRequest(BaseModel):
+    """Schema for regrading a submission against its current grading configuration."""
+    locale: Optional[str] = Field("en", description="Locale for feedback (e.g., 'en', 'pt_br')")
+    incremental: bool = Field(
+        True,
+        description=(
+            "Reuse the stored results of tests that did not change and the recorded sandbox "
+            "transcript; only new or changed tests are executed."
+        ),
+    )
+
+
 class SubmissionResponse(BaseModel):
     """Schema for submission response."""
     model_config = ConfigDict(from_attributes=True)
@@ -98,6 +110,8 @@ class SubmissionResponse(BaseModel):
     focus: Optional[Dict[str, Any]] = None
     score_vector: Optional[Dict[str, float]] = None
     comparison: Optional[ComparisonResultResponse] = None
+    queue_position: Optional[int] = Field(None, description="Jobs of the same language queued ahead when it was accepted")
+    estimated_start_at: Optional[datetime] = Field(None, description="Estimated grading start when it was accepted (UTC)")
 
 
 class SubmissionDetailResponse(SubmissionResponse):
@@ -0,0 +1,127 @@
+"""Admission control for grading jobs, from queue depth and sandbox capacity."""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set
+
+from sandbox_manager.manager import get_sandbox_manager
+from web.config.logging import get_logger
+from web.core.config import settings
+from web.repositories import ResultRepository, SubmissionRepository
+
+
+logger = get_logger(__name__)
+
+# Seconds a read of the sandbox pools' scale limits is reused (remote pools cost a request)
+CAPACITY_TTL_SECONDS = 5.0
+
+
+@dataclass
+class AdmissionDecision:
+    """Whether a job is accepted, and when it should start (or be retried)."""
+    admitted: bool
+    language: str
+    running: int  # Jobs of the language holding a live lease
+    waiting: int  # Jobs of the language queued ahead of this one
+    capacity: Optional[int]  # Sandboxes the language can run at once (None when unknown)
+    estimated_start_seconds: float
+    retry_after_seconds: Optional[int] = None
+
+    @property
+    def saturated(self) -> bool:
+        """Every sandbox of the language is taken (a new job would have to wait)."""
+        return self.capacity is not None and self.running + self.waiting >= self.capacity
+
+    @property
+    def estimated_start_at(self) -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=self.estimated_start_seconds)
+
+
+class CapacityCache:
+    """Scale limit of each language's sandbox pool, re-read at most every ttl seconds."""
+
+    def __init__(self, ttl: float = CAPACITY_TTL_SECONDS):
+        self.ttl = ttl
+        self._capacity: Dict[str, int] = {}
+        self._read_at: Optional[float] = None
+
+    async def get(self) -> Dict[str, int]:
+        now = time.monotonic()
+        if self._read_at is not None and now - self._read_at < self.ttl:
+            return self._capacity
+        try:
+            stats = await asyncio.to_thread(get_sandbox_manager().get_pool_stats)
+            self._capacity = pool_capacity(stats)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Sandbox capacity unavailable, admitting without it: %s", exc)
+            self._capacity = {}
+        self._read_at = now
+        return self._capacity
+
+    def clear(self) -> None:
+        """Forget the last read (the next get() asks the sandbox manager again)."""
+        self._capacity = {}
+        self._read_at = None
+
+
+capacity_cache = CapacityCache()
+
+
+def pool_capacity(stats: dict) -> Dict[str, int]:
+    """Scale limits from pool stats; the remote /stats also reports non-pool entries such as "leases"."""
+    return {
+        language: entry["scale_limit"] for language, entry in stats.items()
+        if isinstance(entry, dict) and "scale_limit" in entry
+    }
+
+
+async def sandbox_capacity() -> Dict[str, int]:
+    """Scale limit of each language's sandbox pool, cached for CAPACITY_TTL_SECONDS."""
+    return await capacity_cache.get()
+
+
+async def saturated_languages(submission_repo: SubmissionRepository) -> Set[str]:
+    """Languages whose leased jobs already take every sandbox of their pool."""
+    capacity = await sandbox_capacity()
+    depth = await submission_repo.queue_depth()
+    return {
+        language for language, counts in depth.items()
+        if language in capacity and counts["running"] >= capacity[language]
+    }
+
+
+async def assess(session, language: str) -> AdmissionDecision:
+    """
+    Decide whether a new job in `language` joins the queue.
+
+    Jobs ahead of it drain at `capacity` per mean grading time of the language (recent
+    successful results, GRADING_ESTIMATED_SECONDS without history); that gives its
+    estimated start. Once ADMISSION_MAX_BACKLOG jobs are waiting it is rejected, with the
+    time the backlog needs to drop below the limit as the retry delay.
+    """
+    depth = (await SubmissionRepository(session).queue_depth(language)).get(language, {})
+    running, waiting = depth.get("running", 0), depth.get("waiting", 0)
+    capacity = (await sandbox_capacity()).get(language)
+
+    mean_ms = await ResultRepository(session).mean_execution_ms(language)
+    service_seconds = mean_ms / 1000.0 if mean_ms is not None else settings.GRADING_ESTIMATED_SECONDS
+    lanes = max(capacity or 1, 1)
+    ahead = running + waiting - lanes + 1  # Jobs that must finish before this one gets a sandbox
+    estimated = max(ahead, 0) / lanes * service_seconds
+
+    decision = AdmissionDecision(
+        admitted=True,
+        language=language,
+        running=running,
+        waiting=waiting,
+        capacity=capacity,
+        estimated_start_seconds=round(estimated, 1),
+    )
+    limit = settings.ADMISSION_MAX_BACKLOG
+    if limit > 0 and waiting >= limit:
+        decision.admitted = False
+        decision.retry_after_seconds = max(1, math.ceil((waiting - limit + 1) / lanes * service_seconds))
+    return decision
@@ -0,0 +1,62 @@
+"""Per-assignment score analytics."""
+
+from bisect import bisect_left
+from typing import List, Sequence
+
+from web.repositories.analytics_repository import AnalyticsRepository
+from web.schemas.analytics import AssignmentAnalyticsResponse, PathAnalytics
+
+
+PERCENTILES = (25, 50, 75, 90)
+HARDEST_LIMIT = 5
+
+
+def percentile(sorted_scores: Sequence[float], q: float) -> float:
+    """q-th percentile (0-100) of ascending scores, linearly interpolated between ranks."""
+    position = (len(sorted_scores) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_scores) - 1)
+    return sorted_scores[lower] + (sorted_scores[upper] - sorted_scores[lower]) * (position - lower)
+
+
+def histogram(sorted_scores: Sequence[float], bins: int) -> List[int]:
+    """Counts of ascending scores over `bins` equal bins of 0-100; 100 falls in the last bin."""
+    edges = [bisect_left(sorted_scores, 100.0 * i / bins) for i in range(1, bins)]
+    bounds = [0] + edges + [len(sorted_scores)]
+    return [bounds[i + 1] - bounds[i] for i in range(bins)]
+
+
+async def assignment_analytics(
+    repo: AnalyticsRepository, grading_config_id: int, bins: int = 10
+) -> AssignmentAnalyticsResponse:
+    """
+    Aggregate the recorded test scores of a configuration.
+
+    Counts, means, extremes and pass counts are grouped in the database; percentiles and
+    histograms are read off each path's sorted score column.
+    """
+    stats = await repo.path_stats(grading_config_id)
+    columns = await repo.sorted_scores(grading_config_id)
+
+    tests = []
+    for row in sorted(stats, key=lambda r: r["path"]):
+        scores = columns.get(row["path"], [])
+        tests.append(PathAnalytics(
+            path=row["path"],
+            count=row["count"],
+            mean=round(row["mean"], 2),
+            min=row["min"],
+            max=row["max"],
+            pass_rate=round(row["passed"] / row["count"], 4),
+            percentiles={f"p{q}": round(percentile(scores, q), 2) for q in PERCENTILES} if scores else {},
+            histogram=histogram(scores, bins),
+        ))
+
+    hardest = [test.path for test in sorted(tests, key=lambda t: (t.pass_rate, t.mean))[:HARDEST_LIMIT]]
+    return AssignmentAnalyticsResponse(
+        grading_config_id=grading_config_id,
+        results=await repo.result_count(grading_config_id),
+        bins=bins,
+        tests=tests,
+        hardest=hardest,
+    )
@@ -0,0 +1,112 @@
+"""Bounded cache of grading configurations for submission intake."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from web.config.logging import get_logger
+from web.core.config import settings
+from web.database.models.grading_config import GradingConfiguration
+from web.repositories import GradingConfigRepository
+
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    The columns of a GradingConfiguration that intake and grading read, detached from
+    any session. Snapshots are shared between requests, so their dicts are read-only.
+    """
+    id: int
+    external_assignment_id: str
+    template_name: str
+    criteria_config: dict
+    languages: list
+    setup_config: Optional[dict]
+    feedback_config: Optional[dict]
+    include_feedback: bool
+    cache_ai_results: bool
+    version: int
+
+    @classmethod
+    def of(cls, config: GradingConfiguration) -> "ConfigSnapshot":
+        return cls(
+            id=config.id,
+            external_assignment_id=config.external_assignment_id,
+            template_name=config.template_name,
+            criteria_config=config.criteria_config,
+            languages=list(config.languages),
+            setup_config=config.setup_config,
+            feedback_config=config.feedback_config,
+            include_feedback=config.include_feedback,
+            cache_ai_results=config.cache_ai_results,
+            version=config.version,
+        )
+
+
+class ConfigCache:
+    """
+    LRU cache of active grading configurations keyed by external assignment id.
+
+    A cached snapshot is checked against the row's id and version with a query that
+    reads neither JSON column, so a warm lookup skips loading and decoding the criteria,
+    setup and feedback configs. Every update bumps the version, so a snapshot another
+    process made stale is reloaded on its next lookup; updates through this process
+    also drop it right away (invalidate).
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, ConfigSnapshot]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_by_external_id(self, session: AsyncSession, external_assignment_id: str) -> Optional[ConfigSnapshot]:
+        """The active configuration of an assignment, or None if there is none."""
+        snapshot = self._entries.get(external_assignment_id)
+        if snapshot is not None:
+            current = (await session.execute(
+                select(GradingConfiguration.id, GradingConfiguration.version).where(
+                    GradingConfiguration.external_assignment_id == external_assignment_id,
+                    GradingConfiguration.is_active == True,
+                )
+            )).one_or_none()
+            if current is not None and tuple(current) == (snapshot.id, snapshot.version):
+                self._entries.move_to_end(external_assignment_id)
+                self.hits += 1
+                return snapshot
+            self._entries.pop(external_assignment_id, None)
+
+        self.misses += 1
+        config = await GradingConfigRepository(session).get_by_external_id(external_assignment_id)
+        if config is None:
+            return None
+        snapshot = ConfigSnapshot.of(config)
+        if self.maxsize > 0:
+            self._entries[external_assignment_id] = snapshot
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, grading_config_id: int) -> int:
+        """Drop the cached snapshot of a grading configuration. Returns how many were dropped."""
+        stale = [key for key, snapshot in self._entries.items() if snapshot.id == grading_config_id]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.info("Invalidated cached grading configuration: grading_config_id=%d", grading_config_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+config_cache = ConfigCache(maxsize=settings.CONFIG_CACHE_SIZE)
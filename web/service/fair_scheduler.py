@@ -0,0 +1,154 @@
+"""Weighted fair scheduling of grading jobs across tenants."""
+
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sandbox_manager.metrics import REGISTRY, GaugeCallback, Histogram
+from web.core.config import settings
+from web.database.models.submission import BULK_LANE, INTERACTIVE_LANE
+
+
+# Lanes in the order they are served: interactive submissions go before bulk regrades
+LANES = (INTERACTIVE_LANE, BULK_LANE)
+
+# Seconds buckets for queue waits, from an idle queue up to a long regrade backlog
+WAIT_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+QUEUE_WAIT = REGISTRY.register(Histogram(
+    "grading_queue_wait_seconds",
+    "Time from submission (or regrade request) until a worker claims the job.",
+    ["tenant", "lane"],
+    buckets=WAIT_BUCKETS,
+))
+
+
+def tenant_for(grading_config, metadata: Optional[dict] = None) -> str:
+    """Fair-share queue of a submission: its course when GRADING_TENANT_BY=course, else its assignment."""
+    if settings.GRADING_TENANT_BY == "course" and metadata and metadata.get("course_id") is not None:
+        return f"course:{metadata['course_id']}"
+    return f"assignment:{grading_config.external_assignment_id}"
+
+
+class DeficitRoundRobin:
+    """
+    Deficit round-robin over tenants.
+
+    Each visit of the round credits a tenant with its weight; a tenant is served one job
+    per whole credit and keeps the remainder for its next turn. Tenants that stop waiting
+    leave the round and lose their credit, so an idle tenant cannot bank a burst.
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        self.weights = weights
+        self._ring: List[str] = []
+        self._deficit: Dict[str, float] = {}
+        self._credited = False  # Head of the ring already got its weight this visit
+
+    def weight(self, tenant: str) -> float:
+        return max(float(self.weights.get(tenant, 1.0)), 0.01)
+
+    def select(self, eligible: Iterable[str]) -> Optional[str]:
+        """Tenant to serve next among the eligible ones (None if there are none)."""
+        eligible = set(eligible)
+        for tenant in [tenant for tenant in self._ring if tenant not in eligible]:
+            if tenant == self._ring[0]:
+                self._credited = False
+            self._ring.remove(tenant)
+            del self._deficit[tenant]
+        for tenant in sorted(eligible - set(self._deficit)):
+            self._ring.append(tenant)
+            self._deficit[tenant] = 0.0
+        if not self._ring:
+            return None
+
+        while True:
+            tenant = self._ring[0]
+            if not self._credited:
+                self._deficit[tenant] += self.weight(tenant)
+                self._credited = True
+            if self._deficit[tenant] >= 1.0:
+                self._deficit[tenant] -= 1.0
+                if self._deficit[tenant] < 1.0:
+                    self._next()
+                return tenant
+            self._next()
+
+    def _next(self) -> None:
+        self._ring.append(self._ring.pop(0))
+        self._credited = False
+
+
+class FairScheduler:
+    """
+    Picks the (tenant, lane) queue a worker claims from next.
+
+    Interactive jobs are served before bulk regrades; within a lane, tenants share the
+    worker by deficit round-robin with GRADING_TENANT_WEIGHTS. A tenant whose leased jobs
+    reach its concurrency cap is skipped until one finishes. The backlog snapshot of the
+    last pick and the observed claim waits are exported as per-queue metrics.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        max_concurrency: Optional[int] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+    ):
+        weights = weights if weights is not None else settings.GRADING_TENANT_WEIGHTS
+        self.max_concurrency = max_concurrency if max_concurrency is not None else settings.GRADING_TENANT_MAX_CONCURRENCY
+        self.concurrency = concurrency if concurrency is not None else settings.GRADING_TENANT_CONCURRENCY
+        self._rounds = {lane: DeficitRoundRobin(weights) for lane in LANES}
+        self._backlog: List[dict] = []
+        REGISTRY.register(GaugeCallback(
+            "grading_queue_waiting", "Claimable jobs per queue at the last scheduling decision.",
+            ["tenant", "lane"], lambda: self._gauge("waiting"),
+        ))
+        REGISTRY.register(GaugeCallback(
+            "grading_queue_oldest_wait_seconds", "Age of the longest waiting job per queue at the last scheduling decision.",
+            ["tenant", "lane"], lambda: self._gauge("oldest_wait_seconds"),
+        ))
+
+    def cap(self, tenant: str) -> int:
+        """Jobs of the tenant that may hold a lease at once (0: no cap)."""
+        return int(self.concurrency.get(tenant, self.max_concurrency))
+
+    def pick(self, backlog: List[dict]) -> Optional[Tuple[str, str]]:
+        """
+        Next (tenant, lane) to claim from, given SubmissionRepository.queue_backlog().
+        Returns None when no queue below its tenant's cap has a waiting job.
+        """
+        now = _utcnow()
+        self._backlog = [
+            dict(queue, oldest_wait_seconds=_age(queue["oldest_queued_at"], now)) for queue in backlog
+        ]
+        running: Dict[str, int] = {}
+        for queue in backlog:
+            running[queue["tenant"]] = running.get(queue["tenant"], 0) + queue["running"]
+        capped = {tenant for tenant, count in running.items() if 0 < self.cap(tenant) <= count}
+
+        for lane in LANES:
+            eligible = {
+                queue["tenant"] for queue in backlog
+                if queue["lane"] == lane and queue["waiting"] > 0 and queue["tenant"] not in capped
+            }
+            tenant = self._rounds[lane].select(eligible)
+            if tenant is not None:
+                return tenant, lane
+        return None
+
+    @staticmethod
+    def observe_claim(submission) -> None:
+        """Record how long a claimed job waited in its queue."""
+        waited = _age(submission.queued_at or submission.submitted_at, _utcnow()) or 0.0
+        QUEUE_WAIT.observe(waited, tenant=submission.tenant, lane=submission.lane)
+
+    def _gauge(self, field: str) -> Dict[Tuple[str, str], float]:
+        return {(queue["tenant"], queue["lane"]): queue[field] or 0.0 for queue in self._backlog}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _age(since: Optional[datetime], now: datetime) -> Optional[float]:
+    return max((now - since).total_seconds(), 0.0) if since is not None else None
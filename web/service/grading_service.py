@@ -1,8 +1,10 @@
 """Grading service for background submission processing."""
 
 import asyncio
+import hashlib
+import json
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -10,13 +12,18 @@ from autograder.autograder import build_pipeline
 from autograder.models.dataclass.submission import Submission as AutograderSubmission, SubmissionFile
 from autograder.models.result_tree import ResultTree
 from autograder.services.result_comparator import ResultComparator
+from autograder.services.sandbox_transcript import SandboxTranscript
 from autograder.utils.feedback_generator import generate_preflight_feedback
 from sandbox_manager.models.sandbox_models import Language
 from web.config.logging import get_logger
+from web.core.config import settings
 from web.database import get_session
 from web.database.models.submission import SubmissionStatus
 from web.database.models.submission_result import PipelineStatus
-from web.repositories import SubmissionRepository, ResultRepository
+from web.repositories import BlobRepository, SubmissionRepository, ResultRepository
+from web.repositories.submission_repository import ACTIVE_STATUSES
+from web.service.pipeline_cache import pipeline_cache, pipeline_key
+from web.service.result_cache import result_cache_key
 from autograder.serializers.pipeline_execution_serializer import PipelineExecutionSerializer
 
 
@@ -39,6 +46,63 @@ class GradingRequest:
     submission_files: dict
     locale: str = "en"
     baseline_result_tree: Optional[dict] = None
+    grading_config_version: Optional[int] = None  # Enables the compiled pipeline and result caches
+    cache_ai_results: bool = False
+    replay_transcript: Optional[dict] = None  # Answer sandbox calls from this recorded transcript
+    previous_result_tree: Optional[dict] = None  # Reuse results of unchanged tests from this grading
+    regrade: bool = False  # Replaces the submission's existing result
+    file_manifest: Optional[dict] = None  # Stored files; loaded into submission_files when grading starts
+
+
+def setup_fingerprint(setup_config: Optional[dict]) -> str:
+    """Hash of the setup config a result was graded under; stored results are only reused under the same one."""
+    payload = json.dumps(setup_config or {}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def reusable_result_tree(result, setup_config: Optional[dict]) -> Optional[dict]:
+    """The stored result tree of result if its tests can be reused under setup_config."""
+    if result is None or not result.result_tree:
+        return None
+    if result.result_tree.get("setup_fingerprint") != setup_fingerprint(setup_config):
+        return None
+    return result.result_tree
+
+
+def grading_request_for(submission, grading_config) -> GradingRequest:
+    """
+    Build the GradingRequest of a queued submission from its stored grading options.
+
+    The request carries the submission's file manifest; the file content is only read
+    once grading starts. Incremental regrades reuse the submission's stored result, so
+    for those the submission must be loaded with its result.
+    """
+    options = submission.grading_options or {}
+    regrade = bool(options.get("regrade"))
+    previous_result = submission.result if regrade and options.get("incremental", True) else None
+    return GradingRequest(
+        submission_id=submission.id,
+        grading_config_id=grading_config.id,
+        template_name=grading_config.template_name,
+        criteria_config=grading_config.criteria_config,
+        setup_config=grading_config.setup_config,
+        feedback_config=grading_config.feedback_config or {},
+        include_feedback=grading_config.include_feedback,
+        language=submission.language,
+        username=submission.username,
+        external_user_id=submission.external_user_id,
+        submission_files={},
+        file_manifest=submission.file_manifest,
+        locale=options.get("locale") or "en",
+        baseline_result_tree=options.get("baseline_result_tree"),
+        grading_config_version=grading_config.version,
+        cache_ai_results=grading_config.cache_ai_results,
+        # Unchanged tests keep their stored results and the recorded sandbox calls answer the
+        # rest where they can; tests the transcript cannot answer are graded in a sandbox
+        replay_transcript=previous_result.transcript if previous_result is not None else None,
+        previous_result_tree=reusable_result_tree(previous_result, grading_config.setup_config),
+        regrade=regrade,
+    )
 
 
 async def grade_submission(request: GradingRequest) -> None:
@@ -46,6 +110,34 @@ async def grade_submission(request: GradingRequest) -> None:
     Background task to grade a submission.
 
     This function runs the autograder pipeline on the submission and stores results.
+    While it runs, the submission's job lease is kept alive so no worker reclaims it.
+    """
+    heartbeat = asyncio.create_task(_hold_lease(request.submission_id))
+    try:
+        await _grade(request)
+    finally:
+        heartbeat.cancel()
+
+
+async def _hold_lease(submission_id: int) -> None:
+    """Extend the job lease of a submission every third of the lease until cancelled."""
+    while True:
+        await asyncio.sleep(settings.GRADING_LEASE_SECONDS / 3)
+        try:
+            async with get_session() as session:
+                await SubmissionRepository(session).extend_lease(submission_id, settings.GRADING_LEASE_SECONDS)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to extend grading lease of submission %d: %s", submission_id, exc)
+
+
+async def _grade(request: GradingRequest) -> None:
+    """
+    Run the autograder pipeline on the submission and store its results.
+
+    The database is used in short units of work so that no pooled connection is held
+    while the pipeline runs: one to mark the submission PROCESSING (serving it from the
+    result cache right there when possible), then the pipeline with no session open,
+    then one to store the outcome.
     """
     logger.info(
         "Starting grading for submission %d (user: %s)",
@@ -53,67 +145,135 @@ async def grade_submission(request: GradingRequest) -> None:
     )
     start_time = time.time()
 
-    async with get_session() as session:
-        submission_repo = SubmissionRepository(session)
-        result_repo = ResultRepository(session)
+    try:
+        request = await _start_grading(request, start_time)
+        if request is None:
+            return
 
-        try:
-            await submission_repo.update_status(request.submission_id, SubmissionStatus.PROCESSING)
-            await session.commit()
-            logger.info("Submission %d status updated to PROCESSING", request.submission_id)
-
-            pipeline_execution = await _run_pipeline(request)
-            execution_time_ms = int((time.time() - start_time) * 1000)
+        pipeline_execution = await _execute(request)
+        execution_time_ms = int((time.time() - start_time) * 1000)
 
+        async with get_session() as session:
+            submission_repo = SubmissionRepository(session)
+            result_repo = ResultRepository(session)
             if pipeline_execution.result:
-                if request.baseline_result_tree and pipeline_execution.result.result_tree:
-                    try:
-                        baseline_tree = ResultTree.from_dict(request.baseline_result_tree)
-                        head_tree = pipeline_execution.result.result_tree
-                        pipeline_execution.result.comparison = ResultComparator.compare(
-                            baseline=baseline_tree,
-                            head=head_tree,
-                        )
-                    except Exception as exc:  # pylint: disable=broad-exception-caught
-                        logger.warning(
-                            "Failed to perform baseline comparison for submission %d: %s",
-                            request.submission_id, str(exc)
-                        )
-
                 await _persist_success(result_repo, submission_repo, request, pipeline_execution, execution_time_ms)
             else:
                 await _persist_failure(result_repo, submission_repo, request, pipeline_execution, execution_time_ms)
+            await session.commit()
 
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        async with get_session() as session:
+            failed = await SubmissionRepository(session).update_status(
+                request.submission_id, SubmissionStatus.FAILED, from_statuses=ACTIVE_STATUSES
+            )
+            if failed:
+                await ResultRepository(session).create(
+                    submission_id=request.submission_id,
+                    final_score=0.0,
+                    execution_time_ms=execution_time_ms,
+                    pipeline_status=PipelineStatus.INTERRUPTED,
+                    error_message=str(exc),
+                )
             await session.commit()
+        logger.error(
+            "Error grading submission %d: %s",
+            request.submission_id, str(exc),
+            exc_info=True
+        )
 
-        except Exception as exc:  # pylint: disable=broad-exception-caught
+
+async def _start_grading(request: GradingRequest, start_time: float) -> Optional[GradingRequest]:
+    """
+    Mark the submission PROCESSING (dropping the result a regrade replaces), load its
+    stored files and store a cached result when an identical submission was graded before.
+
+    Returns the request to run with its files loaded, or None when there is nothing left
+    to grade: the submission was served from the cache, or it is no longer pending
+    (another worker finished it first).
+    """
+    async with get_session() as session:
+        submission_repo = SubmissionRepository(session)
+        result_repo = ResultRepository(session)
+
+        if request.file_manifest is not None:
+            request = replace(
+                request, submission_files=await BlobRepository(session).load_files(request.file_manifest)
+            )
+        content_hash = result_cache_key(request)
+        values = {"content_hash": content_hash} if content_hash else {}
+        started = await submission_repo.update_status(
+            request.submission_id, SubmissionStatus.PROCESSING, from_statuses=ACTIVE_STATUSES, **values
+        )
+        if started is None:
+            logger.info("Submission %d is no longer pending, skipping grading", request.submission_id)
+            return None
+        if request.regrade:
+            await result_repo.delete_by_submission_id(request.submission_id)
+
+        cached = None
+        if content_hash:
+            cached = await result_repo.get_cached_result(content_hash, exclude_submission_id=request.submission_id)
+        if cached:
             execution_time_ms = int((time.time() - start_time) * 1000)
-            await result_repo.create(
-                submission_id=request.submission_id,
-                final_score=0.0,
-                execution_time_ms=execution_time_ms,
-                pipeline_status=PipelineStatus.INTERRUPTED,
-                error_message=str(exc),
+            await _persist_cached(result_repo, submission_repo, request, cached, execution_time_ms)
+
+        await session.commit()
+
+    logger.info("Submission %d status updated to PROCESSING", request.submission_id)
+    return None if cached else request
+
+
+async def _execute(request: GradingRequest):
+    """Run the pipeline (replaying the transcript when possible) and compare against the baseline."""
+    pipeline_execution = await _run_pipeline(request)
+    if request.replay_transcript and pipeline_execution.replay_misses:
+        logger.info(
+            "Submission %d: transcript does not cover the regrade (%d missing call(s)), grading in a sandbox",
+            request.submission_id, len(pipeline_execution.replay_misses)
+        )
+        pipeline_execution = await _run_pipeline(replace(request, replay_transcript=None))
+
+    if pipeline_execution.result and request.baseline_result_tree and pipeline_execution.result.result_tree:
+        try:
+            pipeline_execution.result.comparison = ResultComparator.compare(
+                baseline=ResultTree.from_dict(request.baseline_result_tree),
+                head=pipeline_execution.result.result_tree,
             )
-            await submission_repo.update_status(request.submission_id, SubmissionStatus.FAILED)
-            await session.commit()
-            logger.error(
-                "Error grading submission %d: %s",
-                request.submission_id, str(exc),
-                exc_info=True
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning(
+                "Failed to perform baseline comparison for submission %d: %s",
+                request.submission_id, str(exc)
             )
+    return pipeline_execution
 
 
 async def _run_pipeline(request: GradingRequest):
-    """Build the autograder pipeline and run it in a thread."""
-    pipeline = build_pipeline(
-        template_name=request.template_name,
-        include_feedback=request.include_feedback,
-        grading_criteria=request.criteria_config,
-        feedback_config=request.feedback_config or {},
-        setup_config=request.setup_config if request.setup_config else {},
-        custom_template=None,
-    )
+    """Build the autograder pipeline (or reuse the compiled one) and run it in a thread."""
+    def compile_pipeline():
+        return build_pipeline(
+            template_name=request.template_name,
+            include_feedback=request.include_feedback,
+            grading_criteria=request.criteria_config,
+            feedback_config=request.feedback_config or {},
+            setup_config=request.setup_config if request.setup_config else {},
+            custom_template=None,
+            locale=request.locale,
+            record_transcript=settings.RECORD_TRANSCRIPTS,
+        )
+
+    if request.grading_config_version is None:
+        pipeline = compile_pipeline()
+    else:
+        key = pipeline_key(
+            request.grading_config_id,
+            request.grading_config_version,
+            request.locale,
+            request.include_feedback,
+            request.feedback_config,
+        )
+        pipeline = pipeline_cache.get_or_build(key, compile_pipeline)
 
     files_to_grade = {
         name: SubmissionFile(filename=f["filename"], content=f["content"])
@@ -129,7 +289,9 @@ async def _run_pipeline(request: GradingRequest):
         locale=request.locale,
     )
 
-    return await asyncio.to_thread(pipeline.run, autograder_submission)
+    replay = SandboxTranscript.from_dict(request.replay_transcript) if request.replay_transcript else None
+    previous = ResultTree.from_dict(request.previous_result_tree) if request.previous_result_tree else None
+    return await asyncio.to_thread(pipeline.run, autograder_submission, replay, previous)
 
 
 async def _persist_success(result_repo, submission_repo, request: GradingRequest, pipeline_execution, execution_time_ms: int) -> None:
@@ -140,14 +302,19 @@ async def _persist_success(result_repo, submission_repo, request: GradingRequest
         result_tree_dict = {
             "final_score": result.final_score,
             "children": _node_to_dict(result.result_tree.root),
+            "setup_fingerprint": setup_fingerprint(request.setup_config),
         }
 
     focus_dict = result.focus.to_dict() if result.focus else None
     comparison_dict = result.comparison.to_dict() if result.comparison else None
     pipeline_summary = PipelineExecutionSerializer.serialize(pipeline_execution)
     score_vector = result.result_tree.to_score_vector() if result.result_tree else None
+    transcript = pipeline_execution.transcript.to_dict() if pipeline_execution.transcript is not None else None
 
+    if not await _finish(submission_repo, request, SubmissionStatus.COMPLETED):
+        return
     await result_repo.create(
+        grading_config_id=request.grading_config_id,
         submission_id=request.submission_id,
         final_score=result.final_score,
         result_tree=result_tree_dict,
@@ -156,22 +323,55 @@ async def _persist_success(result_repo, submission_repo, request: GradingRequest
         score_vector=score_vector,
         comparison=comparison_dict,
         pipeline_execution=pipeline_summary,
+        transcript=transcript,
         execution_time_ms=execution_time_ms,
         pipeline_status=PipelineStatus.SUCCESS,
     )
 
-    await submission_repo.update(
-        request.submission_id,
-        status=SubmissionStatus.COMPLETED,
-        graded_at=datetime.now(timezone.utc).replace(tzinfo=None),
-    )
-
     logger.info(
         "Submission %d graded successfully. Score: %s, Time: %dms",
         request.submission_id, result.final_score, execution_time_ms
     )
 
 
+async def _persist_cached(result_repo, submission_repo, request: GradingRequest, cached, execution_time_ms: int) -> None:
+    """Store a copy of the result of an identical earlier submission and update submission status."""
+    comparison_dict = None
+    if request.baseline_result_tree and cached.result_tree:
+        try:
+            comparison_dict = ResultComparator.compare(
+                baseline=ResultTree.from_dict(request.baseline_result_tree),
+                head=ResultTree.from_dict(cached.result_tree),
+            ).to_dict()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning(
+                "Failed to perform baseline comparison for submission %d: %s",
+                request.submission_id, str(exc)
+            )
+
+    if not await _finish(submission_repo, request, SubmissionStatus.COMPLETED):
+        return
+    await result_repo.create(
+        grading_config_id=request.grading_config_id,
+        submission_id=request.submission_id,
+        final_score=cached.final_score,
+        result_tree=cached.result_tree,
+        feedback=cached.feedback,
+        focus=cached.focus,
+        score_vector=cached.score_vector,
+        comparison=comparison_dict,
+        pipeline_execution=cached.pipeline_execution,
+        transcript=cached.transcript,
+        execution_time_ms=execution_time_ms,
+        pipeline_status=PipelineStatus.SUCCESS,
+    )
+
+    logger.info(
+        "Submission %d served from result cache (copied from submission %d). Score: %s",
+        request.submission_id, cached.submission_id, cached.final_score
+    )
+
+
 async def _persist_failure(result_repo, submission_repo, request: GradingRequest, pipeline_execution, execution_time_ms: int) -> None:
     """Store failed grading results and update submission status."""
     error_msg = "Pipeline failed to produce results"
@@ -189,6 +389,8 @@ async def _persist_failure(result_repo, submission_repo, request: GradingRequest
     if failed_step_name == "PreFlightStep":
         feedback = generate_preflight_feedback(pipeline_summary, locale=request.locale)
 
+    if not await _finish(submission_repo, request, SubmissionStatus.FAILED):
+        return
     await result_repo.create(
         submission_id=request.submission_id,
         final_score=0.0,
@@ -200,7 +402,22 @@ async def _persist_failure(result_repo, submission_repo, request: GradingRequest
         failed_at_step=failed_step_name,
     )
 
-    await submission_repo.update_status(request.submission_id, SubmissionStatus.FAILED)
+
+async def _finish(submission_repo, request: GradingRequest, status: SubmissionStatus) -> bool:
+    """
+    Move the submission out of PROCESSING, returning False (so no result is stored) when
+    it already left it, e.g. because a worker that reclaimed the job finished it first.
+    """
+    values = {}
+    if status == SubmissionStatus.COMPLETED:
+        values["graded_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
+    finished = await submission_repo.update_status(
+        request.submission_id, status, from_statuses=(SubmissionStatus.PROCESSING,), **values
+    )
+    if finished is None:
+        logger.info("Submission %d is no longer processing, discarding its result", request.submission_id)
+        return False
+    return True
 
 
 def _node_to_dict(node) -> dict:
@@ -0,0 +1,169 @@
+"""Grading worker that claims queued submissions from the database."""
+
+import asyncio
+import os
+import socket
+import time
+from typing import Optional, Set
+from uuid import uuid4
+
+from web.config.logging import get_logger
+from web.core.config import settings
+from web.database import get_session
+from web.database.models.submission import SubmissionStatus
+from web.database.models.submission_result import PipelineStatus
+from web.repositories import GradingConfigRepository, ResultRepository, SubmissionRepository
+from web.repositories.submission_repository import ACTIVE_STATUSES
+from web.service.admission_service import saturated_languages
+from web.service.fair_scheduler import FairScheduler
+from web.service.grading_service import grade_submission, grading_request_for
+
+
+logger = get_logger(__name__)
+
+
+def worker_id() -> str:
+    """Identity a worker records on the jobs it leases."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+
+
+class GradingWorker:
+    """
+    Grades queued submissions with bounded concurrency.
+
+    The submissions table is the queue: the worker claims the oldest PENDING submission,
+    or a PROCESSING one whose lease expired because its worker died, with
+    FOR UPDATE SKIP LOCKED. A claimed job is leased for GRADING_LEASE_SECONDS and
+    grade_submission keeps extending the lease while it runs, so a job is only retried
+    once its worker stops heartbeating. Jobs of a language whose sandboxes are all held by
+    leased jobs stay queued until one frees up, rather than failing for lack of a sandbox.
+    Jobs that have used up GRADING_MAX_ATTEMPTS are failed instead of being retried again.
+    Start-up recovery needs nothing extra: the first claims pick up whatever a previous
+    process left PENDING or PROCESSING. Which queue each claim comes from is decided by
+    the FairScheduler (tenants, weights, caps and the interactive lane).
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        owner: Optional[str] = None,
+        scheduler: Optional[FairScheduler] = None,
+    ):
+        self.concurrency = concurrency if concurrency is not None else settings.GRADING_WORKER_CONCURRENCY
+        self.lease_seconds = lease_seconds if lease_seconds is not None else settings.GRADING_LEASE_SECONDS
+        self.max_attempts = max_attempts if max_attempts is not None else settings.GRADING_MAX_ATTEMPTS
+        self.poll_interval = poll_interval if poll_interval is not None else settings.GRADING_POLL_INTERVAL
+        self.owner = owner or worker_id()
+        self.scheduler = scheduler or FairScheduler()
+        self._active: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def active(self) -> int:
+        """Jobs currently being graded by this worker."""
+        return len(self._active)
+
+    def notify(self) -> None:
+        """Wake the worker up to claim right away (a job was just queued)."""
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Claim and grade jobs until stop() is called."""
+        logger.info("Grading worker %s started (concurrency=%d)", self.owner, self.concurrency)
+        while not self._stopping:
+            try:
+                await self.claim_available()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.error("Grading worker %s failed to claim jobs: %s", self.owner, exc)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Grading worker %s stopped claiming jobs", self.owner)
+
+    async def stop(self, grace_seconds: float = 0) -> None:
+        """
+        Stop claiming, give running jobs grace_seconds to finish, then cancel the rest.
+        Cancelled jobs keep their lease and are retried by another worker once it expires.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._active and grace_seconds > 0:
+            await asyncio.wait(set(self._active), timeout=grace_seconds)
+        pending = [task for task in self._active if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def claim_available(self) -> int:
+        """Claim jobs up to the free concurrency and start grading them. Returns how many started."""
+        started = 0
+        while self.active < self.concurrency and not self._stopping:
+            async with get_session() as session:
+                submission_repo = SubmissionRepository(session)
+                saturated = await saturated_languages(submission_repo)
+                queue = self.scheduler.pick(await submission_repo.queue_backlog(exclude_languages=saturated))
+            if queue is None:
+                break
+            async with get_session() as session:
+                submission = await SubmissionRepository(session).claim_next(
+                    self.owner, self.lease_seconds, exclude_languages=saturated, queue=queue
+                )
+                if submission is None:
+                    break  # Claimed by another worker meanwhile; the next poll picks again
+                submission_id, attempts = submission.id, submission.attempts
+                self.scheduler.observe_claim(submission)
+
+            logger.info(
+                "Claimed submission %d (attempt %d, queue %s/%s) by worker %s",
+                submission_id, attempts, queue[0], queue[1], self.owner,
+            )
+            task = asyncio.create_task(self._process(submission_id, attempts))
+            self._active.add(task)
+            task.add_done_callback(self._active.discard)
+            started += 1
+        return started
+
+    async def _process(self, submission_id: int, attempts: int) -> None:
+        """Grade one claimed job, or fail it once it has used up its attempts."""
+        start_time = time.time()
+        try:
+            async with get_session() as session:
+                submission_repo = SubmissionRepository(session)
+                submission = await submission_repo.get_by_id_with_result(submission_id)
+                if submission is None:
+                    return
+                if attempts > self.max_attempts:
+                    await self._abandon(session, submission_id, attempts, start_time)
+                    return
+                grading_config = await GradingConfigRepository(session).get_by_id(submission.grading_config_id)
+                request = grading_request_for(submission, grading_config)
+
+            await grade_submission(request)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # The lease runs out and the job is retried
+            logger.error("Grading worker %s failed on submission %d: %s", self.owner, submission_id, exc, exc_info=True)
+
+    async def _abandon(self, session, submission_id: int, attempts: int, start_time: float) -> None:
+        """Record a job that kept losing its worker as failed."""
+        abandoned = await SubmissionRepository(session).update_status(
+            submission_id, SubmissionStatus.FAILED, from_statuses=ACTIVE_STATUSES, visible_at=None, locked_by=None
+        )
+        if abandoned is None:
+            return
+        result_repo = ResultRepository(session)
+        await result_repo.delete_by_submission_id(submission_id)
+        await result_repo.create(
+            submission_id=submission_id,
+            final_score=0.0,
+            execution_time_ms=int((time.time() - start_time) * 1000),
+            pipeline_status=PipelineStatus.INTERRUPTED,
+            error_message=f"Grading abandoned after {attempts - 1} interrupted attempt(s)",
+        )
+        logger.error("Submission %d abandoned after %d interrupted attempt(s)", submission_id, attempts - 1)
@@ -0,0 +1,96 @@
+"""Bounded cache of compiled grading pipelines."""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+from autograder.autograder import AutograderPipeline
+from web.config.logging import get_logger
+from web.core.config import settings
+
+
+logger = get_logger(__name__)
+
+PipelineKey = Tuple[int, int, str, bool, str]
+
+
+def pipeline_key(
+    grading_config_id: int,
+    version: int,
+    locale: str,
+    include_feedback: bool,
+    feedback_config: dict,
+) -> PipelineKey:
+    """
+    Cache key for the pipeline compiled from a grading configuration.
+
+    The configuration version changes on every update, so a stale pipeline is never
+    returned even before its entry is invalidated.
+    """
+    feedback_fingerprint = hashlib.sha256(
+        json.dumps(feedback_config or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return (grading_config_id, version, locale or "en", bool(include_feedback), feedback_fingerprint)
+
+
+class PipelineCache:
+    """
+    LRU cache of compiled AutograderPipeline objects.
+
+    A compiled pipeline holds its validated setup config, loaded templates and (after
+    its first run) the built criteria tree. Pipelines are safe to run concurrently, so
+    every submission for the same configuration version reuses one instance.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, AutograderPipeline]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: PipelineKey, build: Callable[[], AutograderPipeline]) -> AutograderPipeline:
+        """Return the cached pipeline for key, compiling it with build() on a miss."""
+        with self._lock:
+            pipeline = self._entries.get(key)
+            if pipeline is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pipeline
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss for the same key just builds twice
+        pipeline = build()
+        if self.maxsize <= 0:
+            return pipeline
+
+        with self._lock:
+            pipeline = self._entries.setdefault(key, pipeline)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        logger.debug("Compiled pipeline cached: grading_config_id=%s, version=%s", key[0], key[1])
+        return pipeline
+
+    def invalidate(self, grading_config_id: int) -> int:
+        """Drop every cached pipeline of a grading configuration. Returns how many were dropped."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == grading_config_id]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logger.info("Invalidated %d compiled pipeline(s) for grading_config_id=%d", len(stale), grading_config_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+pipeline_cache = PipelineCache(maxsize=settings.PIPELINE_CACHE_SIZE)
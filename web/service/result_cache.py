@@ -0,0 +1,113 @@
+"""Content-addressed cache of submission results."""
+
+import hashlib
+import json
+import os
+from typing import Iterable, List, Optional
+
+from autograder.models.abstract.ai_test_function import AiTestFunction
+from autograder.models.abstract.template import Template
+from autograder.models.config.criteria import CriteriaConfig
+from autograder.services.template_library_service import TemplateLibraryService
+from autograder.steps.load_template_step import TemplateLoaderStep
+from web.config.logging import get_logger
+from web.core.config import settings
+
+
+logger = get_logger(__name__)
+
+
+def submission_content_hash(
+    submission_files: dict,
+    language: Optional[str],
+    grading_config_id: int,
+    grading_config_version: int,
+    templates: Iterable[Template],
+    locale: str,
+) -> str:
+    """
+    Hash everything that determines a deterministic grading result.
+
+    Files are keyed by their normalized path and sorted, so the order they were uploaded
+    in and spellings like "./src/main.py" do not matter; their content is hashed byte for
+    byte.
+    """
+    files = sorted(
+        (os.path.normpath(f["filename"]).replace("\\", "/"), f["content"])
+        for f in submission_files.values()
+    )
+    payload = {
+        "files": files,
+        "language": (language or "").lower(),
+        "grading_config_id": grading_config_id,
+        "grading_config_version": grading_config_version,
+        "templates": sorted((t.template_name, t.template_version) for t in templates),
+        "locale": locale or "en",
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def uses_ai_tests(criteria_config: dict, templates: Iterable[Template]) -> bool:
+    """
+    Whether any test of the criteria is evaluated by an AI model (and so not deterministic).
+
+    A test name is checked against every template that defines it, so a name an AI
+    template shares with a deterministic one still counts as AI.
+    """
+    templates = list(templates)
+    config = CriteriaConfig.from_dict(criteria_config)
+
+    def holders(holder) -> List:
+        found = [holder]
+        for subject in holder.subjects or []:
+            found.extend(holders(subject))
+        return found
+
+    for category in (config.base, config.bonus, config.penalty):
+        if category is None:
+            continue
+        for holder in holders(category):
+            for test in holder.tests or []:
+                name = test.type or test.name
+                for template in templates:
+                    try:
+                        test_function = template.get_test(name)
+                    except (AttributeError, NotImplementedError):  # Not defined by this template
+                        continue
+                    if isinstance(test_function, AiTestFunction):
+                        return True
+    return False
+
+
+def result_cache_key(request) -> Optional[str]:
+    """
+    Cache key for a GradingRequest, or None when its result must not be reused.
+
+    Results are only reused for a known configuration version, and configs with AI tests
+    are excluded unless they opted in with cache_ai_results.
+    """
+    if not settings.RESULT_CACHE_ENABLED or request.grading_config_version is None:
+        return None
+
+    try:
+        template_service = TemplateLibraryService.get_instance()
+        templates = [
+            template_service.load_builtin_template(name)
+            for name in TemplateLoaderStep.normalize_template_names(request.template_name)
+        ]
+        if not request.cache_ai_results and uses_ai_tests(request.criteria_config, templates):
+            return None
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # Let the pipeline report configuration problems; just don't cache
+        logger.debug("Result cache skipped for submission %d: %s", request.submission_id, exc)
+        return None
+
+    return submission_content_hash(
+        request.submission_files,
+        request.language,
+        request.grading_config_id,
+        request.grading_config_version,
+        templates,
+        request.locale,
+    )
@@ -0,0 +1,87 @@
+"""What-if reweighting of an assignment's stored results."""
+
+from typing import List
+
+from autograder.models.config.criteria import CriteriaConfig
+from autograder.models.criteria_tree import CriteriaTree
+from autograder.services.criteria_tree_service import CriteriaTreeService
+from autograder.services.score_model import compile_score_model
+from autograder.services.template_library_service import TemplateLibraryService
+from autograder.steps.load_template_step import TemplateLoaderStep
+from web.config.logging import get_logger
+from web.schemas.analytics import WhatIfRequest, WhatIfResponse, WhatIfSubmissionScore, WhatIfSummary
+
+
+logger = get_logger(__name__)
+
+
+def build_criteria_tree(grading_config) -> CriteriaTree:
+    """Build the criteria tree of a grading configuration (its shape and weights)."""
+    template_service = TemplateLibraryService.get_instance()
+    templates = [
+        template_service.load_builtin_template(name)
+        for name in TemplateLoaderStep.normalize_template_names(grading_config.template_name)
+    ]
+    return CriteriaTreeService().build_tree(CriteriaConfig.from_dict(grading_config.criteria_config), templates)
+
+
+def what_if(grading_config, graded: List, request: WhatIfRequest) -> WhatIfResponse:
+    """
+    Recompute the final scores of graded submissions under the weights of request.
+
+    Stored test scores are aligned to the current criteria once; the current and the
+    alternative weighting are then each a single pass of dot products over those rows.
+
+    Args:
+        grading_config: GradingConfiguration whose criteria define the shape
+        graded: (Submission, SubmissionResult) pairs, newest submission first
+        request: Weight overrides
+
+    Raises:
+        ValueError: If the criteria cannot be built or an override is invalid
+    """
+    tree = build_criteria_tree(grading_config)
+    current = compile_score_model(tree)
+    alternative = compile_score_model(tree, request.weights, request.subjects_weight)
+
+    seen_users = set()
+    scores: List[WhatIfSubmissionScore] = []
+    for submission, result in graded:
+        if request.latest_per_user:
+            if submission.external_user_id in seen_users:
+                continue
+            seen_users.add(submission.external_user_id)
+
+        if result.result_tree:
+            row, missing = current.row_from_result_tree(result.result_tree)
+        else:
+            row, missing = current.row_from_score_vector(result.score_vector or {})
+        current_score = current.score(row)
+        what_if_score = alternative.score(row)
+        scores.append(WhatIfSubmissionScore(
+            submission_id=submission.id,
+            external_user_id=submission.external_user_id,
+            stored_score=result.final_score,
+            current_score=round(current_score, 2),
+            what_if_score=round(what_if_score, 2),
+            delta=round(what_if_score - current_score, 2),
+            missing_tests=missing,
+        ))
+
+    summary = WhatIfSummary(count=len(scores))
+    if scores:
+        summary.current_mean = round(sum(s.current_score for s in scores) / len(scores), 2)
+        summary.what_if_mean = round(sum(s.what_if_score for s in scores) / len(scores), 2)
+        summary.mean_delta = round(summary.what_if_mean - summary.current_mean, 2)
+        summary.changed = sum(1 for s in scores if abs(s.delta) >= 0.01)
+
+    logger.info(
+        "What-if reweighting: config_id=%d, submissions=%d, tests=%d, changed=%d",
+        grading_config.id, len(scores), len(current.paths), summary.changed,
+    )
+    return WhatIfResponse(
+        grading_config_id=grading_config.id,
+        tests=len(current.paths),
+        summary=summary,
+        submissions=scores,
+    )
@@ -0,0 +1,61 @@
+"""
+Standalone grading worker process.
+
+Run with `python -m web.worker` next to an API started with GRADING_DISPATCH=queue.
+Each process grades up to GRADING_WORKER_CONCURRENCY submissions at a time; add
+processes (or hosts) to scale grading independently of the API.
+"""
+
+import asyncio
+import signal
+
+from dotenv import load_dotenv
+
+from autograder.services.template_library_service import TemplateLibraryService
+from sandbox_manager.manager import get_sandbox_manager
+from web.config.logging import get_logger, setup_logging
+from web.core.config import settings
+from web.core.lifespan import setup_sandbox_manager
+from web.database import init_db
+from web.service.grading_worker import GradingWorker
+
+
+logger = get_logger(__name__)
+
+# Seconds running jobs get to finish on SIGTERM before they are cancelled (and retried elsewhere)
+SHUTDOWN_GRACE_SECONDS = 30
+
+
+async def main() -> None:
+    """Start the worker and run it until SIGINT or SIGTERM."""
+    await init_db()
+    setup_sandbox_manager()
+    TemplateLibraryService.get_instance()
+
+    worker = GradingWorker()
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    run_task = asyncio.create_task(worker.run())
+    await stopping.wait()
+    logger.info("Stopping grading worker %s (%d job(s) running)...", worker.owner, worker.active)
+    await worker.stop(grace_seconds=SHUTDOWN_GRACE_SECONDS)
+    await run_task
+
+    try:
+        get_sandbox_manager().shutdown()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("Error during sandbox manager shutdown: %s", e)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    setup_logging(
+        json_logs=settings.JSON_LOGS,
+        service_name="autograder-worker",
+        app_env=settings.APP_ENV,
+        log_level=settings.LOG_LEVEL,
+    )
+    asyncio.run(main())